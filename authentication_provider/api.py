@@ -8,7 +8,7 @@ from flask_cors import CORS
 from flask_restful import Api
 from flask_sqlalchemy import SQLAlchemy
 
-from endpoints.authentication_endpoints import Login, TokenValidator
+from endpoints.authentication_endpoints import Login, TokenValidator, JsonWebKeySet
 from url_converter.user_converter import UserConverter
 
 APP = Flask(__name__, static_folder="static")
@@ -22,6 +22,10 @@ DB = SQLAlchemy(APP)
 
 
 from endpoints.user_endpoints import UserCollection, UserItem
+from database.models import User
+from endpoints.models.authentication_token import AuthenticationToken
+from endpoints.models.credentials import Credentials
+from helper.request_blueprints import get_validator
 
 
 API.add_resource(UserCollection, "/api/users/")
@@ -30,3 +34,8 @@ API.add_resource(UserItem, "/api/users/<user:user>/")
 
 API.add_resource(Login, "/login")
 API.add_resource(TokenValidator, "/validateToken")
+API.add_resource(JsonWebKeySet, "/.well-known/jwks.json")
+
+# the validators of the request bodies are compiled once at startup
+for json_schema in (Credentials.json_schema, AuthenticationToken.json_schema, User.json_schema):
+    get_validator(json_schema)
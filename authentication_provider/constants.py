@@ -5,6 +5,8 @@ from datetime import timedelta
 
 DATA_TYPE_JSON = "application/json"
 JWT_TOKEN_EXPIRATION_TIME = timedelta(hours=1)
-# in reality this secret would be injected from a secure environment,
-# for the purpose of this project we hardcode it in this constant file
-JWT_TOKEN_SIGNING_SECRET = 'F2y2NcLLZ7EG7EBgWLlDPiYdk6wP6LpwxfA2qcioxvD01sfFVnUCASffhmwWdjN8'
+# the issuer of the jwt tokens, it is checked by the services which verify the tokens
+JWT_TOKEN_ISSUER = "movie-review-identity-provider"
+# the file containing the private key which signs the jwt tokens, it is created on the first
+# start, in reality the key would be injected from a secure environment
+JWT_SIGNING_KEY_FILE = "jwt-signing-key.pem"
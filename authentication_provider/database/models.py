@@ -1,8 +1,8 @@
 """
     Contains the database definition
 """
-
 import enum
+from functools import lru_cache
 
 import api
 from helper.serializer import Serializer
@@ -48,6 +48,7 @@ class User(api.DB.Model, Serializer):
         self.role = doc.get("role")
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def json_schema():
         """
             returns the json schema of a user object
@@ -6,7 +6,7 @@ import json
 import jwt
 from flask import request, Response
 from flask_restful import Resource
-from jsonschema import validate, ValidationError, draft7_format_checker
+from jsonschema import ValidationError
 
 from constants import DATA_TYPE_JSON
 from endpoints.models.authentication_token import AuthenticationToken
@@ -14,6 +14,7 @@ from endpoints.models.credentials import Credentials
 from helper.encryption_helper import EncryptionHelper
 from helper.error_response import ErrorResponse
 from helper.jwt_helper import JWTHelper
+from helper.request_blueprints import validate_json
 import database
 
 
@@ -31,7 +32,7 @@ class Login(Resource):
             return ErrorResponse.get_unsupported_media_type()
 
         try:
-            validate(request.json, Credentials.json_schema(), format_checker=draft7_format_checker)
+            validate_json(request.json, Credentials.json_schema)
         except ValidationError as e:
             return ErrorResponse(e.message, 400).get_http_response()
 
@@ -42,7 +43,7 @@ class Login(Resource):
         if user is None or not EncryptionHelper.check_password(credentials.password, user.password):
             return ErrorResponse.get_unauthorized()
 
-        token = AuthenticationToken(JWTHelper.create_token(user.username))
+        token = AuthenticationToken(JWTHelper.create_token(user))
         return Response(json.dumps(token.serialize()), status=200, mimetype=DATA_TYPE_JSON)
 
 
@@ -60,11 +61,7 @@ class TokenValidator(Resource):
             return ErrorResponse.get_unsupported_media_type()
 
         try:
-            validate(
-                request.json,
-                AuthenticationToken.json_schema(),
-                format_checker=draft7_format_checker
-            )
+            validate_json(request.json, AuthenticationToken.json_schema)
         except ValidationError as e:
             return ErrorResponse(e.message, 400).get_http_response()
 
@@ -78,10 +75,30 @@ class TokenValidator(Resource):
         except jwt.InvalidTokenError:
             return ErrorResponse("Invalid Token", status_code=401).get_http_response()
 
-        username = token_payload['iss']
+        username = token_payload['sub']
         user = database.models.User.query.filter_by(username=username).first()
 
         if user is not None:
             return Response(json.dumps(user.serialize()), status=200, mimetype=DATA_TYPE_JSON)
 
         return ErrorResponse.get_unauthorized()
+
+
+class JsonWebKeySet(Resource):
+    """
+        Contains the endpoint which publishes the public keys of the token signatures
+    """
+    @classmethod
+    def get(cls):
+        """
+            Returns the json web key set which is used to verify the authentication tokens
+            return: An http response containing the json web key set
+        """
+        response = Response(
+            json.dumps(JWTHelper.get_json_web_key_set()),
+            status=200,
+            mimetype=DATA_TYPE_JSON
+        )
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response
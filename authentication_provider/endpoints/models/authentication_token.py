@@ -1,6 +1,7 @@
 """
     Contains the authentication token class used to exchange the authentication token
 """
+from functools import lru_cache
 
 from helper.serializer import Serializer
 
@@ -31,6 +32,7 @@ class AuthenticationToken(Serializer):
         self.token = doc["token"]
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def json_schema():
         """
             returns the json schema of an authentication token object
@@ -1,6 +1,7 @@
 """
     Contains the credentials class used to exchange credentials for the login
 """
+from functools import lru_cache
 
 from helper.serializer import Serializer
 
@@ -22,6 +23,7 @@ class Credentials(Serializer):
         self.password = doc.get("password")
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def json_schema():
         """
             returns the json schema of a credential object
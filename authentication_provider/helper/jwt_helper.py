@@ -1,9 +1,46 @@
 """
     This module contains the jwt helper which is used to handle jwt tokens
+    The tokens are signed with a private RSA key, the public key is published as json web key set
+    so that other services can verify the tokens without asking the identity provider
 """
+import hashlib
+import json
+import os
 from datetime import datetime, timezone
+from functools import lru_cache
+
 import jwt
-from constants import JWT_TOKEN_EXPIRATION_TIME, JWT_TOKEN_SIGNING_SECRET
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from constants import JWT_TOKEN_EXPIRATION_TIME, JWT_TOKEN_ISSUER, JWT_SIGNING_KEY_FILE
+
+
+@lru_cache(maxsize=None)
+def _get_signing_key():
+    # the key file is resolved relative to the identity provider folder
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), JWT_SIGNING_KEY_FILE)
+    if os.path.exists(path):
+        with open(path, "rb") as key_file:
+            return serialization.load_pem_private_key(key_file.read(), password=None)
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as key_file:
+        key_file.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    return private_key
+
+
+@lru_cache(maxsize=None)
+def _get_key_id():
+    public_key = _get_signing_key().public_key().public_bytes(
+        serialization.Encoding.DER,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(public_key).hexdigest()[:16]
 
 
 class JWTHelper:
@@ -11,33 +48,55 @@ class JWTHelper:
         Contains all the jwt token logic, all the helper functions are static
     """
     @staticmethod
-    def create_token(username):
+    def create_token(user):
         """
             Creates a new jwt token
             input:
-                username: the name of the user this token is created for
+                user: the user this token is created for, the role of the user
+                    is part of the token
             output: The created jwt token object
         """
         payload = {
-            'iss': username,
+            "iss": JWT_TOKEN_ISSUER,
+            "sub": user.username,
+            "role": user.role,
             "iat": datetime.now(tz=timezone.utc),
             "exp": datetime.now(tz=timezone.utc) + JWT_TOKEN_EXPIRATION_TIME,
         }
-        token = jwt.encode(payload, JWT_TOKEN_SIGNING_SECRET, algorithm="HS256")
+        token = jwt.encode(
+            payload,
+            _get_signing_key(),
+            algorithm="RS256",
+            headers={"kid": _get_key_id()}
+        )
         return token
 
     @staticmethod
     def check_token_validity(token):
         """
-            Checks if a given password is equal to its encrypted version
+            Checks the signature, the expiration time and the issuer of a jwt token
             input:
-                password: The password as plaintext string
-                encrypted_password: An encrypted string
-            output: A boolean indicating if the encrypted_password is the encrypted
-                version of the given plaintext
+                token: The jwt token as string
+            output: The payload of the token
             exceptions:
                 jwt.ExpiredSignatureError: If the authentication token is expired
                 jwt.InvalidTokenError: The token was invalid
         """
-        payload = jwt.decode(token, JWT_TOKEN_SIGNING_SECRET, algorithms=['HS256'])
+        payload = jwt.decode(
+            token,
+            _get_signing_key().public_key(),
+            algorithms=["RS256"],
+            issuer=JWT_TOKEN_ISSUER,
+            options={"require": ["exp", "iss", "sub"]}
+        )
         return payload
+
+    @staticmethod
+    def get_json_web_key_set():
+        """
+            Returns the json web key set containing the public key which verifies the tokens
+            output: The json web key set as dict
+        """
+        key = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(_get_signing_key().public_key()))
+        key.update({"kid": _get_key_id(), "alg": "RS256", "use": "sig"})
+        return {"keys": [key]}
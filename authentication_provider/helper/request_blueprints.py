@@ -3,15 +3,48 @@
 """
 
 import json
+from functools import lru_cache
 
 from flask import Response
-from jsonschema import validate, ValidationError, draft7_format_checker
+from jsonschema import ValidationError, draft7_format_checker
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 from sqlalchemy import exc
 
 from constants import DATA_TYPE_JSON
 from helper.error_response import ErrorResponse
 
 
+@lru_cache(maxsize=None)
+def get_validator(json_schema):
+    """
+        Returns the validator of a json schema, the schema is checked and the validator
+        is compiled only once per schema
+        input:
+            json_schema: The function which returns the json schema
+        output:
+            a validator object
+    """
+    schema = json_schema()
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema, format_checker=draft7_format_checker)
+
+
+def validate_json(instance, json_schema):
+    """
+        Validates a json object against a json schema by using its precompiled validator
+        input:
+            instance: The json object which is validated
+            json_schema: The function which returns the json schema
+        exceptions:
+            ValidationError: It is raised with the most relevant error if the object is invalid
+    """
+    error = best_match(get_validator(json_schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
 def get_blueprint(response_object):
     """
         This method is used to make get http requests, which return objects from the database.
@@ -40,7 +73,7 @@ def post_blueprint(request, json_schema, db, create_object, get_new_resource_url
         return ErrorResponse.get_unsupported_media_type()
 
     try:
-        validate(request.json, json_schema(), format_checker=draft7_format_checker)
+        validate_json(request.json, json_schema)
     except ValidationError as e:
         return ErrorResponse(e.message, 400).get_http_response()
 
@@ -73,7 +106,7 @@ def put_blueprint(request, json_schema, db, update_object):
         return ErrorResponse.get_unsupported_media_type()
 
     try:
-        validate(request.json, json_schema(), format_checker=draft7_format_checker)
+        validate_json(request.json, json_schema)
     except ValidationError as e:
         return ErrorResponse(e.message, 400).get_http_response()
 
@@ -2,8 +2,11 @@
 This module represents the whole api definition of the backend
 All endpoints, the database models and the url converters are defined in here
 """
+import json
+from functools import lru_cache
+
 from flasgger import Swagger
-from flask import Flask, send_from_directory
+from flask import Flask, Response, send_from_directory, request
 from flask_caching import Cache
 from flask_cors import CORS
 from flask_restful import Api
@@ -11,7 +14,10 @@ from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
-from constants import NAMESPACE_LINK, CACHING_TIMEOUT
+from constants import NAMESPACE_LINK, CACHING_TIMEOUT, DATA_TYPE_JSON, THIRD_COMPONENT_POOL_SIZE, \
+    THIRD_COMPONENT_CONNECT_TIMEOUT, THIRD_COMPONENT_READ_TIMEOUT, THIRD_COMPONENT_FAILURE_THRESHOLD, \
+    THIRD_COMPONENT_RECOVERY_TIMEOUT
+from mason.control_template import INLINE_SCHEMAS
 from mason.mason_builder import MasonBuilder
 from url_converters.url_converter import CategoryConverter, MovieConverter
 from url_converters.url_converter import ReviewConverter
@@ -20,24 +26,46 @@ APP = Flask(__name__, static_folder="static")
 CORS(APP)
 APP.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///movie-review.db"
 APP.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-APP.config["CACHE_TYPE"] = "SimpleCache"
-APP.config["CACHE_DEFAULT_TIMEOUT"]: CACHING_TIMEOUT
+# the response cache is shared by all workers, use "RedisCache" together with
+# CACHE_REDIS_URL to share it between multiple hosts
+APP.config["CACHE_TYPE"] = "caching.sqlite_cache.SQLiteCache"
+APP.config["CACHE_SQLITE_PATH"] = "response-cache.db"
+APP.config["CACHE_DEFAULT_TIMEOUT"] = CACHING_TIMEOUT
 APP.config["SWAGGER"] = {
     "title": "Movie Review OpenAPI Documentation",
     "openapi": "3.0.3",
     "uiversion": 3,
 }
 APP.url_map.strict_slashes = False
+APP.config["THIRD_COMPONENT_POOL_SIZE"] = THIRD_COMPONENT_POOL_SIZE
+APP.config["THIRD_COMPONENT_CONNECT_TIMEOUT"] = THIRD_COMPONENT_CONNECT_TIMEOUT
+APP.config["THIRD_COMPONENT_READ_TIMEOUT"] = THIRD_COMPONENT_READ_TIMEOUT
+APP.config["THIRD_COMPONENT_FAILURE_THRESHOLD"] = THIRD_COMPONENT_FAILURE_THRESHOLD
+APP.config["THIRD_COMPONENT_RECOVERY_TIMEOUT"] = THIRD_COMPONENT_RECOVERY_TIMEOUT
+# validate tokens which cannot be verified locally by the identity provider
+APP.config["REMOTE_TOKEN_VALIDATION_FALLBACK"] = False
+# the default configuration can be overridden by a configuration file
+APP.config.from_envvar("MOVIE_REVIEW_SETTINGS", silent=True)
 
 API = Api(APP)
 DB = SQLAlchemy(APP)
 CACHE = Cache(APP)
 Swagger(APP, template_file=APP.static_folder + "/api_documentation.yml")
 
-from endpoints.movie_endpoints import MovieCollection, MovieItem
+from endpoints.movie_endpoints import MovieCollection, MovieItem, CategoryMovieCollection
 from endpoints.user_endpoints import UserCollection, UserItem, AuthenticatedUserItem
 from endpoints.review_endpoints import UserReviewCollection, MovieReviewCollection, MovieReviewItem
 from endpoints.category_endpoints import CategoryCollection, CategoryItem
+from endpoints.schema_endpoints import JsonSchemaItem
+from endpoints.search_endpoints import SearchCollection
+from helper.request_blueprints import get_validator
+from json_schemas.category_json_schema import get_category_json_schema
+from json_schemas.movie_json_schema import get_movie_json_schema
+from json_schemas.review_json_schema import get_review_json_schema
+
+# the validators of the request bodies are compiled once at startup
+for json_schema in (get_category_json_schema, get_movie_json_schema, get_review_json_schema):
+    get_validator(json_schema)
 
 
 @event.listens_for(Engine, "connect")
@@ -51,6 +79,26 @@ def set_sqlite_pragma(dbapi_connection, _connection_record):
     cursor.close()
 
 
+@APP.after_request
+def make_conditional(response):
+    """
+    This method adds the validators to the successful responses of get requests
+    Responses without an entity tag are tagged with the hash of their body, if the
+    entity tag matches the If-None-Match header of the request, a 304 response is sent
+    """
+    if request.method not in ("GET", "HEAD") or response.status_code != 200 \
+            or response.direct_passthrough:
+        return response
+    if "ETag" not in response.headers:
+        response.add_etag()
+    if "Cache-Control" not in response.headers:
+        # clients may store the responses but have to revalidate them
+        response.cache_control.no_cache = True
+        if "Authorization" in request.headers:
+            response.cache_control.private = True
+    return response.make_conditional(request)
+
+
 # CATEGORY LOGIC
 API.add_resource(CategoryCollection, "/api/categories/")
 APP.url_map.converters["category"] = CategoryConverter
@@ -61,6 +109,7 @@ API.add_resource(CategoryItem, "/api/categories/<category:category>/")
 API.add_resource(MovieCollection, "/api/movies/")
 APP.url_map.converters["movie"] = MovieConverter
 API.add_resource(MovieItem, "/api/movies/<movie:movie>/")
+API.add_resource(CategoryMovieCollection, "/api/categories/<category:category>/movies/")
 
 
 # REVIEW LOGIC
@@ -78,6 +127,12 @@ API.add_resource(UserReviewCollection, "/api/users/<username>/reviews/")
 # CURRENT USER LOGIC
 API.add_resource(AuthenticatedUserItem, "/api/current-user/")
 
+# SEARCH LOGIC
+API.add_resource(SearchCollection, "/api/search/")
+
+# SCHEMA LOGIC
+API.add_resource(JsonSchemaItem, "/api/schemas/<name>/")
+
 
 @APP.route(NAMESPACE_LINK)
 def send_link_relations_html():
@@ -87,11 +142,15 @@ def send_link_relations_html():
     return send_from_directory(APP.static_folder, "link-relations.html")
 
 
-@APP.route("/")
-def index():
+@lru_cache(maxsize=64)
+def get_index_body(inline_schemas, controls):
     """
-        This is the view function of the api
-        It returns a http response containing a description of the api
+        Returns the encoded description of the api, it is built once since it never changes
+        input:
+            inline_schemas: a flag indicating if the client requested the schemas inside
+                the controls, the description is built once for each representation
+            controls: the value of the query parameter controls, which selects the controls
+                of the description
     """
     body = MasonBuilder()
     body.add_api_namespace()
@@ -104,7 +163,23 @@ def index():
 
     body.add_control_get_movies()
     body.add_control_post_movie()
+    body.add_control_search()
 
     body.add_control_get_users()
     body.add_control_post_user()
-    return body
+    return json.dumps(body)
+
+
+@APP.route("/")
+def index():
+    """
+        This is the view function of the api
+        It returns a http response containing a description of the api
+    """
+    return Response(
+        get_index_body(
+            request.args.get("schemas") == INLINE_SCHEMAS,
+            request.args.get("controls")
+        ),
+        mimetype=DATA_TYPE_JSON
+    )
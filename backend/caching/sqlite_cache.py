@@ -0,0 +1,201 @@
+"""
+    Contains the SQLite cache backend which is shared by all workers running on the same host
+"""
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from flask_caching.backends.base import BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """
+        A cache backend which stores the cached values in a SQLite database file
+        In contrast to the SimpleCache all processes that use the same file share the cached
+        values, so an invalidation made by one worker is immediately visible to all the others
+    """
+    # the share of the threshold which the cache is filled to after it has been pruned
+    PRUNE_RATIO = 0.8
+    # the share of the threshold which is set between two checks of the size of the cache
+    PRUNE_INTERVAL_RATIO = 0.01
+
+    def __init__(self, path, default_timeout=300, threshold=10000):
+        """
+            input:
+                path: the path of the database file
+                default_timeout: the timeout used if no timeout is specified on set
+                threshold: the maximum number of entries before expired entries are pruned
+        """
+        super().__init__(default_timeout)
+        self.path = path
+        self.threshold = threshold
+        # the size of the cache is only counted every prune_interval sets of a worker
+        self.prune_interval = max(1, int(threshold * self.PRUNE_INTERVAL_RATIO))
+        self._sets = itertools.count(1)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        # the entries which expire first are looked up to prune the cache
+        connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires)")
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        """
+            Creates the cache backend from the flask configuration
+            The database file is set by CACHE_SQLITE_PATH, relative paths are
+            resolved against the root path of the application
+        """
+        path = config.get("CACHE_SQLITE_PATH", "response-cache.db")
+        kwargs["path"] = os.path.join(app.root_path, path)
+        kwargs["threshold"] = config.get("CACHE_THRESHOLD", 10000)
+        return cls(*args, **kwargs)
+
+    def _connection(self):
+        # sqlite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _get_expiration(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return 0 if timeout == 0 else time.time() + timeout
+
+    def _prune(self, connection):
+        """
+            Removes the expired entries if the cache holds more entries than the threshold,
+            if it is still too full the entries which expire first are evicted until the cache
+            is filled to PRUNE_RATIO of the threshold, so it is not pruned on every set
+            The entries without a timeout are evicted last
+            Counting the entries scans the whole cache, so the size is only checked every
+            prune_interval sets, the cache may exceed the threshold by that many entries
+            per worker
+        """
+        if next(self._sets) % self.prune_interval != 0:
+            return
+        count = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count <= self.threshold:
+            return
+        count -= connection.execute(
+            "DELETE FROM cache WHERE expires != 0 AND expires <= ?", (time.time(),)
+        ).rowcount
+        excess = count - int(self.threshold * self.PRUNE_RATIO)
+        if count > self.threshold and excess > 0:
+            connection.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY expires = 0, expires LIMIT ?)",
+                (excess,)
+            )
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)",
+            (key, time.time())
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def get_many(self, *keys):
+        if not keys:
+            return []
+        rows = self._connection().execute(
+            "SELECT key, value FROM cache WHERE key IN ({}) AND (expires = 0 OR expires > ?)"
+            .format(",".join("?" * len(keys))),
+            keys + (time.time(),)
+        ).fetchall()
+        values = {key: pickle.loads(value) for key, value in rows}
+        return [values.get(key) for key in keys]
+
+    def has(self, key):
+        return self._connection().execute(
+            "SELECT 1 FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)",
+            (key, time.time())
+        ).fetchone() is not None
+
+    def set(self, key, value, timeout=None):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._get_expiration(timeout))
+        )
+        self._prune(connection)
+        return True
+
+    def set_many(self, mapping, timeout=None):
+        expires = self._get_expiration(timeout)
+        connection = self._connection()
+        connection.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            [
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+                for key, value in mapping.items()
+            ]
+        )
+        self._prune(connection)
+        return True
+
+    def add(self, key, value, timeout=None):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM cache WHERE key = ? AND expires != 0 AND expires <= ?",
+                (key, time.time())
+            )
+            added = connection.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._get_expiration(timeout))
+            ).rowcount == 1
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        return added
+
+    def inc(self, key, delta=1):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT value, expires FROM cache WHERE key = ? AND (expires = 0 OR expires > ?)",
+                (key, time.time())
+            ).fetchone()
+            value = delta if row is None else pickle.loads(row[0]) + delta
+            expires = self._get_expiration(None) if row is None else row[1]
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        return value
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+    def delete(self, key):
+        return self._connection().execute(
+            "DELETE FROM cache WHERE key = ?", (key,)
+        ).rowcount == 1
+
+    def delete_many(self, *keys):
+        if not keys:
+            return True
+        self._connection().execute(
+            "DELETE FROM cache WHERE key IN ({})".format(",".join("?" * len(keys))), keys
+        )
+        return True
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache")
+        return True
@@ -7,8 +7,60 @@ NAMESPACE_LINK = "/" + NAMESPACE + "/link-relations/"
 DATA_TYPE_HTML = "text/html"
 DATA_TYPE_JSON = "application/json"
 DATA_TYPE_MASON = "application/vnd.mason+json"
+DATA_TYPE_JSON_SCHEMA = "application/schema+json"
 DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%zZ'
 THIRD_COMPONENT_URL = "http://localhost:5001"
+# the number of kept alive connections to the third component of each worker
+THIRD_COMPONENT_POOL_SIZE = 10
+# the number of seconds to wait for a connection to and for an answer of the third component
+THIRD_COMPONENT_CONNECT_TIMEOUT = 1
+THIRD_COMPONENT_READ_TIMEOUT = 5
+# the number of consecutive failed requests after which the third component is not requested
+# anymore and the number of seconds until it is requested again
+THIRD_COMPONENT_FAILURE_THRESHOLD = 5
+THIRD_COMPONENT_RECOVERY_TIMEOUT = 30
 LOGIN_ENDPOINT = "/login"
 TOKEN_VALIDATION_ENDPOINT = "/validateToken"
-CACHING_TIMEOUT = 3600
+CACHING_TIMEOUT = 86400
+# the number of seconds a version of a cache tag is kept, it outlives the cached responses,
+# a missing version is treated as invalidated, so a tag may also be evicted early
+CACHE_TAG_TIMEOUT = 2 * CACHING_TIMEOUT
+# the number of seconds the clients may cache a versioned json schema
+SCHEMA_MAX_AGE = 31536000
+# the number of seconds a stale response may be served while it is rebuilt
+STALE_GRACE_PERIOD = 30
+# the maximum number of seconds a rebuild of a cached response may block other requests
+REBUILD_LOCK_TIMEOUT = 10
+# the minimum size in bytes of a cached response body to store a compressed version of it
+COMPRESSION_MIN_SIZE = 1024
+# the number of items of a collection page if the client does not specify a limit
+DEFAULT_PAGE_SIZE = 25
+# the maximum number of items of a collection page
+MAX_PAGE_SIZE = 100
+# the range of the integers which can be stored by the database, larger query parameters
+# are rejected before they are compared with a column
+MIN_DATABASE_INTEGER = -2 ** 63
+MAX_DATABASE_INTEGER = 2 ** 63 - 1
+# the maximum page number of a collection, deeper pages have to be reached by filters or cursors
+MAX_PAGE_NUMBER = 1000000
+# the maximum number of reviews which are embedded into a movie, they are the oldest ones
+# like on the first page of the reviews of the movie
+EMBEDDED_REVIEWS_LIMIT = 10
+# the maximum number of tokens of the snippet of a search result
+SEARCH_SNIPPET_TOKENS = 16
+# the markers which enclose the matched search terms in the snippet of a search result,
+# they are control characters instead of html, because the snippet is unescaped user text,
+# the markers are removed and replaced by the offsets of the highlights before it is sent
+SEARCH_HIGHLIGHT_START = "\x02"
+SEARCH_HIGHLIGHT_END = "\x03"
+JWKS_ENDPOINT = "/.well-known/jwks.json"
+# the issuer of the jwt tokens, tokens of other issuers are rejected
+JWT_TOKEN_ISSUER = "movie-review-identity-provider"
+# the minimum number of seconds between two downloads of the public keys of the identity provider
+JWKS_REFRESH_INTERVAL = 60
+# the maximum number of tokens whose validation results are cached by each worker
+TOKEN_CACHE_SIZE = 10000
+# the maximum number of seconds the user of a valid token is cached
+TOKEN_CACHE_TTL = 300
+# the number of seconds an invalid token is cached
+TOKEN_CACHE_NEGATIVE_TTL = 10
@@ -2,17 +2,81 @@
     Contains the database definition
 """
 
-from datetime import date
+from datetime import date, datetime
 
 import dateutil.tz
 from dateutil import parser
+from sqlalchemy import event, func, inspect, select, union_all
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Session
 
 import api
 from constants import DATETIME_FORMAT
 from helper.serializer import Serializer
 
 
-class Movie(api.DB.Model, Serializer):
+class TableDeletion(api.DB.Model):
+    """
+        This class represents the database model of the last deletion of a table
+        It is used to notice deletions when checking if a table has been modified
+    """
+    table_name = api.DB.Column(api.DB.String, primary_key=True)
+    deleted_at = api.DB.Column(api.DB.DateTime, nullable=False)
+
+
+class Versioned:
+    """
+        A mixin for database models whose modifications are tracked
+        The version is incremented and the modification time is updated on every update
+    """
+    version = api.DB.Column(api.DB.Integer, nullable=False)
+    updated_at = api.DB.Column(
+        api.DB.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True
+    )
+
+    @declared_attr
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.version}
+
+    @classmethod
+    def get_last_modified(cls, *criteria):
+        """
+            Returns the time of the last modification of the table, including deletions
+            It is the high-water mark used to check if a collection has been modified
+            input:
+                criteria: optional filter criteria to restrict the rows that are considered
+            output:
+                The time of the last modification or None if the table was never modified
+        """
+        modifications = union_all(
+            select(func.max(cls.updated_at).label("modified_at")).where(*criteria),
+            select(TableDeletion.deleted_at).where(
+                TableDeletion.table_name == cls.__tablename__
+            )
+        ).subquery()
+        return api.DB.session.query(
+            func.max(modifications.c.modified_at).label("modified_at")
+        ).scalar()
+
+
+@event.listens_for(Session, "before_flush")
+def record_table_deletions(session, _flush_context, _instances):
+    """
+        Updates the deletion time of all the tables whose rows are deleted by a flush
+    """
+    tables = {
+        instance.__tablename__ for instance in session.deleted
+        if isinstance(instance, Versioned)
+    }
+    for table_name in tables:
+        session.merge(TableDeletion(table_name=table_name, deleted_at=datetime.utcnow()))
+
+
+class Movie(api.DB.Model, Versioned, Serializer):
     """
     This class represents the database model of a movie
     """
@@ -24,25 +88,38 @@ class Movie(api.DB.Model, Serializer):
     category_id = api.DB.Column(
         api.DB.Integer,
         api.DB.ForeignKey("category.id", ondelete="RESTRICT"),
-        nullable=False
+        nullable=False,
+        index=True
     )
+    # the average rating of the reviews of the movie, it is kept up to date when the reviews
+    # are changed, so the movies can be ordered by it with an index
+    average_rating = api.DB.Column(api.DB.Float, nullable=True)
 
     category = api.DB.relationship("Category")
     reviews = api.DB.relationship("Review", cascade="delete", back_populates="movie")
 
-    def serialize(self):
-        """
-            This function is used to transform a movie python object to its json representation
-            It is used to encode the json body of requests responses
-        """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "director": self.director,
-            "length": self.length,
-            "release_date": self.release_date.isoformat(),
-            "category_id": self.category_id
-        }
+    # the indexes of the filters and sort keys of the movie collection, the id at the end of
+    # each index orders the movies with equal values and is used to seek the next page
+    __table_args__ = (
+        api.DB.Index("ix_movie_title_id", "title", "id"),
+        api.DB.Index("ix_movie_release_date_id", "release_date", "id"),
+        api.DB.Index("ix_movie_average_rating_id", "average_rating", "id"),
+        api.DB.Index("ix_movie_length_id", "length", "id"),
+        api.DB.Index("ix_movie_category_id_title_id", "category_id", "title", "id"),
+        api.DB.Index("ix_movie_category_id_release_date_id", "category_id", "release_date", "id"),
+        api.DB.Index("ix_movie_director_release_date_id", "director", "release_date", "id"),
+    )
+
+    # the functions which transform the fields of a movie to their json representation,
+    # they are used to encode the json body of requests responses
+    FIELDS = {
+        "id": lambda movie: movie.id,
+        "title": lambda movie: movie.title,
+        "director": lambda movie: movie.director,
+        "length": lambda movie: movie.length,
+        "release_date": lambda movie: movie.release_date.isoformat(),
+        "category_id": lambda movie: movie.category_id
+    }
 
     def deserialize(self, doc):
         """
@@ -56,7 +133,7 @@ class Movie(api.DB.Model, Serializer):
         self.category_id = doc.get("category_id")
 
 
-class Category(api.DB.Model, Serializer):
+class Category(api.DB.Model, Versioned, Serializer):
     """
         This class represents the database model of a category
     """
@@ -65,15 +142,12 @@ class Category(api.DB.Model, Serializer):
 
     movies = api.DB.relationship("Movie", back_populates="category")
 
-    def serialize(self):
-        """
-            This function is used to transform a category python object to its json representation
-            It is used to encode the json body of requests responses
-        """
-        return {
-            "id": self.id,
-            "title": self.title
-        }
+    # the functions which transform the fields of a category to their json representation,
+    # they are used to encode the json body of requests responses
+    FIELDS = {
+        "id": lambda category: category.id,
+        "title": lambda category: category.title
+    }
 
     def deserialize(self, doc):
         """
@@ -83,14 +157,14 @@ class Category(api.DB.Model, Serializer):
         self.title = doc["title"]
 
 
-class Review(api.DB.Model, Serializer):
+class Review(api.DB.Model, Versioned, Serializer):
     """
         This class represents the database model of a review
     """
     id = api.DB.Column(api.DB.Integer, primary_key=True, autoincrement=True)
     rating = api.DB.Column(api.DB.Integer, nullable=False)
     comment = api.DB.Column(api.DB.Text, nullable=False)
-    date = api.DB.Column(api.DB.DateTime, nullable=False)
+    date = api.DB.Column(api.DB.DateTime, nullable=False, index=True)
     author = api.DB.Column(
         api.DB.String,
         nullable=True
@@ -103,19 +177,23 @@ class Review(api.DB.Model, Serializer):
 
     movie = api.DB.relationship("Movie")
 
-    def serialize(self):
-        """
-            This function is used to transform a review python object to its json representation
-            It is used to encode the json body of requests responses
-        """
-        return {
-            "id": self.id,
-            "rating": self.rating,
-            "comment": self.comment,
-            "date": self.date.strftime(DATETIME_FORMAT),
-            "author": self.author,
-            "movie_id": self.movie_id
-        }
+    # the review collections of a movie and of an author are ordered by date and id,
+    # the indexes also serve all the other lookups of the reviews by movie_id or author
+    __table_args__ = (
+        api.DB.Index("ix_review_movie_id_date_id", "movie_id", "date", "id"),
+        api.DB.Index("ix_review_author_date_id", "author", "date", "id"),
+    )
+
+    # the functions which transform the fields of a review to their json representation,
+    # they are used to encode the json body of requests responses
+    FIELDS = {
+        "id": lambda review: review.id,
+        "rating": lambda review: review.rating,
+        "comment": lambda review: review.comment,
+        "date": lambda review: review.date.strftime(DATETIME_FORMAT),
+        "author": lambda review: review.author,
+        "movie_id": lambda review: review.movie_id
+    }
 
     def deserialize(self, doc):
         """
@@ -127,3 +205,34 @@ class Review(api.DB.Model, Serializer):
         self.date = parser.isoparse(doc["date"]).astimezone(dateutil.tz.UTC)
         self.author = doc.get("author")
         self.movie_id = doc.get("movie_id")
+
+
+@event.listens_for(Session, "after_flush")
+def update_average_ratings(session, _flush_context):
+    """
+        Recomputes the average rating of all the movies whose reviews are changed by a flush
+        The modification time of the movies is kept, because the average rating
+        is not part of their representation
+    """
+    movie_ids = set()
+    for instance in set(session.new) | set(session.dirty) | set(session.deleted):
+        if not isinstance(instance, Review):
+            continue
+        state = inspect(instance)
+        if instance in session.dirty and not state.attrs.rating.history.has_changes() \
+                and not state.attrs.movie_id.history.has_changes():
+            continue
+        movie_ids.add(instance.movie_id)
+        movie_ids.update(state.attrs.movie_id.history.deleted)
+    movie_ids.discard(None)
+    if movie_ids:
+        session.execute(
+            Movie.__table__.update()
+            .where(Movie.id.in_(movie_ids))
+            .values(
+                average_rating=select(func.avg(Review.rating))
+                .where(Review.movie_id == Movie.id)
+                .scalar_subquery(),
+                updated_at=Movie.updated_at
+            )
+        )
@@ -0,0 +1,75 @@
+"""
+    Contains the full-text search index of the movies and the reviews
+    The index consists of SQLite FTS5 tables which refer to the rows of the movie and the review
+    table instead of storing a copy of them, triggers keep the index in sync with every change
+    of the tables, no matter if it is made by the ORM or by plain SQL
+"""
+from sqlalchemy import DDL, event, text
+from sqlalchemy.sql import column, table
+
+import api
+
+# the fts5 tables of the search index, their rowid is the id of the indexed row
+MOVIE_SEARCH = table("movie_search", column("rowid"), column("rank"))
+REVIEW_SEARCH = table("review_search", column("rowid"), column("rank"))
+
+# the statements which create the search index, they are skipped if it already exists
+SEARCH_INDEX_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movie_search USING fts5("
+    "title, director, content='movie', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_insert AFTER INSERT ON movie BEGIN "
+    "INSERT INTO movie_search(rowid, title, director) "
+    "VALUES (new.id, new.title, new.director); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_delete AFTER DELETE ON movie BEGIN "
+    "INSERT INTO movie_search(movie_search, rowid, title, director) "
+    "VALUES ('delete', old.id, old.title, old.director); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS movie_search_update AFTER UPDATE OF title, director "
+    "ON movie BEGIN "
+    "INSERT INTO movie_search(movie_search, rowid, title, director) "
+    "VALUES ('delete', old.id, old.title, old.director); "
+    "INSERT INTO movie_search(rowid, title, director) "
+    "VALUES (new.id, new.title, new.director); "
+    "END",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS review_search USING fts5("
+    "comment, content='review', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS review_search_insert AFTER INSERT ON review BEGIN "
+    "INSERT INTO review_search(rowid, comment) VALUES (new.id, new.comment); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS review_search_delete AFTER DELETE ON review BEGIN "
+    "INSERT INTO review_search(review_search, rowid, comment) "
+    "VALUES ('delete', old.id, old.comment); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS review_search_update AFTER UPDATE OF comment ON review BEGIN "
+    "INSERT INTO review_search(review_search, rowid, comment) "
+    "VALUES ('delete', old.id, old.comment); "
+    "INSERT INTO review_search(rowid, comment) VALUES (new.id, new.comment); "
+    "END",
+]
+
+# the statements which drop the search index, the triggers are dropped with their tables
+DROP_SEARCH_INDEX_STATEMENTS = [
+    "DROP TABLE IF EXISTS movie_search",
+    "DROP TABLE IF EXISTS review_search",
+]
+
+for statement in SEARCH_INDEX_STATEMENTS:
+    event.listen(api.DB.metadata, "after_create", DDL(statement))
+for statement in DROP_SEARCH_INDEX_STATEMENTS:
+    event.listen(api.DB.metadata, "before_drop", DDL(statement))
+
+
+def rebuild_search_index(db):
+    """
+        Creates the search index if it is missing and rebuilds it from the movie and the
+        review table, it is used to index the rows of a database which existed before the index
+        input:
+            db: the database object
+    """
+    db.create_all()
+    db.session.execute(text("INSERT INTO movie_search(movie_search) VALUES ('rebuild')"))
+    db.session.execute(text("INSERT INTO review_search(review_search) VALUES ('rebuild')"))
+    db.session.commit()
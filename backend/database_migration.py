@@ -0,0 +1,69 @@
+"""
+This module can be used to migrate an existing database to the current database definition
+Missing tables, columns and indexes are added without rebuilding the database
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+import api
+# the models have to be imported to register their tables
+import database.models
+
+DB = api.DB
+
+# the values of added columns for the rows which already exist
+MIGRATION_DEFAULTS = {
+    "version": "1",
+    "updated_at": "'{}'".format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")),
+}
+
+# the statements which fill in the added columns whose values are derived from other tables
+MIGRATION_BACKFILLS = {
+    "average_rating": "UPDATE movie SET average_rating = "
+                      "(SELECT avg(review.rating) FROM review WHERE review.movie_id = movie.id)",
+}
+
+
+def migrate(db):
+    """
+        Adds all the tables, columns and indexes of the database definition
+        which are missing in the database
+        input:
+            db: the database object
+        output:
+            A list of the executed migration statements
+    """
+    statements = []
+    db.create_all()
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            statement = "ALTER TABLE {} ADD COLUMN {}".format(
+                table.name,
+                CreateColumn(column).compile(dialect=db.engine.dialect)
+            )
+            if column.name in MIGRATION_DEFAULTS:
+                statement += " DEFAULT " + MIGRATION_DEFAULTS[column.name]
+            statements.append(statement)
+            db.session.execute(text(statement))
+            if column.name in MIGRATION_BACKFILLS:
+                statements.append(MIGRATION_BACKFILLS[column.name])
+                db.session.execute(text(MIGRATION_BACKFILLS[column.name]))
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                statements.append("CREATE INDEX {}".format(index.name))
+                index.create(db.session.connection())
+    db.session.commit()
+    return statements
+
+
+if __name__ == "__main__":
+    for executed_statement in migrate(DB):
+        print(executed_statement)
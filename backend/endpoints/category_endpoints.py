@@ -6,13 +6,16 @@ from flask import request
 from flask_restful import Resource
 
 import api
-from constants import CACHING_TIMEOUT
 from database.models import Category
 from datamodels.user import UserType
 from helper.authentication_helper import authorize
+from helper.cache_helper import cache_response
+from helper.fieldset_helper import get_fieldset, load_fieldset, add_fields
+from helper.pagination_helper import get_page
 from helper.request_blueprints import get_blueprint, put_blueprint, delete_blueprint, post_blueprint
 from json_schemas.category_json_schema import get_category_json_schema
 from mason.mason_builder import MasonBuilder
+from url_converters.url_converter import resolve_entities
 
 
 class CategoryCollection(Resource):
@@ -21,28 +24,38 @@ class CategoryCollection(Resource):
         It contains the definition of a get and a post endpoint
     """
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response("categories", last_modified=Category.get_last_modified)
     def get(cls):
         """
             This method represents the get endpoint of this resource
             output:
-                the http response object containing either the list of categories
+                the http response object containing either a page of the list of categories
                 or a http error with the corresponding error message
         """
-        categories = Category.query.all()
+        fieldset = get_fieldset(request, Category)
+        page = get_page(
+            request, load_fieldset(Category.query.order_by(Category.id), Category, fieldset)
+        )
+        body = MasonBuilder()
         category_items = []
-        for category in categories:
-            item = MasonBuilder(category.serialize())
-            item.add_control_get_category(category)
-            category_items.append(item)
+        if body.is_compact():
+            body.add_control_get_category_template()
+            category_items = [
+                category.serialize(add_fields(fieldset, "id")) for category in page.items
+            ]
+        else:
+            for category in page.items:
+                item = MasonBuilder(category.serialize(fieldset))
+                item.add_control_get_category(category)
+                category_items.append(item)
 
-        body = MasonBuilder()
         body.add_api_namespace()
         body.add_control_view_function()
         body.add_control_get_categories("self")
         body.add_control_post_category()
+        body.add_pagination(cls, page)
         body["items"] = category_items
-        return get_blueprint(body)
+        return get_blueprint(body, Category.get_last_modified())
 
     @classmethod
     def __create_category_object(cls, created_category):
@@ -62,8 +75,6 @@ class CategoryCollection(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        self.clear_cache()
-
         category = Category()
         return post_blueprint(
             request,
@@ -73,13 +84,6 @@ class CategoryCollection(Resource):
             lambda: self.__get_url_for_created_item(category)
         )
 
-    @staticmethod
-    def clear_cache():
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(CategoryCollection.get)
-
 
 class CategoryItem(Resource):
     """
@@ -87,7 +91,10 @@ class CategoryItem(Resource):
         It contains the definition of a get, a put and a delete endpoint
     """
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response(
+        "category:{category}",
+        last_modified=lambda category: category.updated_at
+    )
     def get(cls, category):
         """
             This method represents the get endpoint of this resource
@@ -97,13 +104,14 @@ class CategoryItem(Resource):
                 the http response object containing either the category with the given id
                 or a 404 http error if no movie with this id exists
         """
-        body = MasonBuilder(category.serialize())
+        body = MasonBuilder(category.serialize(get_fieldset(request, Category)))
         body.add_api_namespace()
         body.add_control_get_categories("collection")
         body.add_control_get_category(category)
         body.add_control_update_category(category)
         body.add_control_delete_category(category)
-        return get_blueprint(body)
+        body.add_control_get_movies_of_category(category)
+        return get_blueprint(body, category.updated_at)
 
     @classmethod
     def __update_category_object(cls, category, update_category):
@@ -111,6 +119,7 @@ class CategoryItem(Resource):
 
         category.title = update_category.title
 
+    @resolve_entities
     @authorize(required_role=UserType.ADMIN)
     def put(self, category):
         """
@@ -122,14 +131,12 @@ class CategoryItem(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        self.clear_cache(category)
-        CategoryCollection.clear_cache()
-
         update_category = Category()
         return put_blueprint(request, get_category_json_schema, api.DB,
                              lambda: self.__update_category_object(category, update_category))
 
     @classmethod
+    @resolve_entities
     @authorize(required_role=UserType.ADMIN)
     def delete(cls, category):
         """
@@ -141,14 +148,4 @@ class CategoryItem(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        cls.clear_cache(category)
-        CategoryCollection.clear_cache()
-
         return delete_blueprint(api.DB, category)
-
-    @staticmethod
-    def clear_cache(category):
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(CategoryItem.get, CategoryItem, category)
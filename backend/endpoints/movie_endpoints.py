@@ -1,18 +1,100 @@
 """
     All the endpoints for the movie resource
 """
+from datetime import date, MINYEAR, MAXYEAR
 
 from flask import request
 from flask_restful import Resource
+from sqlalchemy.orm import joinedload
 
 import api
-from constants import CACHING_TIMEOUT
-from database.models import Movie
+from constants import EMBEDDED_REVIEWS_LIMIT
+from database.models import Movie, Review
 from datamodels.user import UserType
 from helper.authentication_helper import authorize
+from helper.cache_helper import cache_response
+from helper.embed_helper import get_embedded_relations
+from helper.fieldset_helper import get_fieldset, load_fieldset, add_fields
+from helper.filter_helper import QueryFilter, filter_query
+from helper.pagination_helper import get_page
 from helper.request_blueprints import get_blueprint, put_blueprint, delete_blueprint, post_blueprint
 from json_schemas.movie_json_schema import get_movie_json_schema
 from mason.mason_builder import MasonBuilder
+from url_converters.url_converter import resolve_entities
+
+
+def _get_movie_items(body, page, fieldset):
+    """
+        Builds the items of a page of a movie collection
+        The items of a compact collection only contain the selected fields, their urls
+        are described by the uri template which is added to the collection
+    """
+    if body.is_compact():
+        body.add_control_get_movie_template()
+        return [movie.serialize(add_fields(fieldset, "id")) for movie in page.items]
+
+    movie_items = []
+    for movie in page.items:
+        item = MasonBuilder(movie.serialize(fieldset))
+        item.add_control_get_movie(movie)
+        movie_items.append(item)
+    return movie_items
+
+
+# the query parameters which filter the movie collection, the release years and the lengths
+# are ranges of the indexed columns release_date and length
+MOVIE_FILTERS = {
+    "category_id": QueryFilter("category_id", int, lambda value: Movie.category_id == value),
+    "director": QueryFilter("director", str, lambda value: Movie.director == value),
+    "release_year_min": QueryFilter(
+        "release_year", int, lambda year: Movie.release_date >= date(year, 1, 1),
+        minimum=MINYEAR, maximum=MAXYEAR
+    ),
+    "release_year_max": QueryFilter(
+        "release_year", int, lambda year: Movie.release_date <= date(year, 12, 31),
+        minimum=MINYEAR, maximum=MAXYEAR
+    ),
+    "length_min": QueryFilter("length", int, lambda length: Movie.length >= length),
+    "length_max": QueryFilter("length", int, lambda length: Movie.length <= length),
+}
+
+# the columns the movie collection is ordered by for each sort key
+MOVIE_SORT_KEYS = {
+    "id": (Movie.id,),
+    "title": (Movie.title, Movie.id),
+    "release_date": (Movie.release_date, Movie.id),
+    "rating": (Movie.average_rating, Movie.id),
+    "length": (Movie.length, Movie.id),
+}
+
+# the sort keys which are served by an index of the movies for each combination of filters,
+# the first sort key is the default order of the combination
+MOVIE_FILTER_COMBINATIONS = {
+    frozenset(): ("id", "title", "release_date", "rating", "length"),
+    frozenset({"category_id"}): ("id", "title", "release_date"),
+    frozenset({"director"}): ("release_date",),
+    frozenset({"release_year"}): ("release_date",),
+    frozenset({"length"}): ("length",),
+    frozenset({"category_id", "release_year"}): ("release_date",),
+    frozenset({"director", "release_year"}): ("release_date",),
+}
+
+# the additional tags of the movie collection by the sort keys which depend on the reviews
+MOVIE_SORT_TAGS = {"rating": ["ratings"]}
+
+
+def _get_movies_last_modified():
+    """
+        Returns the time of the last modification of the movie collection,
+        the order by rating also changes with the reviews
+    """
+    modifications = [Movie.get_last_modified()]
+    if request.args.get("sort", "").lstrip("-") in MOVIE_SORT_TAGS:
+        modifications.append(Review.get_last_modified())
+    return max(
+        (modification for modification in modifications if modification is not None),
+        default=None
+    )
 
 
 class MovieCollection(Resource):
@@ -21,28 +103,36 @@ class MovieCollection(Resource):
         It contains the definition of a get and a post endpoint
     """
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response(
+        "movies",
+        last_modified=_get_movies_last_modified,
+        sort_tags=MOVIE_SORT_TAGS,
+        query_parameters=(*MOVIE_FILTERS, "sort")
+    )
     def get(cls):
         """
             This method represents the get endpoint of this resource
+            The movies can be filtered and sorted by the query parameters of MOVIE_FILTERS
+            and sort, only the combinations which are served by an index are accepted
             output:
-                the http response object containing either the list of movies
+                the http response object containing either a page of the list of movies
                 or a http error with the corresponding error message
         """
-        movies = Movie.query.all()
-        movie_items = []
-        for movie in movies:
-            item = MasonBuilder(movie.serialize())
-            item.add_control_get_movie(movie)
-            movie_items.append(item)
-
+        fieldset = get_fieldset(request, Movie)
+        query, filter_values = filter_query(
+            request, Movie.query, MOVIE_FILTERS, MOVIE_SORT_KEYS, MOVIE_FILTER_COMBINATIONS
+        )
+        page = get_page(request, load_fieldset(query, Movie, fieldset))
         body = MasonBuilder()
+        movie_items = _get_movie_items(body, page, fieldset)
+
         body.add_api_namespace()
         body.add_control_view_function()
         body.add_control_get_movies("self")
         body.add_control_post_movie()
+        body.add_pagination(cls, page, **filter_values)
         body["items"] = movie_items
-        return get_blueprint(body)
+        return get_blueprint(body, _get_movies_last_modified())
 
     @classmethod
     def __create_movie_object(cls, created_movie):
@@ -62,8 +152,6 @@ class MovieCollection(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        self.clear_cache()
-
         movie = Movie()
         return post_blueprint(
             request,
@@ -73,12 +161,89 @@ class MovieCollection(Resource):
             lambda: self.__get_url_for_created_item(movie)
         )
 
-    @staticmethod
-    def clear_cache():
+
+def _get_category_movies_last_modified():
+    """
+        Returns the time of the last modification of the movies of a category
+        It is the time of the last modification of the whole movie table, because a movie
+        which has been moved to another category is no longer found by its old category
+    """
+    return Movie.get_last_modified()
+
+
+class CategoryMovieCollection(Resource):
+    """
+        This class represents the movie collection endpoints of a category
+        ALl endpoints in this class are out of the perspective of a category,
+        so the movies belong to one specific category
+        It contains the definition of a get endpoint only
+        To add new movies you have to use the MovieCollection endpoints
+    """
+    @classmethod
+    @cache_response(
+        "category:{category}",
+        "category:{category}:movies",
+        last_modified=lambda category: _get_category_movies_last_modified()
+    )
+    def get(cls, category):
         """
-            Invalidates the cache for the get endpoint of this resource
+            This method represents the get endpoint of this resource
+            The movies are looked up by the index of their category
+            input:
+                category: the category which the movies have been requested for
+            output:
+                the http response object containing either a page of the list of movies
+                of this category or a http error with the corresponding error message
         """
-        api.CACHE.delete_memoized(MovieCollection.get)
+        fieldset = get_fieldset(request, Movie)
+        page = get_page(
+            request,
+            load_fieldset(
+                Movie.query.filter_by(category_id=category.id).order_by(Movie.id),
+                Movie,
+                fieldset
+            )
+        )
+        body = MasonBuilder()
+        movie_items = _get_movie_items(body, page, fieldset)
+
+        body.add_api_namespace()
+        body.add_control_get_category(category, "up")
+        body.add_control_get_movies_of_category(category, "self")
+        body.add_control_post_movie()
+        body.add_pagination(cls, page, category=category)
+        body["items"] = movie_items
+        return get_blueprint(body, _get_category_movies_last_modified())
+
+
+# the tags of the relations which can be embedded into a movie
+MOVIE_EMBEDDED_TAGS = {
+    "category": ["categories"],
+    "reviews": ["movie:{movie}:reviews"],
+}
+
+
+def _get_movie_last_modified(movie):
+    """
+        Returns the time of the last modification of a movie and its embedded resources
+    """
+    relations = get_embedded_relations(request, MOVIE_EMBEDDED_TAGS)
+    modifications = [movie.updated_at]
+    if "category" in relations:
+        modifications.append(movie.category.updated_at)
+    if "reviews" in relations:
+        modifications.append(Review.get_last_modified(Review.movie_id == movie.id))
+    return max(modification for modification in modifications if modification is not None)
+
+
+def _get_movie_load_options():
+    """
+        Returns the loader options of the movie, its embedded category is loaded
+        by the same query as the movie
+    """
+    if "category" in get_embedded_relations(request, MOVIE_EMBEDDED_TAGS):
+        return {"movie": [joinedload(Movie.category)]}
+    return {}
 
 
 class MovieItem(Resource):
@@ -87,7 +252,12 @@ class MovieItem(Resource):
         It contains the definition of a get, a put and a delete endpoint
     """
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response(
+        "movie:{movie}",
+        last_modified=_get_movie_last_modified,
+        embedded_tags=MOVIE_EMBEDDED_TAGS,
+        load_options=_get_movie_load_options
+    )
     def get(cls, movie):
         """
             This method represents the get endpoint of this resource
@@ -96,15 +266,32 @@ class MovieItem(Resource):
             output:
                 the http response object containing either the movie with the given id
                 or a 404 http error if no movie with this id exists
+                The category and the first reviews of the movie are embedded
+                if they are selected by the query parameter embed
         """
-        body = MasonBuilder(movie.serialize())
+        relations = get_embedded_relations(request, MOVIE_EMBEDDED_TAGS)
+        body = MasonBuilder(movie.serialize(get_fieldset(request, Movie)))
         body.add_api_namespace()
         body.add_control_get_movies("collection")
         body.add_control_get_movie(movie)
         body.add_control_update_movie(movie)
         body.add_control_delete_movie(movie)
         body.add_control_get_reviews_for_movie(movie)
-        return get_blueprint(body)
+
+        if "category" in relations:
+            category = MasonBuilder(movie.category.serialize())
+            category.add_control_get_category(movie.category)
+            body["category"] = category
+        if "reviews" in relations:
+            reviews = Review.query.filter_by(movie_id=movie.id) \
+                .order_by(Review.date, Review.id) \
+                .limit(EMBEDDED_REVIEWS_LIMIT)
+            body["reviews"] = []
+            for review in reviews:
+                item = MasonBuilder(review.serialize())
+                item.add_control_get_review(movie, review)
+                body["reviews"].append(item)
+        return get_blueprint(body, _get_movie_last_modified(movie))
 
     @classmethod
     def __update_movie_object(cls, movie, update_movie):
@@ -116,6 +303,7 @@ class MovieItem(Resource):
         movie.release_date = update_movie.release_date
         movie.category_id = update_movie.category_id
 
+    @resolve_entities
     @authorize(required_role=UserType.ADMIN)
     def put(self, movie):
         """
@@ -127,9 +315,6 @@ class MovieItem(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        self.clear_cache(movie)
-        MovieCollection.clear_cache()
-
         update_movie = Movie()
         return put_blueprint(
             request,
@@ -139,6 +324,7 @@ class MovieItem(Resource):
         )
 
     @classmethod
+    @resolve_entities
     @authorize(required_role=UserType.ADMIN)
     def delete(cls, movie):
         """
@@ -150,13 +336,4 @@ class MovieItem(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        cls.clear_cache(movie)
-        MovieCollection.clear_cache()
         return delete_blueprint(api.DB, movie)
-
-    @staticmethod
-    def clear_cache(movie):
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(MovieItem.get, MovieItem, movie)
@@ -1,22 +1,77 @@
 """
     All the endpoints for the review resources
 """
-import requests
 import werkzeug
 from flask import request
 from flask_restful import Resource
+from sqlalchemy.orm import joinedload
 
 import api
-from constants import CACHING_TIMEOUT
 from database.models import Review, Movie
 from datamodels.user import UserType
 from endpoints.user_endpoints import UserItem
 from helper.authentication_helper import authorize
+from helper.cache_helper import cache_response
+from helper.embed_helper import get_embedded_relations
 from helper.error_response import ErrorResponse
+from helper.fieldset_helper import get_fieldset, load_fieldset, add_fields
+from helper.pagination_helper import get_cursor_page
 from helper.request_blueprints import get_blueprint, put_blueprint, delete_blueprint, post_blueprint
-from helper.third_component_request_helper import get_request
+from helper.third_component_request_helper import get_request, UNAVAILABLE_ERRORS
 from json_schemas.review_json_schema import get_review_json_schema
 from mason.mason_builder import MasonBuilder
+from url_converters.url_converter import EntityReference, resolve_entities
+
+# the tags of the relations which can be embedded into the reviews of a user
+USER_REVIEW_EMBEDDED_TAGS = {
+    "movie": ["movies"],
+}
+
+# the tags of the relations which can be embedded into the reviews of a movie,
+# the tag of the movie is already one of the tags of the collection
+MOVIE_REVIEW_EMBEDDED_TAGS = {
+    "movie": [],
+}
+
+
+def _embed_movies(body, items, movies):
+    """
+        Embeds the movies of the reviews into the items of a review collection
+    """
+    for item, movie in zip(items, movies):
+        if body.is_compact():
+            item["movie"] = movie.serialize()
+        else:
+            item["movie"] = MasonBuilder(movie.serialize())
+            item["movie"].add_control_get_movie(movie)
+
+
+def _get_user_reviews_last_modified(username):
+    """
+        Returns the time of the last modification of the reviews of a user
+        and of their embedded movies
+    """
+    modifications = [Review.get_last_modified(Review.author == username)]
+    if get_embedded_relations(request, USER_REVIEW_EMBEDDED_TAGS):
+        modifications.append(Movie.get_last_modified())
+    return max(
+        (modification for modification in modifications if modification is not None),
+        default=None
+    )
+
+
+def _get_movie_reviews_last_modified(movie):
+    """
+        Returns the time of the last modification of the reviews of a movie
+        and of the embedded movie
+    """
+    modifications = [Review.get_last_modified(Review.movie_id == movie.id)]
+    if get_embedded_relations(request, MOVIE_REVIEW_EMBEDDED_TAGS):
+        modifications.append(movie.updated_at)
+    return max(
+        (modification for modification in modifications if modification is not None),
+        default=None
+    )
 
 
 class UserReviewCollection(Resource):
@@ -29,47 +84,61 @@ class UserReviewCollection(Resource):
     """
 
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response("author:{username}", embedded_tags=USER_REVIEW_EMBEDDED_TAGS)
     def get(cls, username):
         """
             This method represents the get endpoint of this resource
             input:
                 user: the user, who wrote the reviews
             output:
-                the http response object containing either the list of reviews written by this
-                user or a http error with the corresponding error message
+                the http response object containing either a page of the list of reviews
+                written by this user ordered by date
+                or a http error with the corresponding error message
+                The movies of the reviews are embedded if they are selected by
+                the query parameter embed
         """
         # check if the user exists first
         url = api.API.url_for(UserItem, username=username)
         try:
             response = get_request(url)
-        except requests.exceptions.ConnectionError:
+        except UNAVAILABLE_ERRORS:
             return ErrorResponse.get_gateway_timeout()
         if response.status_code == 404:
             return ErrorResponse.get_not_found()
 
         # now check for its reviews
-        reviews = Review.query.filter_by(author=username).all()
+        fieldset = get_fieldset(request, Review)
+        relations = get_embedded_relations(request, USER_REVIEW_EMBEDDED_TAGS)
+        query = load_fieldset(
+            Review.query.filter_by(author=username), Review, fieldset,
+            Review.date, Review.movie_id
+        )
+        if "movie" in relations:
+            # the movies are loaded by the same query as the reviews
+            query = query.options(joinedload(Review.movie))
+        page = get_cursor_page(request, query, Review.date, Review.id)
+        body = MasonBuilder()
         items = []
-        for review in reviews:
-            movie = Movie.query.filter_by(id=review.movie_id).first()
+        if body.is_compact():
+            body.add_control_get_review_template()
+            items = [
+                review.serialize(add_fields(fieldset, "id", "movie_id")) for review in page.items
+            ]
+        else:
+            for review in page.items:
+                # the link only needs the id of the movie, so the movie is not loaded
+                item = MasonBuilder(review.serialize(fieldset))
+                item.add_control_get_review(EntityReference(Movie, review.movie_id), review)
+                items.append(item)
+
+        if "movie" in relations:
+            _embed_movies(body, items, [review.movie for review in page.items])
 
-            item = MasonBuilder(review.serialize())
-            item.add_control_get_review(movie, review)
-            items.append(item)
-
-        body = MasonBuilder()
         body.add_control_get_user(username, "author")
         body.add_control_get_reviews_of_user(username=username, rel="self")
+        body.add_cursor_pagination(cls, page, username=username)
         body["items"] = items
-        return get_blueprint(body)
-
-    @staticmethod
-    def clear_cache(username):
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(UserReviewCollection.get, UserReviewCollection, username)
+        return get_blueprint(body, _get_user_reviews_last_modified(username))
 
 
 class MovieReviewCollection(Resource):
@@ -81,30 +150,59 @@ class MovieReviewCollection(Resource):
     """
 
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response(
+        "movie:{movie}",
+        "movie:{movie}:reviews",
+        last_modified=_get_movie_reviews_last_modified,
+        embedded_tags=MOVIE_REVIEW_EMBEDDED_TAGS
+    )
     def get(cls, movie):
         """
             This method represents the get endpoint of this resource
             input:
                 movie: the movie which the reviews have been requested for
             output:
-                the http response object containing either the list of reviews of this movie
+                the http response object containing either a page of the list of reviews
+                of this movie ordered by date
                 or a http error with the corresponding error message
+                The movie is embedded into the reviews if it is selected by
+                the query parameter embed
         """
-        reviews = Review.query.filter_by(movie_id=movie.id).all()
+        fieldset = get_fieldset(request, Review)
+        relations = get_embedded_relations(request, MOVIE_REVIEW_EMBEDDED_TAGS)
+        page = get_cursor_page(
+            request,
+            load_fieldset(
+                Review.query.filter_by(movie_id=movie.id), Review, fieldset,
+                Review.date, Review.movie_id
+            ),
+            Review.date,
+            Review.id
+        )
+        body = MasonBuilder()
         review_items = []
-        for review in reviews:
-            item = MasonBuilder(review.serialize())
-            item.add_control_get_review(movie, review)
-            review_items.append(item)
+        if body.is_compact():
+            body.add_control_get_review_template()
+            review_items = [
+                review.serialize(add_fields(fieldset, "id", "movie_id")) for review in page.items
+            ]
+        else:
+            for review in page.items:
+                item = MasonBuilder(review.serialize(fieldset))
+                item.add_control_get_review(movie, review)
+                review_items.append(item)
+
+        if "movie" in relations:
+            # all the reviews belong to the movie of the url
+            _embed_movies(body, review_items, [movie] * len(review_items))
 
-        body = MasonBuilder()
         body.add_api_namespace()
         body.add_control_get_movie(movie, "up")
         body.add_control_get_reviews_for_movie(movie=movie, rel="self")
         body.add_control_post_review(movie=movie)
+        body.add_cursor_pagination(cls, page, movie=movie)
         body["items"] = review_items
-        return get_blueprint(body)
+        return get_blueprint(body, _get_movie_reviews_last_modified(movie))
 
     @classmethod
     def __create_review_object(cls, movie, created_review, authenticated_user):
@@ -121,14 +219,13 @@ class MovieReviewCollection(Resource):
                 "The movie_id does not match the given url parameter"
             )
 
-        cls.clear_cache(movie)
-        UserReviewCollection.clear_cache(created_review.author)
         return created_review
 
     @classmethod
     def __get_url_for_created_item(cls, movie, review):
         return api.API.url_for(MovieReviewItem, movie=movie, review=review)
 
+    @resolve_entities
     @authorize(return_authenticated_user=True)
     def post(self, movie, authenticated_user):
         """
@@ -157,12 +254,9 @@ class MovieReviewCollection(Resource):
             lambda: self.__get_url_for_created_item(movie, review)
         )
 
-    @staticmethod
-    def clear_cache(movie):
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(MovieReviewCollection.get, MovieReviewCollection, movie)
+
+def _get_review_last_modified(movie, review):
+    return review.updated_at if movie.id == review.movie_id else None
 
 
 class MovieReviewItem(Resource):
@@ -172,7 +266,7 @@ class MovieReviewItem(Resource):
     """
 
     @classmethod
-    @api.CACHE.memoize(timeout=CACHING_TIMEOUT)
+    @cache_response("review:{review}", last_modified=_get_review_last_modified)
     def get(cls, movie, review):
         """
             This method represents the get endpoint of this resource
@@ -187,13 +281,13 @@ class MovieReviewItem(Resource):
         if movie.id != review.movie_id:
             return ErrorResponse.get_not_found()
 
-        body = MasonBuilder(review.serialize())
+        body = MasonBuilder(review.serialize(get_fieldset(request, Review)))
         body.add_api_namespace()
         body.add_control_get_reviews_for_movie(movie, "collection")
         body.add_control_get_review(movie, review)
         body.add_control_update_review(movie, review)
         body.add_control_delete_review(movie, review)
-        return get_blueprint(body)
+        return get_blueprint(body, review.updated_at)
 
     @classmethod
     def __update_review_object(cls, review, update_review):
@@ -208,6 +302,7 @@ class MovieReviewItem(Resource):
         review.comment = update_review.comment
         review.date = update_review.date
 
+    @resolve_entities
     @authorize(return_authenticated_user=True)
     def put(self, movie, review, authenticated_user):
         """
@@ -236,15 +331,12 @@ class MovieReviewItem(Resource):
         if movie.id != review.movie_id:
             return ErrorResponse.get_not_found()
 
-        self.clear_cache(movie, review)
-        UserReviewCollection.clear_cache(review.author)
-        MovieReviewCollection.clear_cache(movie)
-
         update_review = Review()
         return put_blueprint(request, get_review_json_schema, api.DB,
                              lambda: self.__update_review_object(review, update_review))
 
     @classmethod
+    @resolve_entities
     @authorize(return_authenticated_user=True)
     def delete(cls, movie, review, authenticated_user):
         """
@@ -271,15 +363,4 @@ class MovieReviewItem(Resource):
         if movie.id != review.movie_id:
             return ErrorResponse.get_not_found()
 
-        cls.clear_cache(movie, review)
-        UserReviewCollection.clear_cache(review.author)
-        MovieReviewCollection.clear_cache(movie)
-
         return delete_blueprint(api.DB, review)
-
-    @staticmethod
-    def clear_cache(movie, review):
-        """
-            Invalidates the cache for the get endpoint of this resource
-        """
-        api.CACHE.delete_memoized(MovieReviewItem.get, MovieReviewItem, movie, review)
@@ -0,0 +1,44 @@
+"""
+    All the endpoints for the json schema resource
+"""
+
+from flask import request, Response
+from flask_restful import Resource
+
+from constants import DATA_TYPE_JSON_SCHEMA, SCHEMA_MAX_AGE
+from helper.error_response import ErrorResponse
+from json_schemas.schema_registry import JSON_SCHEMAS, get_encoded_json_schema
+
+
+class JsonSchemaItem(Resource):
+    """
+        This class represents the json schema item endpoint
+        The controls of the other resources refer to the schemas by their url instead of
+        containing them, the url contains the version of the schema, so a response
+        for the current version may be cached by the clients forever
+    """
+    @classmethod
+    def get(cls, name):
+        """
+            This method represents the get endpoint of this resource
+            input:
+                name: the name of the json schema, e.g. movie
+            output:
+                the http response object containing either the json schema
+                or a 404 http error if no schema with this name exists
+        """
+        json_schema = JSON_SCHEMAS.get(name)
+        if json_schema is None:
+            return ErrorResponse.get_not_found()
+
+        body, version = get_encoded_json_schema(json_schema)
+        response = Response(body, 200, mimetype=DATA_TYPE_JSON_SCHEMA)
+        response.set_etag(version)
+        if request.args.get("version") == version:
+            response.cache_control.public = True
+            response.cache_control.max_age = SCHEMA_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # the unversioned url always refers to the current version of the schema
+            response.cache_control.no_cache = True
+        return response
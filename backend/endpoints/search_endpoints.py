@@ -0,0 +1,139 @@
+"""
+    All the endpoints for the search resource
+"""
+
+from flask import request
+from flask_restful import Resource
+from sqlalchemy import func, literal, literal_column, null, select, union_all
+from werkzeug.exceptions import BadRequest
+
+import api
+from constants import SEARCH_SNIPPET_TOKENS, SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_END
+from database.models import Movie, Review
+from database.search_index import MOVIE_SEARCH, REVIEW_SEARCH
+from helper.cache_helper import cache_response
+from helper.pagination_helper import get_page
+from helper.request_blueprints import get_blueprint
+from mason.mason_builder import MasonBuilder
+from url_converters.url_converter import EntityReference
+
+
+def _get_search_terms():
+    """
+        Converts the query parameter q to a fts5 query which matches all of its terms,
+        every term is quoted, so the operators of the fts5 query syntax are searched as text
+    """
+    terms = request.args.get("q", "").split()
+    if not terms:
+        raise BadRequest("The query parameter q must contain a search term")
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _get_snippet(search_table):
+    return func.snippet(
+        literal_column(search_table.name),
+        -1,
+        SEARCH_HIGHLIGHT_START,
+        SEARCH_HIGHLIGHT_END,
+        "…",
+        SEARCH_SNIPPET_TOKENS
+    )
+
+
+def _get_highlights(snippet):
+    """
+        Removes the highlight markers from a snippet
+        output:
+            the plain text of the snippet and the start and the end offsets of its highlights,
+            they are counted in unicode code points
+    """
+    text, *parts = snippet.split(SEARCH_HIGHLIGHT_START)
+    highlights = []
+    for part in parts:
+        highlight, _, rest = part.partition(SEARCH_HIGHLIGHT_END)
+        highlights.append([len(text), len(text) + len(highlight)])
+        text += highlight + rest
+    return text, highlights
+
+
+def _search(terms):
+    """
+        Returns the query of the movies and the reviews which match the search terms,
+        they are ordered by their bm25 rank, the best match first
+    """
+    movies = select(
+        literal("movie").label("type"),
+        MOVIE_SEARCH.c.rowid.label("id"),
+        null().label("movie_id"),
+        _get_snippet(MOVIE_SEARCH).label("snippet"),
+        MOVIE_SEARCH.c.rank.label("rank")
+    ).select_from(MOVIE_SEARCH).where(literal_column(MOVIE_SEARCH.name).match(terms))
+    reviews = select(
+        literal("review").label("type"),
+        REVIEW_SEARCH.c.rowid.label("id"),
+        Review.movie_id.label("movie_id"),
+        _get_snippet(REVIEW_SEARCH).label("snippet"),
+        REVIEW_SEARCH.c.rank.label("rank")
+    ).select_from(
+        REVIEW_SEARCH.join(Review, Review.id == REVIEW_SEARCH.c.rowid)
+    ).where(literal_column(REVIEW_SEARCH.name).match(terms))
+    results = union_all(movies, reviews).subquery("results")
+    return api.DB.session.query(results).order_by(
+        results.c.rank, results.c.type, results.c.id
+    )
+
+
+def _get_search_last_modified():
+    """
+        Returns the time of the last modification of the searched movies and reviews
+    """
+    modifications = [Movie.get_last_modified(), Review.get_last_modified()]
+    return max(
+        (modification for modification in modifications if modification is not None),
+        default=None
+    )
+
+
+class SearchCollection(Resource):
+    """
+        This class represents the search endpoint
+        It contains the definition of a get endpoint only
+    """
+    @classmethod
+    @cache_response(
+        "movies", "reviews", last_modified=_get_search_last_modified, query_parameters=("q",)
+    )
+    def get(cls):
+        """
+            This method represents the get endpoint of this resource
+            The titles and the directors of the movies and the comments of the reviews are
+            searched by the full-text search index for all the terms of the query parameter q
+            output:
+                the http response object containing either a page of the ranked search results
+                or a http error with the corresponding error message
+        """
+        query = request.args.get("q", "")
+        page = get_page(request, _search(_get_search_terms()))
+        body = MasonBuilder()
+        items = []
+        for result in page.items:
+            snippet, highlights = _get_highlights(result.snippet)
+            item = MasonBuilder(
+                type=result.type,
+                id=result.id,
+                snippet=snippet,
+                highlights=highlights
+            )
+            if result.type == "movie":
+                item.add_control_get_movie(result)
+            else:
+                item["movie_id"] = result.movie_id
+                item.add_control_get_review(EntityReference(Movie, result.movie_id), result)
+            items.append(item)
+
+        body.add_api_namespace()
+        body.add_control_view_function()
+        body.add_control_get_search_results(query)
+        body.add_pagination(cls, page, q=query)
+        body["items"] = items
+        return get_blueprint(body, _get_search_last_modified())
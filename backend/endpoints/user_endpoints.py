@@ -2,6 +2,7 @@
     All the endpoints for the user resources
 """
 import json
+from urllib.parse import quote
 
 import werkzeug
 from flask import request
@@ -9,7 +10,6 @@ from flask_restful import Resource
 
 from datamodels.user import UserType
 from helper.authentication_helper import authorize
-from helper.request_blueprints import get_blueprint
 from helper.third_component_request_helper import get_request, forward, post_request, put_request, \
     delete_request
 from mason.mason_builder import MasonBuilder
@@ -58,7 +58,7 @@ class UserCollection(Resource):
             output:
                 a http response object representing the result of this operation
         """
-        return forward(lambda: post_request(request.path, request.json))
+        return forward(lambda: post_request(request.path, request.json, stream=True))
 
 
 class UserItem(Resource):
@@ -123,7 +123,7 @@ class UserItem(Resource):
                 "You are not authorized to edit the profile of another user"
             )
 
-        return forward(lambda: put_request(request.path, request.json))
+        return forward(lambda: put_request(request.path, request.json, stream=True))
 
     @classmethod
     @authorize(return_authenticated_user=True)
@@ -146,7 +146,7 @@ class UserItem(Resource):
                 "You are not authorized to delete the profile of another user"
             )
 
-        return forward(lambda: delete_request(request.path))
+        return forward(lambda: delete_request(request.path, stream=True))
 
 
 class AuthenticatedUserItem(Resource):
@@ -155,19 +155,29 @@ class AuthenticatedUserItem(Resource):
         It contains the definition of a single get endpoint
     """
 
+    @classmethod
+    def __inject_mason(cls, user_json):
+        body = MasonBuilder(user_json)
+        body.add_control_view_function()
+        body.add_control_get_user(user_json['username'])
+        body.add_control_get_reviews_of_user(user_json['username'])
+        return json.dumps(body)
+
     @classmethod
     @authorize(return_authenticated_user=True)
     def get(cls, authenticated_user):
         """
             This method represents the get endpoint of this resource
+            The token only contains the username and the role, so the profile of the user
+            is loaded from the identity provider
             input:
                 authenticated_user: the currently authenticated user injected
                     by the authentication helper
             output:
                 the http response object containing the currently authenticated user
         """
-        body = MasonBuilder(authenticated_user.serialize())
-        body.add_control_view_function()
-        body.add_control_get_user(authenticated_user.username)
-        body.add_control_get_reviews_of_user(authenticated_user.username)
-        return get_blueprint(body)
+        url = "/api/users/{}/".format(quote(authenticated_user.username, safe=""))
+        return forward(
+            lambda: get_request(url),
+            lambda user_json: cls.__inject_mason(user_json)
+        )
@@ -1,17 +1,24 @@
 """
     Contains helper functions to handle authentication for endpoints
+    The tokens are verified locally, the token validation endpoint of the identity provider
+    is only used as fallback if REMOTE_TOKEN_VALIDATION_FALLBACK is configured
+    The validation results are cached, so a token is validated only once within its lifetime
 """
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 
-import requests
-from flask import request
+import jwt
+from flask import current_app, request
 
-from constants import TOKEN_VALIDATION_ENDPOINT
+from constants import TOKEN_VALIDATION_ENDPOINT, TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL, \
+    TOKEN_CACHE_NEGATIVE_TTL
 from datamodels.user import UserType, User
 from helper.error_response import ErrorResponse
-
-
-from helper.third_component_request_helper import post_request
+from helper.third_component_request_helper import post_request, UNAVAILABLE_ERRORS
+from helper.token_helper import UnknownSigningKeyError, verify_token
 
 
 def __role_requirement_satisfied(role, required_role):
@@ -19,6 +26,150 @@ def __role_requirement_satisfied(role, required_role):
         role == UserType.BASIC_USER and required_role == UserType.BASIC_USER
 
 
+class TokenValidationCache:
+    """
+        A bounded least recently used cache of the validation results of tokens
+        The users of valid tokens are cached until the token expires, but at most for
+        TOKEN_CACHE_TTL seconds, invalid tokens are cached for TOKEN_CACHE_NEGATIVE_TTL seconds
+        The tokens are only stored as digest
+    """
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        """
+            input:
+                max_size: the maximum number of cached tokens
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token):
+        """
+            Returns the cached validation result of a token
+            input:
+                token: the token of the Authorization header
+            output: Either the authenticated user, the message why the token is invalid
+                or None if the token is not cached
+        """
+        key = self._get_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def add(self, token, result, expires_at):
+        """
+            Caches the validation result of a token, the least recently used token
+            is removed if the cache is full
+            input:
+                token: the token of the Authorization header
+                result: either the authenticated user or the message why the token is invalid
+                expires_at: the time until the result may be used
+        """
+        key = self._get_key(token)
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+            Removes all the cached tokens
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+TOKEN_CACHE = TokenValidationCache()
+
+
+def __validate_token_remotely(token):
+    """
+        Validates a token by using the token validation endpoint of the identity provider
+        output: Either the authenticated user, the message why the token is invalid
+            or None if the token could not be validated
+    """
+    body = {
+        "token": token
+    }
+    try:
+        response = post_request(TOKEN_VALIDATION_ENDPOINT, body)
+    except UNAVAILABLE_ERRORS:
+        return None
+
+    # the token is invalid => forward the message
+    if response.status_code == 401:
+        return response.json()
+    if response.status_code == 200:
+        user = User()
+        user.deserialize(response.json())
+        return user
+
+    # default: the token could not be validated
+    return None
+
+
+def __validate_token(token):
+    """
+        Verifies a token with the public keys of the identity provider
+        output: Either the authenticated user, the message why the token is invalid
+            or None if the token could not be validated
+    """
+    try:
+        return verify_token(token)
+    except jwt.ExpiredSignatureError:
+        return "Token expired. Get new one"
+    except (UnknownSigningKeyError, *UNAVAILABLE_ERRORS):
+        # the token cannot be verified locally, e.g. while the keys are rotated
+        if current_app.config["REMOTE_TOKEN_VALIDATION_FALLBACK"]:
+            return __validate_token_remotely(token)
+        return None
+    except jwt.InvalidTokenError:
+        return "Invalid Token"
+
+
+def __get_cache_expiration_time(token):
+    expires_at = time.time() + TOKEN_CACHE_TTL
+    try:
+        # the signature has already been validated
+        payload = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return expires_at
+    return min(expires_at, payload.get("exp", expires_at))
+
+
+def __authenticate(token):
+    """
+        Validates a token, the validation results are cached
+        output: Either the authenticated user or an error response
+    """
+    result = TOKEN_CACHE.get(token)
+    if result is None:
+        result = __validate_token(token)
+        # results of failed validations are not cached, e.g. if the identity provider is down
+        if isinstance(result, User):
+            TOKEN_CACHE.add(token, result, __get_cache_expiration_time(token))
+        elif result is not None:
+            TOKEN_CACHE.add(token, result, time.time() + TOKEN_CACHE_NEGATIVE_TTL)
+
+    if result is None:
+        return ErrorResponse.get_unauthorized()
+    if not isinstance(result, User):
+        return ErrorResponse(result, 401).get_http_response()
+    return result
+
+
 def authorize(_func=None, *, required_role=UserType.BASIC_USER, return_authenticated_user=False):
     """
         This function represents the @authorize annotation
@@ -46,30 +197,14 @@ def authorize(_func=None, *, required_role=UserType.BASIC_USER, return_authentic
                     401
                 ).get_http_response()
 
-            # validate the token by using the third component
-            body = {
-                "token": token
-            }
-            try:
-                response = post_request(TOKEN_VALIDATION_ENDPOINT, body)
-            except requests.exceptions.ConnectionError:
-                return ErrorResponse.get_unauthorized()
-
-            # the token is invalid => forward the response
-            if response.status_code == 401:
-                return ErrorResponse(response.json(), response.status_code).get_http_response()
-            # the token was valid, validate the role of the user
-            if response.status_code == 200:
-                user = User()
-                user.deserialize(response.json())
-                if __role_requirement_satisfied(user.role, required_role):
-                    return func(*args, **kwargs, authenticated_user=user)\
-                        if return_authenticated_user \
-                        else func(*args, **kwargs)
-                return ErrorResponse.get_forbidden()
-
-            # default: return unauthorized
-            return ErrorResponse.get_unauthorized()
+            user = __authenticate(token)
+            if not isinstance(user, User):
+                return user
+            if __role_requirement_satisfied(user.role, required_role):
+                return func(*args, **kwargs, authenticated_user=user)\
+                    if return_authenticated_user \
+                    else func(*args, **kwargs)
+            return ErrorResponse.get_forbidden()
         return wrapper_token_required
 
     if _func is None:
@@ -0,0 +1,340 @@
+"""
+    Contains helper functions to cache the responses of get endpoints
+    Every cached response is tagged with the database entities it was built from,
+    the invalidation engine purges all the responses of an entity as soon as a
+    change of the entity is committed
+    Only a single request rebuilds an invalidated response, concurrent requests are
+    served the stale response for a short grace period or wait for the rebuild
+    The cache entries contain the encoded response body, so a cached response is sent
+    without encoding it again, they have the layout
+    (tag versions, body, etag, gzip compressed body or None, last modification time or None)
+"""
+import gzip
+import hashlib
+import time
+import uuid
+from datetime import timezone
+from functools import wraps
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+from flask import request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+import api
+from constants import CACHING_TIMEOUT, CACHE_TAG_TIMEOUT, STALE_GRACE_PERIOD, \
+    REBUILD_LOCK_TIMEOUT, COMPRESSION_MIN_SIZE
+from helper.embed_helper import get_embedded_relations
+from helper.request_blueprints import get_encoded_blueprint, get_not_modified_blueprint
+from url_converters.url_converter import resolve_references
+
+# the tags which are invalidated if a row of the given table is changed
+ENTITY_TAGS = {
+    "category": lambda category: [
+        "categories",
+        "category:{}".format(category.id),
+    ],
+    "movie": lambda movie: [
+        "movies",
+        "movie:{}".format(movie.id),
+        "category:{}:movies".format(movie.category_id),
+    ],
+    "review": lambda review: [
+        "review:{}".format(review.id),
+        "movie:{}:reviews".format(review.movie_id),
+        "author:{}".format(review.author),
+        "reviews",
+        "ratings",
+    ],
+}
+
+# the query parameters which select the page or the representation of every cached response,
+# the query parameters which are not read by a resource are left out of the cache key, so they
+# cannot fill the cache with copies of the same response
+RESPONSE_QUERY_PARAMETERS = (
+    "page", "limit", "cursor", "fields", "controls", "embed", "representation", "schemas"
+)
+
+# the interval in seconds in which waiting requests check if a rebuild has finished
+REBUILD_POLL_INTERVAL = 0.05
+
+
+def __get_new_tag_version():
+    """
+        Returns a new unique tag version, it contains the time of the invalidation
+    """
+    return time.time(), uuid.uuid4().hex
+
+
+def __get_response_key(resource, identifiers, query_parameters):
+    """
+        Builds the cache key of a response from the name of the resource, the primary keys
+        of the url parameters and the query parameters which are read by the resource,
+        e.g. response/MovieReviewItem:movie=1:review=3?page=2
+    """
+    key = "response/" + resource.__name__
+    for name, value in sorted(identifiers.items()):
+        key += ":{}={}".format(name, value)
+    # the resources only read the first value of a query parameter
+    values = sorted(
+        (name, request.args[name]) for name in query_parameters if name in request.args
+    )
+    if values:
+        key += "?" + urlencode(values)
+    return key
+
+
+def __get_tag_versions(tag_keys):
+    """
+        Returns the current versions of the given tags, the version of a tag which is not
+        cached is None, it is treated as invalidated, so it never matches a cached response
+        Every invalidation replaces the version of a tag, which makes all the responses
+        cached for the old version stale
+    """
+    return api.CACHE.get_many(*tag_keys)
+
+
+def __create_tag_versions(tag_keys, versions):
+    """
+        Creates the versions of the tags which are not cached yet, so the rebuilt response
+        can be cached for them
+        output:
+            the current versions of the tags and the keys of the created versions
+    """
+    versions = list(versions)
+    created_keys = {}
+    for index, version in enumerate(versions):
+        if version is None:
+            new_version = __get_new_tag_version()
+            if api.CACHE.add(tag_keys[index], new_version, timeout=CACHE_TAG_TIMEOUT):
+                created_keys[tag_keys[index]] = new_version
+            versions[index] = api.CACHE.get(tag_keys[index])
+    return versions, created_keys
+
+
+def __delete_tag_versions(created_keys):
+    """
+        Deletes the created tag versions of a response which has not been cached,
+        so requests cannot fill the cache with the tags of resources which do not exist
+        Deleting a version which has been replaced meanwhile only invalidates the tag again
+    """
+    for tag_key, version in created_keys.items():
+        if api.CACHE.get(tag_key) == version:
+            api.CACHE.delete(tag_key)
+
+
+def __get_staleness(cached_versions, versions):
+    """
+        Returns the number of seconds since a cached response has become stale,
+        the time of the invalidation of a tag which is not cached anymore is unknown
+    """
+    invalidation_times = [
+        0 if version is None else version[0]
+        for cached_version, version in zip(cached_versions, versions)
+        if cached_version != version
+    ]
+    return time.time() - min(invalidation_times, default=0)
+
+
+def __is_rebuilt(entry, stale_entry):
+    """
+        Checks if a cached response has been rebuilt by another request
+    """
+    return entry is not None and (stale_entry is None or entry[0] != stale_entry[0])
+
+
+def __create_entry(versions, response):
+    """
+        Creates the cache entry of a response, it contains the encoded body, its entity tag
+        and a compressed version of the body if it is large enough to be worth it
+    """
+    body = response.get_data()
+    compressed_body = gzip.compress(body) if len(body) >= COMPRESSION_MIN_SIZE else None
+    return versions, body, hashlib.sha1(body).hexdigest(), compressed_body, \
+        response.last_modified
+
+
+def __get_http_response(entry):
+    return get_encoded_blueprint(request, *entry[1:])
+
+
+def __is_not_modified(last_modified):
+    """
+        Checks if a resource has not been modified since the time of the If-Modified-Since
+        header, requests with entity tags cannot be checked without the response body
+    """
+    return last_modified is not None and request.if_modified_since is not None \
+        and not request.if_none_match \
+        and last_modified.replace(microsecond=0, tzinfo=timezone.utc) \
+        <= request.if_modified_since
+
+
+def __rebuild_response(key, tag_keys, versions, stale_entry, build_response):
+    """
+        Rebuilds a response which is not cached or whose cached version is stale
+        A lock makes sure that only one request of all workers rebuilds the response,
+        meanwhile the other requests are served the stale response within the grace period
+        or wait until the rebuilt response is cached
+    """
+    lock_key = "lock/" + key
+    lock_token = uuid.uuid4().hex
+    deadline = time.time() + REBUILD_LOCK_TIMEOUT
+    while not api.CACHE.add(lock_key, lock_token, timeout=REBUILD_LOCK_TIMEOUT):
+        if stale_entry is not None and \
+                __get_staleness(stale_entry[0], versions) <= STALE_GRACE_PERIOD:
+            return __get_http_response(stale_entry)
+        # the rebuilding request takes too long, rebuild the response without the lock
+        if time.time() >= deadline:
+            break
+        time.sleep(REBUILD_POLL_INTERVAL)
+        entry = api.CACHE.get(key)
+        if __is_rebuilt(entry, stale_entry):
+            return __get_http_response(entry)
+
+    created_keys = {}
+    try:
+        # the response may have been rebuilt before the lock was acquired
+        entry = api.CACHE.get(key)
+        if __is_rebuilt(entry, stale_entry):
+            return __get_http_response(entry)
+
+        versions, created_keys = __create_tag_versions(tag_keys, versions)
+        response = build_response()
+        if response.status_code != 200:
+            return response
+        entry = __create_entry(versions, response)
+        api.CACHE.set(key, entry, timeout=CACHING_TIMEOUT)
+        created_keys = {}
+        return __get_http_response(entry)
+    finally:
+        # the created tags of a response which has not been cached, e.g. of a resource
+        # which does not exist, are removed again
+        __delete_tag_versions(created_keys)
+        if api.CACHE.get(lock_key) == lock_token:
+            api.CACHE.delete(lock_key)
+
+
+def cache_response(
+        *tags, last_modified=None, embedded_tags=None, sort_tags=None, query_parameters=(),
+        load_options=None
+):
+    """
+        This function represents the @cache_response annotation
+        It caches the responses of a get endpoint, the cache key is derived from the name of
+        the resource, the primary keys of the url parameters and the query parameters
+        which are read by the resource
+        The database objects of the url parameters are only loaded if the response
+        is not cached yet
+        input:
+            tags: the tags of the entities the response is built from, they are formatted
+                with the primary keys of the url parameters, e.g. "movie:{movie}"
+            last_modified: an optional function which returns the time of the last
+                modification of the resource, it receives the url parameters and is used to
+                answer conditional requests without building the response
+            embedded_tags: an optional dict which contains the additional tags of the
+                response by the names of the relations the resource can embed,
+                e.g. {"reviews": ["movie:{movie}:reviews"]}
+            sort_tags: an optional dict which contains the additional tags of the response
+                by the sort keys whose order depends on other entities, e.g. {"rating": ["ratings"]}
+            query_parameters: the query parameters the resource reads in addition to
+                RESPONSE_QUERY_PARAMETERS, e.g. its filters
+            load_options: an optional function which returns the loader options of the
+                url parameters by their names, e.g. to load an embedded relation by the
+                same query as the database object
+    """
+    response_query_parameters = RESPONSE_QUERY_PARAMETERS + tuple(query_parameters)
+
+    def inner_cache_response(func):
+        @wraps(func)
+        def wrapper_cache_response(resource, **kwargs):
+            identifiers = {name: getattr(value, "id", value) for name, value in kwargs.items()}
+            key = __get_response_key(resource, identifiers, response_query_parameters)
+            response_tags = list(tags)
+            if embedded_tags is not None:
+                relations = get_embedded_relations(request, embedded_tags)
+                for relation, relation_tags in embedded_tags.items():
+                    if relation in relations:
+                        response_tags.extend(relation_tags)
+            if sort_tags is not None:
+                response_tags.extend(sort_tags.get(request.args.get("sort", "").lstrip("-"), []))
+            tag_keys = ["tag/" + tag.format(**identifiers) for tag in response_tags]
+            versions = __get_tag_versions(tag_keys)
+
+            entry = api.CACHE.get(key)
+            if entry is not None and None not in versions and entry[0] == versions:
+                return __get_http_response(entry)
+
+            options = load_options() if load_options is not None else None
+            if last_modified is not None and request.if_modified_since is not None:
+                kwargs = resolve_references(kwargs, options)
+                modified_at = last_modified(**kwargs)
+                if __is_not_modified(modified_at):
+                    return get_not_modified_blueprint(modified_at)
+
+            return __rebuild_response(
+                key,
+                tag_keys,
+                versions,
+                entry,
+                lambda: func(resource, **resolve_references(kwargs, options))
+            )
+        return wrapper_cache_response
+    return inner_cache_response
+
+
+def invalidate_tags(tags):
+    """
+        Invalidates all the cached responses which are tagged with one of the given tags
+        input:
+            tags: the tags to invalidate, e.g. movie:7
+    """
+    if tags:
+        api.CACHE.set_many(
+            {"tag/" + tag: __get_new_tag_version() for tag in tags}, timeout=CACHE_TAG_TIMEOUT
+        )
+
+
+def __get_previous_state(instance):
+    """
+        Returns the attribute values of a database object before its pending changes
+    """
+    state = inspect(instance)
+    values = {}
+    for attribute in state.mapper.column_attrs:
+        history = state.attrs[attribute.key].history
+        values[attribute.key] = history.deleted[0] if history.deleted \
+            else state.attrs[attribute.key].value
+    return SimpleNamespace(**values)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_invalidated_tags(session, _flush_context):
+    """
+        Collects the tags of all the database objects which are changed by a flush
+        The tags are invalidated as soon as the transaction is committed
+    """
+    tags = session.info.setdefault("invalidated_cache_tags", set())
+    for instance in set(session.new) | set(session.dirty) | set(session.deleted):
+        get_tags = ENTITY_TAGS.get(getattr(instance, "__tablename__", None))
+        if get_tags is None:
+            continue
+        tags.update(get_tags(instance))
+        if instance not in session.new:
+            tags.update(get_tags(__get_previous_state(instance)))
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_tags(session):
+    """
+        Invalidates the cached responses of all the database objects changed by a transaction
+    """
+    invalidate_tags(session.info.pop("invalidated_cache_tags", set()))
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_invalidated_tags(session):
+    """
+        Discards the collected tags if the changes are rolled back
+    """
+    session.info.pop("invalidated_cache_tags", None)
@@ -0,0 +1,29 @@
+"""
+    Contains helper functions to embed related resources into a response, e.g. ?embed=category,reviews
+    The related resources are sent together with the resource, so the client does not have to
+    request them one by one
+"""
+from werkzeug.exceptions import BadRequest
+
+
+def get_embedded_relations(request, relations):
+    """
+        Returns the names of the relations which are selected by the query parameter embed
+        input:
+            request: the request object, which is sent
+            relations: the names of the relations the resource can embed
+        output:
+            The set of the selected relation names, it is empty if embed is not set
+        exceptions:
+            BadRequest: It is raised if one of the relations cannot be embedded
+    """
+    embed = request.args.get("embed")
+    if embed is None:
+        return set()
+    embedded_relations = {relation for relation in embed.split(",") if relation}
+    unknown_relations = embedded_relations - set(relations)
+    if unknown_relations:
+        raise BadRequest(
+            "The relations {} cannot be embedded".format(", ".join(sorted(unknown_relations)))
+        )
+    return embedded_relations
@@ -0,0 +1,63 @@
+"""
+    Contains helper functions to restrict the fields of a response to the fields
+    requested by the client, e.g. ?fields=id,title
+    The columns of the fields which are not requested are not loaded from the database
+"""
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import BadRequest
+
+
+def get_fieldset(request, model):
+    """
+        Returns the names of the fields which are selected by the query parameter fields
+        input:
+            request: the request object, which is sent
+            model: the database model class of the requested objects
+        output:
+            The set of the selected field names or None if all the fields are requested
+        exceptions:
+            BadRequest: It is raised if one of the fields does not exist
+    """
+    fields = request.args.get("fields")
+    if fields is None:
+        return None
+    fieldset = {field for field in fields.split(",") if field}
+    unknown_fields = fieldset - model.FIELDS.keys()
+    if unknown_fields:
+        raise BadRequest("The fields {} do not exist".format(", ".join(sorted(unknown_fields))))
+    return fieldset
+
+
+def load_fieldset(query, model, fieldset, *columns):
+    """
+        Restricts the columns which are loaded by a query to the columns of the selected fields
+        The other columns are deferred, the primary key is always loaded
+        input:
+            query: the query of the database objects
+            model: the database model class of the queried objects
+            fieldset: the selected field names, see get_fieldset
+            columns: additional columns which are needed to build the response,
+                e.g. the columns of the controls
+        output:
+            The restricted query
+    """
+    if fieldset is None:
+        return query
+    return query.options(load_only(
+        model.id, *columns, *(getattr(model, field) for field in fieldset)
+    ))
+
+
+def add_fields(fieldset, *fields):
+    """
+        Adds fields to the selected fields, e.g. the fields which are needed to fill in
+        the uri template of a compact collection
+        input:
+            fieldset: the selected field names, see get_fieldset
+            fields: the names of the added fields
+        output:
+            The extended set of field names or None if all the fields are selected
+    """
+    if fieldset is None:
+        return None
+    return fieldset | set(fields)
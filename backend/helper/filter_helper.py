@@ -0,0 +1,108 @@
+"""
+    Contains helper functions to filter and sort collections by query parameters,
+    e.g. ?director=Nolan&sort=-release_date
+    Only the combinations of filters and sort keys which are served by an index are accepted,
+    so a filtered page is loaded with a single range scan of the index
+"""
+from werkzeug.exceptions import BadRequest
+
+from constants import MIN_DATABASE_INTEGER, MAX_DATABASE_INTEGER
+
+
+class QueryFilter:
+    """
+        This class represents a filter of a collection which is selected by a query parameter
+    """
+    def __init__(self, group, python_type, criterion, minimum=None, maximum=None):
+        """
+            input:
+                group: the name of the indexed column the filter restricts, the filters of a
+                    range like a minimum and a maximum belong to the same group
+                python_type: the type the value of the query parameter is converted to
+                criterion: a function which converts the value to the filter criterion
+                minimum: the optional minimum of the value, e.g. the first valid year
+                maximum: the optional maximum of the value
+        """
+        self.group = group
+        self.python_type = python_type
+        self.criterion = criterion
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+def __get_criterion(name, query_filter, value):
+    try:
+        value = query_filter.python_type(value)
+        if isinstance(value, int) and not MIN_DATABASE_INTEGER <= value <= MAX_DATABASE_INTEGER:
+            raise ValueError
+    except ValueError as e:
+        raise BadRequest(
+            "The query parameter {} must be of type {}".format(
+                name, query_filter.python_type.__name__
+            )
+        ) from e
+    if query_filter.minimum is not None and value < query_filter.minimum or \
+            query_filter.maximum is not None and value > query_filter.maximum:
+        raise BadRequest(
+            "The query parameter {} must be between {} and {}".format(
+                name, query_filter.minimum, query_filter.maximum
+            )
+        )
+    return query_filter.criterion(value)
+
+
+def __get_order(sort, sort_keys):
+    descending = sort.startswith("-")
+    columns = sort_keys.get(sort.lstrip("-"))
+    if columns is None:
+        raise BadRequest("The collection cannot be sorted by {}".format(sort.lstrip("-")))
+    return [column.desc() if descending else column for column in columns]
+
+
+def filter_query(request, query, filters, sort_keys, combinations):
+    """
+        Filters and orders a query by the query parameters of the filters and the parameter sort,
+        a leading - of the sort key orders the collection descending, e.g. ?sort=-title
+        If no sort key is given, the collection is ordered by the first sort key
+        of the combination of the filters
+        input:
+            request: the request object, which is sent
+            query: the unordered query of the whole collection
+            filters: the QueryFilter objects by the names of their query parameters
+            sort_keys: the columns the collection is ordered by for each sort key,
+                the combination of their values has to be unique
+            combinations: the sort keys which are served by an index
+                for each frozenset of filter groups
+        output:
+            The filtered and ordered query and the query parameters of the filters
+            and the sort key, which have to be kept on the other pages
+        exceptions:
+            BadRequest: It is raised if a filter value is invalid or out of range, the sort key
+                does not exist or the combination of the filters and the sort key is not served
+                by an index
+    """
+    values = {}
+    groups = set()
+    for name, query_filter in filters.items():
+        value = request.args.get(name)
+        if value is None:
+            continue
+        query = query.filter(__get_criterion(name, query_filter, value))
+        values[name] = value
+        groups.add(query_filter.group)
+
+    allowed_sort_keys = combinations.get(frozenset(groups))
+    if allowed_sort_keys is None:
+        raise BadRequest(
+            "The filters {} cannot be combined".format(", ".join(sorted(values)))
+        )
+    sort = request.args.get("sort", allowed_sort_keys[0])
+    if sort.lstrip("-") in sort_keys and sort.lstrip("-") not in allowed_sort_keys:
+        raise BadRequest(
+            "The filters {} can only be sorted by {}".format(
+                ", ".join(sorted(values)), ", ".join(allowed_sort_keys)
+            )
+        )
+    if "sort" in request.args:
+        values["sort"] = sort
+    return query.order_by(*__get_order(sort, sort_keys)), values
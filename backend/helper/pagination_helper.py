@@ -0,0 +1,154 @@
+"""
+    Contains helper functions to split collections into pages
+    Collections can either be split by the page number, which allows to jump to any page,
+    or by a cursor, which costs the same for every page no matter how deep it is
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import func, tuple_
+from werkzeug.exceptions import BadRequest
+
+from constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_PAGE_NUMBER, \
+    MIN_DATABASE_INTEGER, MAX_DATABASE_INTEGER
+
+
+class Page:
+    """
+        This class represents a single page of a collection
+    """
+    def __init__(self, items, number, limit, total):
+        """
+            input:
+                items: the database objects on this page
+                number: the number of this page, the first page has the number 1
+                limit: the maximum number of items per page
+                total: the number of items of the whole collection
+        """
+        self.items = items
+        self.number = number
+        self.limit = limit
+        self.total = total
+
+    def has_previous(self):
+        """
+            Checks if there is a page before this page
+        """
+        return self.number > 1
+
+    def has_next(self):
+        """
+            Checks if there is a page after this page
+        """
+        return self.number * self.limit < self.total
+
+
+class CursorPage:
+    """
+        This class represents a single page of a collection which is split by a cursor
+    """
+    def __init__(self, items, limit, next_cursor):
+        """
+            input:
+                items: the database objects on this page
+                limit: the maximum number of items per page
+                next_cursor: the cursor of the next page or None if this is the last page
+        """
+        self.items = items
+        self.limit = limit
+        self.next_cursor = next_cursor
+
+
+def __get_positive_integer(request, name, default, maximum=None):
+    value = request.args.get(name, default)
+    try:
+        value = int(value)
+    except ValueError as e:
+        raise BadRequest("The query parameter {} must be an integer".format(name)) from e
+    if value < 1:
+        raise BadRequest("The query parameter {} must be greater than 0".format(name))
+    if maximum is not None and value > maximum:
+        raise BadRequest(
+            "The query parameter {} must not be greater than {}".format(name, maximum)
+        )
+    return value
+
+
+def get_page(request, query):
+    """
+        Loads the page of a collection which is selected by the query parameters page and limit
+        Limits above the maximum page size are reduced to it
+        input:
+            request: the request object, which is sent
+            query: the query of the whole collection, it has to be ordered
+        output:
+            The selected page
+        exceptions:
+            BadRequest: It is raised if the query parameters are not positive integers
+                or the page number is greater than MAX_PAGE_NUMBER
+    """
+    number = __get_positive_integer(request, "page", 1, MAX_PAGE_NUMBER)
+    limit = min(__get_positive_integer(request, "limit", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+    items = query.limit(limit).offset((number - 1) * limit).all()
+    # counts the rows of the collection without selecting all of their columns
+    total = query.session.execute(
+        query.order_by(None).statement.with_only_columns(func.count(), maintain_column_froms=True)
+    ).scalar()
+    return Page(items, number, limit, total)
+
+
+def __encode_cursor(values):
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def __decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(values) != len(columns):
+            raise ValueError
+        values = tuple(
+            datetime.fromisoformat(value) if column.type.python_type is datetime
+            else column.type.python_type(value)
+            for column, value in zip(columns, values)
+        )
+        if any(
+                isinstance(value, int)
+                and not MIN_DATABASE_INTEGER <= value <= MAX_DATABASE_INTEGER
+                for value in values
+        ):
+            raise ValueError
+        return values
+    except (ValueError, TypeError) as e:
+        raise BadRequest("The query parameter cursor is invalid") from e
+
+
+def get_cursor_page(request, query, *columns):
+    """
+        Loads the page of a collection which starts after the position of the query parameter
+        cursor, the collection is ordered by the given columns
+        In contrast to an offset the cursor is used to seek the index of the columns,
+        so the last page is loaded as fast as the first one
+        input:
+            request: the request object, which is sent
+            query: the unordered query of the whole collection
+            columns: the columns the collection is ordered by, the combination of their values
+                has to be unique
+        output:
+            The selected page
+        exceptions:
+            BadRequest: It is raised if the limit is not a positive integer
+                or the cursor is invalid
+    """
+    limit = min(__get_positive_integer(request, "limit", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        query = query.filter(tuple_(*columns) > __decode_cursor(cursor, columns))
+    # an additional item is loaded to find out if there is a next page
+    items = query.order_by(*columns).limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = __encode_cursor([getattr(items[-1], column.key) for column in columns])
+    return CursorPage(items, limit, next_cursor)
@@ -3,25 +3,103 @@
 """
 
 import json
+from functools import lru_cache
 
 from flask import Response
-from jsonschema import validate, ValidationError, draft7_format_checker
+from jsonschema import ValidationError, draft7_format_checker
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 from sqlalchemy import exc
+from sqlalchemy.orm.exc import StaleDataError
 
 from constants import DATA_TYPE_MASON
 from helper.error_response import ErrorResponse
 
 
-def get_blueprint(response_object):
+@lru_cache(maxsize=None)
+def get_validator(json_schema):
+    """
+        Returns the validator of a json schema, the schema is checked and the validator
+        is compiled only once per schema
+        input:
+            json_schema: The function which returns the json schema
+        output:
+            a validator object
+    """
+    schema = json_schema()
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema, format_checker=draft7_format_checker)
+
+
+def validate_json(instance, json_schema):
+    """
+        Validates a json object against a json schema by using its precompiled validator
+        input:
+            instance: The json object which is validated
+            json_schema: The function which returns the json schema
+        exceptions:
+            ValidationError: It is raised with the most relevant error if the object is invalid
+    """
+    error = best_match(get_validator(json_schema).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def get_blueprint(response_object, last_modified=None):
     """
         This method is used to make get http requests, which return objects from the database.
         It acts as a blueprint to enable a similar behaviour for all get endpoints
         input:
             request: The response content as json string, which is sent back
+            last_modified: The optional time of the last modification of the response content
         output:
             a http response object
     """
-    return Response(json.dumps(response_object), 200, mimetype=DATA_TYPE_MASON)
+    response = Response(json.dumps(response_object), 200, mimetype=DATA_TYPE_MASON)
+    response.last_modified = last_modified
+    return response
+
+
+def get_encoded_blueprint(request, body, etag, compressed_body=None, last_modified=None):
+    """
+        This method is used to make get http requests, whose response body is already encoded.
+        It sends the compressed body if the client accepts it, conditional requests are
+        answered by comparing the given entity tag
+        input:
+            request: The request object, which is sent
+            body: The encoded response body as bytes
+            etag: The entity tag of the response body
+            compressed_body: An optional gzip compressed version of the response body
+            last_modified: The optional time of the last modification of the response content
+        output:
+            a http response object
+    """
+    if compressed_body is not None and request.accept_encodings["gzip"]:
+        response = Response(compressed_body, 200, mimetype=DATA_TYPE_MASON)
+        response.content_encoding = "gzip"
+        # the compressed body is another representation and needs its own entity tag
+        response.set_etag(etag + "-gzip")
+    else:
+        response = Response(body, 200, mimetype=DATA_TYPE_MASON)
+        response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.last_modified = last_modified
+    return response
+
+
+def get_not_modified_blueprint(last_modified):
+    """
+        This method is used to answer conditional get http requests, whose resource
+        has not been modified since the time given by the client
+        input:
+            last_modified: The time of the last modification of the resource
+        output:
+            a http response object
+    """
+    response = Response(status=304)
+    response.last_modified = last_modified
+    return response
 
 
 def post_blueprint(request, json_schema, db, create_object, get_new_resource_url):
@@ -40,7 +118,7 @@ def post_blueprint(request, json_schema, db, create_object, get_new_resource_url
         return ErrorResponse.get_unsupported_media_type()
 
     try:
-        validate(request.json, json_schema(), format_checker=draft7_format_checker)
+        validate_json(request.json, json_schema)
     except ValidationError as e:
         return ErrorResponse(e.message, 400).get_http_response()
 
@@ -56,6 +134,19 @@ def post_blueprint(request, json_schema, db, create_object, get_new_resource_url
         return ErrorResponse(str(e.orig), 409).get_http_response()
 
 
+def __get_concurrent_modification_response(db):
+    """
+        Rolls back an update or a deletion of a row which has been modified or deleted by
+        another request since it was loaded, the version of the row did not match
+        output: a http response object with the status code 409
+    """
+    db.session.rollback()
+    return ErrorResponse(
+        "The resource has been modified by another request, load it again and retry",
+        409
+    ).get_http_response()
+
+
 def put_blueprint(request, json_schema, db, update_object):
     """
     This method is used to make put http requests, which update objects in the database.
@@ -67,13 +158,14 @@ def put_blueprint(request, json_schema, db, update_object):
         create_object: a method which creates the updated object that is then used to
             overwrite the original object in the database
     output:
-        a http response object
+        a http response object, the status code is 409 if the object has been modified
+        by another request since it was loaded
     """
     if not request.json:
         return ErrorResponse.get_unsupported_media_type()
 
     try:
-        validate(request.json, json_schema(), format_checker=draft7_format_checker)
+        validate_json(request.json, json_schema)
     except ValidationError as e:
         return ErrorResponse(e.message, 400).get_http_response()
 
@@ -85,6 +177,8 @@ def put_blueprint(request, json_schema, db, update_object):
         return Response(status=204)
     except exc.IntegrityError as e:
         return ErrorResponse(str(e.orig), 409).get_http_response()
+    except StaleDataError:
+        return __get_concurrent_modification_response(db)
 
 
 def delete_blueprint(db, object_to_delete):
@@ -95,7 +189,8 @@ def delete_blueprint(db, object_to_delete):
         db: a database object, which is used to persist changes
         object: the object, which is to be removed
     output:
-        a http response object
+        a http response object, the status code is 409 if the object has been modified
+        or deleted by another request since it was loaded
     """
     try:
         db.session.delete(object_to_delete)
@@ -103,3 +198,5 @@ def delete_blueprint(db, object_to_delete):
         return Response(status=204)
     except exc.IntegrityError as e:
         return ErrorResponse(str(e.orig), 409).get_http_response()
+    except StaleDataError:
+        return __get_concurrent_modification_response(db)
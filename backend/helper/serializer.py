@@ -8,13 +8,30 @@ class Serializer:
     """
         A generic helper class which serializable objects can inherit from
     """
-    def serialize(self):
+    # the functions which transform the single fields of an object to their json representation
+    # by the names of the fields, if it is not set all the attributes are serialized as they are
+    FIELDS = None
+
+    def serialize(self, fields=None):
         """
             transforms a python object to its json representation to make it serializable
+            Only the selected fields are accessed, so the other columns of a database object
+            do not have to be loaded
+            input:
+                fields: the optional names of the fields which are serialized,
+                    all the fields are serialized by default
             result:
                 the json string
         """
-        return {c: getattr(self, c) for c in inspect(self).attrs.keys()}
+        if self.FIELDS is None:
+            return {
+                c: getattr(self, c) for c in inspect(self).attrs.keys()
+                if fields is None or c in fields
+            }
+        return {
+            field: serialize(self) for field, serialize in self.FIELDS.items()
+            if fields is None or field in fields
+        }
 
     @classmethod
     def serialize_list(cls, object_list):
@@ -1,12 +1,18 @@
 """
     Contains the functions used for the communication with the third component (IdentityProvider)
+    All requests of a worker share a session, which keeps the connections to the third component
+    alive in a pool, and are aborted if the third component does not answer in time
+    A circuit breaker rejects the requests immediately while the third component is unavailable
 """
 
 import json
+import threading
+import time
 import urllib
 
 import requests
-from flask import Response, request
+from flask import Response, current_app, request
+from requests.adapters import HTTPAdapter
 
 from constants import THIRD_COMPONENT_URL
 from helper.error_response import ErrorResponse
@@ -16,100 +22,288 @@ HEADERS = {
     "Access-Control-Expose-Headers": "Location",
 }
 
+# the number of bytes which are read at once when a response is streamed through
+STREAM_CHUNK_SIZE = 8192
+
+# the errors raised if the third component cannot be reached or does not answer in time
+UNAVAILABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+        This error is raised if a request is rejected because the circuit breaker is open
+    """
+
+
+class CircuitBreaker:
+    """
+        This class represents a circuit breaker which protects the workers from waiting for
+        an unavailable third component
+        It is closed while the requests succeed and opens after a number of consecutive failures,
+        then all requests are rejected until the recovery timeout has passed. Afterwards it is
+        half-open and lets a single request probe the third component, which closes the breaker
+        if it succeeds and opens it again otherwise
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold, recovery_timeout):
+        """
+            input:
+                failure_threshold: the number of consecutive failures which open the breaker
+                recovery_timeout: the number of seconds until an open breaker is probed
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._lock = threading.Lock()
+
+    def _before_request(self):
+        with self._lock:
+            if self.state == CircuitBreaker.OPEN \
+                    and time.time() - self.opened_at >= self.recovery_timeout:
+                # this request probes if the third component has recovered
+                self.state = CircuitBreaker.HALF_OPEN
+                return
+            if self.state != CircuitBreaker.CLOSED:
+                raise CircuitOpenError("The third component is unavailable")
+
+    def _record_success(self):
+        with self._lock:
+            self.state = CircuitBreaker.CLOSED
+            self.failures = 0
+
+    def _record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitBreaker.OPEN
+                self.opened_at = time.time()
+
+    def call(self, send_request):
+        """
+            Sends a request through the circuit breaker, connection errors, timeouts
+            and server errors of the third component count as failures
+            input:
+                send_request: a function which sends the request
+            output: The response object
+            exceptions:
+                CircuitOpenError: In case the breaker is open and rejects the request
+                requests.exceptions.ConnectionError: In case the third component
+                    could not be reached
+                requests.exceptions.Timeout: In case the third component did not answer in time
+        """
+        self._before_request()
+        try:
+            response = send_request()
+        except requests.exceptions.RequestException:
+            self._record_failure()
+            raise
+        if response.status_code >= 500:
+            self._record_failure()
+        else:
+            self._record_success()
+        return response
+
+
+def __get_circuit_breaker():
+    """
+        Returns the circuit breaker of this worker, it is created on the first request
+        Its thresholds are set by THIRD_COMPONENT_FAILURE_THRESHOLD
+        and THIRD_COMPONENT_RECOVERY_TIMEOUT
+    """
+    circuit_breaker = current_app.extensions.get("third_component_circuit_breaker")
+    if circuit_breaker is None:
+        circuit_breaker = current_app.extensions.setdefault(
+            "third_component_circuit_breaker",
+            CircuitBreaker(
+                current_app.config["THIRD_COMPONENT_FAILURE_THRESHOLD"],
+                current_app.config["THIRD_COMPONENT_RECOVERY_TIMEOUT"]
+            )
+        )
+    return circuit_breaker
+
+
+def __get_session():
+    """
+        Returns the session of this worker, it is created on the first request
+        The size of its connection pool is set by THIRD_COMPONENT_POOL_SIZE
+    """
+    session = current_app.extensions.get("third_component_session")
+    if session is None:
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=current_app.config["THIRD_COMPONENT_POOL_SIZE"]
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session = current_app.extensions.setdefault("third_component_session", session)
+    return session
+
+
+def __get_timeout():
+    return (
+        current_app.config["THIRD_COMPONENT_CONNECT_TIMEOUT"],
+        current_app.config["THIRD_COMPONENT_READ_TIMEOUT"]
+    )
+
+
+def get_pool_statistics():
+    """
+        Returns the utilisation of the connection pool of this worker
+        output: A dict containing the size of the pool, the number of opened connections,
+            the number of connections in use and idle and the number of sent requests
+    """
+    statistics = {
+        "pool_size": current_app.config["THIRD_COMPONENT_POOL_SIZE"],
+        "opened_connections": 0,
+        "connections_in_use": 0,
+        "idle_connections": 0,
+        "requests": 0,
+    }
+    session = current_app.extensions.get("third_component_session")
+    if session is None:
+        return statistics
+
+    pools = session.get_adapter(THIRD_COMPONENT_URL).poolmanager.pools
+    for key in pools.keys():
+        pool = pools[key]
+        # the queue of a pool contains its idle connections and None for every unopened slot
+        statistics["opened_connections"] += pool.num_connections
+        statistics["connections_in_use"] += pool.pool.maxsize - pool.pool.qsize()
+        statistics["idle_connections"] += len([c for c in pool.pool.queue if c is not None])
+        statistics["requests"] += pool.num_requests
+    return statistics
+
 
 def forward(original_request, mason_inject=None):
     """
         This method is used to forward requests and return the results like a proxy does
+        The body of the response is streamed through without decoding it, unless mason docu
+        has to be injected, then it is decoded exactly once
         input:
             original_request: The request that is to be made to the third component
-            mason_inject: an optional function that is used to inject mason docu to the response
+            mason_inject: an optional function that is used to inject mason docu to the response,
+                it receives the decoded body and returns the encoded body
         output:
             A http response object representing the response of the third component
     """
     try:
         response = original_request()
-    except requests.exceptions.ConnectionError:
+    except UNAVAILABLE_ERRORS:
         return ErrorResponse.get_gateway_timeout()
 
     status_code = response.status_code
     if status_code == 404:
+        response.close()
         return ErrorResponse.get_not_found()
-    body = json.dumps(response.json())\
-        if response.headers.get('content-type') == 'application/json'\
-        else None
-    if status_code < 300 and mason_inject is not None:
-        body = mason_inject(json.loads(body))
     headers = response.headers.get('Location')
     if headers is not None:
         url = urllib.parse.urlparse(headers)
         headers = {"Location": request.scheme + '://' + request.host + url.path}
 
-    return Response(
-        body,
+    if status_code < 300 and mason_inject is not None:
+        return Response(
+            mason_inject(response.json()),
+            status=status_code,
+            mimetype=response.headers.get('content-type'),
+            headers=headers
+        )
+
+    forwarded_response = Response(
+        response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
         status=status_code,
         mimetype=response.headers.get('content-type'),
-        headers=headers
+        headers=headers,
+        direct_passthrough=True
     )
+    # returns the connection to the pool even if the client aborts the download
+    forwarded_response.call_on_close(response.close)
+    return forwarded_response
 
 
-def get_request(endpoint):
+def get_request(endpoint, stream=False):
     """
         A helper function to make get requests to the third component
         input:
             endpoint: the resource path
+            stream: a flag indicating if the body is read on demand instead of immediately
         output: The response object
         exceptions:
             requests.exceptions.ConnectionError: In case the third component could not be reached
+                or the circuit breaker rejects the request
+            requests.exceptions.Timeout: In case the third component did not answer in time
     """
-    return requests.get(
+    return __get_circuit_breaker().call(lambda: __get_session().get(
         THIRD_COMPONENT_URL + endpoint,
         headers=HEADERS,
-    )
+        timeout=__get_timeout(),
+        stream=stream,
+    ))
 
 
-def post_request(endpoint, body):
+def post_request(endpoint, body, stream=False):
     """
         A helper function to make post requests to the third component
         input:
             endpoint: the resource path
             body: the body of the post request
+            stream: a flag indicating if the body is read on demand instead of immediately
         output: The response object
         exceptions:
             requests.exceptions.ConnectionError: In case the third component could not be reached
+                or the circuit breaker rejects the request
+            requests.exceptions.Timeout: In case the third component did not answer in time
     """
-    return requests.post(
+    return __get_circuit_breaker().call(lambda: __get_session().post(
         THIRD_COMPONENT_URL + endpoint,
         json.dumps(body),
         headers=HEADERS,
-    )
+        timeout=__get_timeout(),
+        stream=stream,
+    ))
 
 
-def put_request(endpoint, body):
+def put_request(endpoint, body, stream=False):
     """
         A helper function to make put requests to the third component
         input:
             endpoint: the resource path
             body: the body of the put request
+            stream: a flag indicating if the body is read on demand instead of immediately
         output: The response object
         exceptions:
             requests.exceptions.ConnectionError: In case the third component could not be reached
+                or the circuit breaker rejects the request
+            requests.exceptions.Timeout: In case the third component did not answer in time
     """
-    return requests.put(
+    return __get_circuit_breaker().call(lambda: __get_session().put(
         THIRD_COMPONENT_URL + endpoint,
         json.dumps(body),
         headers=HEADERS,
-    )
+        timeout=__get_timeout(),
+        stream=stream,
+    ))
 
 
-def delete_request(endpoint):
+def delete_request(endpoint, stream=False):
     """
         A helper function to make post requests to the delete component
         input:
             endpoint: the resource path
+            stream: a flag indicating if the body is read on demand instead of immediately
         output: The response object
         exceptions:
             requests.exceptions.ConnectionError: In case the third component could not be reached
+                or the circuit breaker rejects the request
+            requests.exceptions.Timeout: In case the third component did not answer in time
     """
-    return requests.delete(
+    return __get_circuit_breaker().call(lambda: __get_session().delete(
         THIRD_COMPONENT_URL + endpoint,
-    )
+        timeout=__get_timeout(),
+        stream=stream,
+    ))
@@ -0,0 +1,117 @@
+"""
+    Contains helper functions to verify the authentication tokens issued by the identity provider
+    The tokens are verified locally with the public keys of the identity provider, which are
+    downloaded once and downloaded again as soon as a token is signed by an unknown key
+"""
+import time
+
+import jwt
+import requests
+
+from constants import JWKS_ENDPOINT, JWT_TOKEN_ISSUER, JWKS_REFRESH_INTERVAL
+from datamodels.user import User
+from helper.third_component_request_helper import get_request
+
+
+class UnknownSigningKeyError(jwt.InvalidTokenError):
+    """
+        This error is raised if a token is signed by a key which the identity provider
+        does not publish
+    """
+
+
+class SigningKeysUnavailableError(requests.exceptions.ConnectionError):
+    """
+        This error is raised if the identity provider does not answer with a valid key set,
+        it is handled like an unavailable identity provider
+    """
+
+
+class SigningKeySet:
+    """
+        This class represents the public keys which the identity provider signs its tokens with
+    """
+    def __init__(self):
+        self.keys = {}
+        self.fetched_at = 0
+
+    def refresh(self):
+        """
+            Downloads the json web key set of the identity provider, the keys are downloaded
+            at most once within the refresh interval
+            exceptions:
+                requests.exceptions.ConnectionError: In case the identity provider
+                    could not be reached
+                requests.exceptions.Timeout: In case the identity provider did not answer in time
+                SigningKeysUnavailableError: In case the identity provider did not answer
+                    with a valid key set
+        """
+        if time.time() - self.fetched_at < JWKS_REFRESH_INTERVAL:
+            return
+        response = get_request(JWKS_ENDPOINT)
+        # a failed download is not repeated within the refresh interval either,
+        # the keys which are already known are kept
+        self.fetched_at = time.time()
+        if response.status_code != 200:
+            raise SigningKeysUnavailableError(
+                "The key set could not be downloaded, status code {}".format(response.status_code)
+            )
+        try:
+            self.keys = {
+                key["kid"]: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+                for key in response.json()["keys"]
+            }
+        except (ValueError, KeyError, TypeError, jwt.InvalidKeyError) as e:
+            raise SigningKeysUnavailableError("The key set is invalid") from e
+
+    def get(self, key_id):
+        """
+            Returns the public key with the given key id
+            input:
+                key_id: the key id of the token header
+            output: The public key
+            exceptions:
+                UnknownSigningKeyError: It is raised if the identity provider has no key
+                    with the given id
+                requests.exceptions.ConnectionError: In case the identity provider
+                    could not be reached
+                requests.exceptions.Timeout: In case the identity provider did not answer in time
+                SigningKeysUnavailableError: In case the identity provider did not answer
+                    with a valid key set
+        """
+        if key_id not in self.keys:
+            self.refresh()
+        if key_id not in self.keys:
+            raise UnknownSigningKeyError("Unknown signing key")
+        return self.keys[key_id]
+
+
+SIGNING_KEYS = SigningKeySet()
+
+
+def verify_token(token):
+    """
+        Verifies the signature, the expiration time and the issuer of a token without
+        asking the identity provider, the user and its role are taken from the token
+        input:
+            token: the jwt token of the Authorization header
+        output: The authenticated user
+        exceptions:
+            jwt.ExpiredSignatureError: If the token is expired
+            UnknownSigningKeyError: If the token is signed by an unknown key
+            jwt.InvalidTokenError: If the token is invalid
+            requests.exceptions.ConnectionError: In case the keys of the identity provider
+                could not be downloaded
+            requests.exceptions.Timeout: In case the identity provider did not answer in time
+            SigningKeysUnavailableError: In case the identity provider did not answer
+                with a valid key set
+    """
+    key_id = jwt.get_unverified_header(token).get("kid")
+    payload = jwt.decode(
+        token,
+        SIGNING_KEYS.get(key_id),
+        algorithms=["RS256"],
+        issuer=JWT_TOKEN_ISSUER,
+        options={"require": ["exp", "iss", "sub"]}
+    )
+    return User(username=payload["sub"], role=payload.get("role"))
@@ -1,8 +1,10 @@
 """
     contains the category json schema
 """
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_category_json_schema():
     """
         returns the json schema of a category object
@@ -1,8 +1,10 @@
 """
     contains the credentials json schema for the login endpoint
 """
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_credentials_json_schema():
     """
         returns the json schema of a credentials object
@@ -1,8 +1,10 @@
 """
     contains the movie json schema
 """
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_movie_json_schema():
     """
         returns the json schema of a movie object
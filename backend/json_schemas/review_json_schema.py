@@ -1,8 +1,10 @@
 """
     contains the review json schema
 """
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_review_json_schema():
     """
         returns the json schema of a review object
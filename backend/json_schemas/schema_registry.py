@@ -0,0 +1,34 @@
+"""
+    contains the registry of all json schemas which are served as standalone resources
+"""
+import hashlib
+import json
+from functools import lru_cache
+
+from json_schemas.category_json_schema import get_category_json_schema
+from json_schemas.credentials_json_schema import get_credentials_json_schema
+from json_schemas.movie_json_schema import get_movie_json_schema
+from json_schemas.review_json_schema import get_review_json_schema
+from json_schemas.user_json_schema import get_user_json_schema
+
+# the functions which return the json schemas by the names the schemas are served with
+JSON_SCHEMAS = {
+    "category": get_category_json_schema,
+    "credentials": get_credentials_json_schema,
+    "movie": get_movie_json_schema,
+    "review": get_review_json_schema,
+    "user": get_user_json_schema,
+}
+
+# the names of the json schemas by the functions which return them
+SCHEMA_NAMES = {json_schema: name for name, json_schema in JSON_SCHEMAS.items()}
+
+
+@lru_cache(maxsize=None)
+def get_encoded_json_schema(json_schema):
+    """
+        returns the encoded json schema and its version
+        The version is the hash of the encoded schema, so it changes with every change of the schema
+    """
+    body = json.dumps(json_schema()).encode()
+    return body, hashlib.sha1(body).hexdigest()[:16]
@@ -1,8 +1,10 @@
 """
     contains the user json schema
 """
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_user_json_schema():
     """
         returns the json schema of a user object
@@ -1,79 +1,71 @@
 """
 The category mason builder class
 """
-import api
 from json_schemas.category_json_schema import get_category_json_schema
+from mason.control_template import ControlTemplate
 from mason.generic_mason_builder import GenericMasonBuilder
 from constants import NAMESPACE
 
+# the templates of the category controls, they are built only once
+GET_CATEGORIES = ControlTemplate("CategoryCollection", title="Get a list of all categories")
+POST_CATEGORY = ControlTemplate(
+    "CategoryCollection",
+    method="POST",
+    encoding="json",
+    title="Create a new category",
+    schema=get_category_json_schema
+)
+GET_CATEGORY = ControlTemplate("CategoryItem", "category", title="Get a single category")
+UPDATE_CATEGORY = ControlTemplate(
+    "CategoryItem",
+    "category",
+    method="PUT",
+    encoding="json",
+    title="Update a category",
+    schema=get_category_json_schema
+)
+DELETE_CATEGORY = ControlTemplate(
+    "CategoryItem", "category", method="DELETE", title="Delete a category"
+)
+
 
 class CategoryMasonBuilder(GenericMasonBuilder):
     """
     The mason builder which is responsible for all category endpoints
     """
-    def __init__(self):
-        super().__init__()
-        self.api = api.API
-        self.category_item = api.CategoryItem
-        self.category_collection = api.CategoryCollection
-
     def add_control_get_categories(self, rel=NAMESPACE + ":categories-all"):
         """
             This method adds the mason documentation for the get all categories endpoint
         """
-        self._add_control(
-            rel,
-            title="Get a list of all categories",
-            href=self.api.url_for(self.category_collection)
-        )
+        self._add_control_template(rel, GET_CATEGORIES)
 
     def add_control_post_category(self):
         """
             This method adds the mason documentation for the post a new category endpoint
         """
-        self._add_control_post(
-            NAMESPACE + ":add-category",
-            title="Create a new category",
-            href=self.api.url_for(self.category_collection),
-            schema=get_category_json_schema()
-        )
+        self._add_control_template(NAMESPACE + ":add-category", POST_CATEGORY)
 
-    def add_control_get_category(self, category):
+    def add_control_get_category(self, category, rel="self"):
         """
             This method adds the mason documentation for the get a single category endpoint
         """
-        self._add_control(
-            "self",
-            title="Get a single category",
-            href=self.api.url_for(
-                self.category_item,
-                category=category
-            )
-        )
+        self._add_control_template(rel, GET_CATEGORY, category=category)
+
+    def add_control_get_category_template(self):
+        """
+            This method adds the uri template of the get a single category endpoint
+            for the items of a compact collection
+        """
+        self._add_control_uri_template("item", GET_CATEGORY, category="id")
 
     def add_control_update_category(self, category):
         """
             This method adds the mason documentation for the update an existing category endpoint
         """
-        self._add_control_put(
-            "edit",
-            title="Update a category",
-            href=self.api.url_for(
-                self.category_item,
-                category=category
-            ),
-            schema=get_category_json_schema()
-        )
+        self._add_control_template("edit", UPDATE_CATEGORY, category=category)
 
     def add_control_delete_category(self, category):
         """
             This method adds the mason documentation for the delete a category endpoint
         """
-        self._add_control_delete(
-            NAMESPACE + ":delete",
-            title="Delete a category",
-            href=self.api.url_for(
-                self.category_item,
-                category=category
-            )
-        )
+        self._add_control_template(NAMESPACE + ":delete", DELETE_CATEGORY, category=category)
@@ -0,0 +1,161 @@
+"""
+    The control template class
+"""
+from functools import lru_cache
+
+from flask import request
+from werkzeug.urls import url_quote
+
+import api
+from json_schemas.schema_registry import SCHEMA_NAMES, get_encoded_json_schema
+
+# the value of the query parameter schemas which requests the schemas inside the controls
+INLINE_SCHEMAS = "inline"
+
+
+@lru_cache(maxsize=None)
+def __get_schema_url(script_root, json_schema):
+    """
+        Builds the versioned url of a json schema once per root path of the application
+    """
+    return api.API.url_for(
+        api.JsonSchemaItem,
+        name=SCHEMA_NAMES[json_schema],
+        version=get_encoded_json_schema(json_schema)[1]
+    )
+
+
+def get_schema_properties(json_schema):
+    """
+        Returns the properties of a control which describe its request body
+        The schema is referred to by its url, unless the client requests the schemas
+        inside the controls by the query parameter schemas=inline
+        input:
+            json_schema: the function which returns the json schema
+        output:
+            A dict containing either the schemaUrl or the schema property
+    """
+    if request.args.get("schemas") == INLINE_SCHEMAS:
+        return {"schema": json_schema()}
+    return {"schemaUrl": __get_schema_url(request.script_root, json_schema)}
+
+
+class _Placeholder(str):
+    """
+        A url parameter which stands in for the actual value while the href template is built
+        It is accepted by the url converters of the database objects as well as of strings
+    """
+    @property
+    def id(self):
+        """
+            The placeholder is used as primary key by the url converters of the database objects
+        """
+        return self
+
+
+class ControlTemplate:
+    """
+        This class represents a mason control whose properties are built only once
+        The href is built once with placeholders for the url parameters, which are substituted
+        by the values of every object the control is added to, so the url of the resource does
+        not have to be built by werkzeug again for every single object
+    """
+    def __init__(self, resource_name, *parameters, **control):
+        """
+            input:
+                resource_name: the name of the resource class in the api module, the resource is
+                    looked up as soon as the first href is built, since the resources are
+                    defined after the mason builders
+                parameters: the names of the url parameters of the resource
+                control: the properties of the control which are the same for every object,
+                    e.g. the title and the method, the schema is given as the function
+                    which returns it
+        """
+        self.resource_name = resource_name
+        self.parameters = parameters
+        self.control = control
+        # the href templates per root path of the application
+        self.__href_templates = {}
+
+    @staticmethod
+    def __get_placeholder(name):
+        return _Placeholder("__{}__".format(name))
+
+    def __get_href_template(self):
+        href_template = self.__href_templates.get(request.script_root)
+        if href_template is None:
+            href_template = api.API.url_for(
+                getattr(api, self.resource_name),
+                **{name: self.__get_placeholder(name) for name in self.parameters}
+            )
+            self.__href_templates[request.script_root] = href_template
+        return href_template
+
+    def get_href(self, **values):
+        """
+            Builds the href of the control for the given url parameters
+            input:
+                values: the url parameters, either database objects, references to them
+                    or strings like the username
+            output:
+                The href of the control
+        """
+        href = self.__get_href_template()
+        for name in self.parameters:
+            value = values[name]
+            href = href.replace(
+                self.__get_placeholder(name),
+                str(value.id) if hasattr(value, "id") else url_quote(value)
+            )
+        return href
+
+    def get_uri_template(self, **fields):
+        """
+            Builds the uri template of the control, whose variables are the names of the
+            fields of an object that contain the url parameters
+            input:
+                fields: the names of the fields by the names of the url parameters,
+                    e.g. movie="id"
+            output:
+                The uri template, e.g. /api/movies/{id}/
+        """
+        uri_template = self.__get_href_template()
+        for name in self.parameters:
+            uri_template = uri_template.replace(
+                self.__get_placeholder(name), "{" + fields[name] + "}"
+            )
+        return uri_template
+
+    def __get_properties(self):
+        control = dict(self.control)
+        json_schema = control.pop("schema", None)
+        if json_schema is not None:
+            control.update(get_schema_properties(json_schema))
+        return control
+
+    def get_control(self, **values):
+        """
+            Instantiates the control for the given url parameters
+            input:
+                values: the url parameters, see get_href
+            output:
+                A new dict containing the properties and the href of the control
+        """
+        control = self.__get_properties()
+        control["href"] = self.get_href(**values)
+        return control
+
+    def get_uri_template_control(self, **fields):
+        """
+            Instantiates the control with an uri template as href, which is filled in
+            by the client with the fields of an object
+            input:
+                fields: the names of the fields by the names of the url parameters,
+                    see get_uri_template
+            output:
+                A new dict containing the properties and the uri template of the control
+        """
+        control = self.__get_properties()
+        control["href"] = self.get_uri_template(**fields)
+        control["isHrefTemplate"] = True
+        return control
@@ -31,6 +31,16 @@ class GenericMasonBuilder(dict):
             "@messages": [details],
         }
 
+    def _is_control_requested(self, ctrl_name):
+        """
+        Checks if a control is added to the object. Child classes can
+        override it to leave out the controls a client does not need.
+
+        : param str ctrl_name: name of the control (including namespace if any)
+        """
+
+        return True
+
     def _add_namespace(self, namespace, uri):
         """
         Adds a namespace element to the object. A namespace defines where our
@@ -59,12 +69,50 @@ class GenericMasonBuilder(dict):
         : param str href: target URI for the control
         """
 
+        if not self._is_control_requested(ctrl_name):
+            return
         if "@controls" not in self:
             self["@controls"] = {}
 
         self["@controls"][ctrl_name] = kwargs
         self["@controls"][ctrl_name]["href"] = href
 
+    def _add_control_template(self, ctrl_name, template, **values):
+        """
+        Adds a control which is instantiated from a control template. The
+        properties of the template are copied, only the href is built from
+        the given url parameters.
+
+        : param str ctrl_name: name of the control (including namespace if any)
+        : param ControlTemplate template: the template of the control
+        : param values: the url parameters of the href
+        """
+
+        if not self._is_control_requested(ctrl_name):
+            return
+        if "@controls" not in self:
+            self["@controls"] = {}
+
+        self["@controls"][ctrl_name] = template.get_control(**values)
+
+    def _add_control_uri_template(self, ctrl_name, template, **fields):
+        """
+        Adds a control whose href is an uri template. The variables of the
+        template are filled in by the client with the fields of an object, so
+        a single control serves all the items of a collection.
+
+        : param str ctrl_name: name of the control (including namespace if any)
+        : param ControlTemplate template: the template of the control
+        : param fields: the names of the fields which contain the url parameters
+        """
+
+        if not self._is_control_requested(ctrl_name):
+            return
+        if "@controls" not in self:
+            self["@controls"] = {}
+
+        self["@controls"][ctrl_name] = template.get_uri_template_control(**fields)
+
     def _add_control_post(self, ctrl_name, title, href, schema):
         """
         Utility method for adding POST type controls. The control is
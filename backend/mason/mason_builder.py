@@ -1,28 +1,36 @@
 """
     The mason builder class
 """
+from flask import request
+
+import api
 from constants import NAMESPACE, NAMESPACE_LINK
 from mason.user_mason_builder import UserMasonBuilder
 from mason.movie_mason_builder import MovieMasonBuilder
 from mason.category_mason_builder import CategoryMasonBuilder
 from mason.review_mason_builder import ReviewMasonBuilder
+from mason.search_mason_builder import SearchMasonBuilder
+
+# the value of the query parameter representation which requests the compact representation
+# of a collection, whose items do not contain any controls
+COMPACT_REPRESENTATION = "compact"
+
+# the query parameters which select the representation of a resource
+REPRESENTATION_PARAMETERS = ("fields", "controls", "embed", "representation", "schemas")
 
 
 class MasonBuilder(
     UserMasonBuilder,
     ReviewMasonBuilder,
     MovieMasonBuilder,
-    CategoryMasonBuilder
+    CategoryMasonBuilder,
+    SearchMasonBuilder
 ):
     """
         A single mason builder class which combines all the single mason builders
+        The builders keep no state besides the mason object itself, their controls are
+        instantiated from templates, so creating a builder is as cheap as creating a dict
     """
-    def __init__(self, *args, **kwargs):
-        dict.__init__(self, *args, **kwargs)
-        UserMasonBuilder.__init__(self)
-        MovieMasonBuilder.__init__(self)
-        CategoryMasonBuilder.__init__(self)
-        ReviewMasonBuilder.__init__(self)
 
     def add_api_namespace(self):
         """
@@ -39,3 +47,84 @@ class MasonBuilder(
             title="Get the api documentation root",
             href='/'
         )
+
+    def _is_control_requested(self, ctrl_name):
+        """
+            Checks if the client requested a control by the query parameter controls,
+            e.g. controls=self,edit, all the controls are added if it is not set
+            An empty value leaves out all the controls
+        """
+        controls = request.args.get("controls")
+        return controls is None or ctrl_name in controls.split(",")
+
+    @staticmethod
+    def is_compact():
+        """
+            Checks if the client requested the compact representation of a collection
+            by the query parameter representation=compact
+            Instead of a control per item the compact collection contains the control item,
+            whose uri template is filled in with the fields of the items
+        """
+        return request.args.get("representation") == COMPACT_REPRESENTATION
+
+    @staticmethod
+    def __get_negotiated_values():
+        """
+            Returns the query parameters which select the representation of the collection,
+            so they are kept on the other pages
+        """
+        return {
+            name: request.args[name] for name in REPRESENTATION_PARAMETERS
+            if name in request.args
+        }
+
+    def add_pagination(self, resource, page, **values):
+        """
+            This method adds the total number of items and the controls to navigate between
+            the pages of a paginated collection
+            input:
+                resource: the resource class of the collection
+                page: the page of the collection which is represented by this object
+                values: the url parameters of the collection
+        """
+        values.update(self.__get_negotiated_values())
+        self["total"] = page.total
+        self._add_control(
+            "first",
+            title="Get the first page",
+            href=api.API.url_for(resource, page=1, limit=page.limit, **values)
+        )
+        if page.has_previous():
+            self._add_control(
+                "prev",
+                title="Get the previous page",
+                href=api.API.url_for(resource, page=page.number - 1, limit=page.limit, **values)
+            )
+        if page.has_next():
+            self._add_control(
+                "next",
+                title="Get the next page",
+                href=api.API.url_for(resource, page=page.number + 1, limit=page.limit, **values)
+            )
+
+    def add_cursor_pagination(self, resource, page, **values):
+        """
+            This method adds the controls to navigate between the pages of a collection
+            which is split by a cursor
+            input:
+                resource: the resource class of the collection
+                page: the page of the collection which is represented by this object
+                values: the url parameters of the collection
+        """
+        values.update(self.__get_negotiated_values())
+        self._add_control(
+            "first",
+            title="Get the first page",
+            href=api.API.url_for(resource, limit=page.limit, **values)
+        )
+        if page.next_cursor is not None:
+            self._add_control(
+                "next",
+                title="Get the next page",
+                href=api.API.url_for(resource, cursor=page.next_cursor, limit=page.limit, **values)
+            )
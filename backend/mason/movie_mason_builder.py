@@ -1,79 +1,80 @@
 """
     The movie mason builder class
 """
-import api
 from json_schemas.movie_json_schema import get_movie_json_schema
+from mason.control_template import ControlTemplate
 from mason.generic_mason_builder import GenericMasonBuilder
 from constants import NAMESPACE
 
+# the templates of the movie controls, they are built only once
+GET_MOVIES = ControlTemplate("MovieCollection", title="Get a list of all movies")
+POST_MOVIE = ControlTemplate(
+    "MovieCollection",
+    method="POST",
+    encoding="json",
+    title="Create a new movie",
+    schema=get_movie_json_schema
+)
+GET_MOVIES_OF_CATEGORY = ControlTemplate(
+    "CategoryMovieCollection", "category", title="Get a list of all movies of this category"
+)
+GET_MOVIE = ControlTemplate("MovieItem", "movie", title="Get a single movie")
+UPDATE_MOVIE = ControlTemplate(
+    "MovieItem",
+    "movie",
+    method="PUT",
+    encoding="json",
+    title="Update a movie",
+    schema=get_movie_json_schema
+)
+DELETE_MOVIE = ControlTemplate("MovieItem", "movie", method="DELETE", title="Delete a movie")
+
 
 class MovieMasonBuilder(GenericMasonBuilder):
     """
         The mason builder which is responsible for all movie endpoints
     """
-    def __init__(self):
-        super().__init__()
-        self.api = api.API
-        self.movie_item = api.MovieItem
-        self.movie_collection = api.MovieCollection
-
     def add_control_get_movies(self, rel=NAMESPACE + ":movies-all"):
         """
             This method adds the mason documentation for the get all movies endpoint
         """
-        self._add_control(
-            rel,
-            title="Get a list of all movies",
-            href=self.api.url_for(self.movie_collection)
-        )
+        self._add_control_template(rel, GET_MOVIES)
+
+    def add_control_get_movies_of_category(
+            self, category, rel=NAMESPACE + ":movies-in-category"
+    ):
+        """
+            This method adds the mason documentation for the get all movies of a category endpoint
+        """
+        self._add_control_template(rel, GET_MOVIES_OF_CATEGORY, category=category)
 
     def add_control_post_movie(self):
         """
             This method adds the mason documentation for the post a new movie endpoint
         """
-        self._add_control_post(
-            NAMESPACE + ":add-movie",
-            title="Create a new movie",
-            href=self.api.url_for(self.movie_collection),
-            schema=get_movie_json_schema()
-        )
+        self._add_control_template(NAMESPACE + ":add-movie", POST_MOVIE)
 
     def add_control_get_movie(self, movie, rel="self"):
         """
             This method adds the mason documentation for the get a single movie endpoint
         """
-        self._add_control(
-            rel,
-            title="Get a single movie",
-            href=self.api.url_for(
-                self.movie_item,
-                movie=movie
-            )
-        )
+        self._add_control_template(rel, GET_MOVIE, movie=movie)
+
+    def add_control_get_movie_template(self):
+        """
+            This method adds the uri template of the get a single movie endpoint
+            for the items of a compact collection
+        """
+        self._add_control_uri_template("item", GET_MOVIE, movie="id")
 
     def add_control_update_movie(self, movie):
         """
             This method adds the mason documentation for the update an existing movie endpoint
         """
-        self._add_control_put(
-            "edit",
-            title="Update a movie",
-            href=self.api.url_for(
-                self.movie_item,
-                movie=movie
-            ),
-            schema=get_movie_json_schema()
-        )
+        self._add_control_template("edit", UPDATE_MOVIE, movie=movie)
 
     def add_control_delete_movie(self, movie):
         """
             This method adds the mason documentation for the delete a movie endpoint
         """
-        self._add_control_delete(
-            NAMESPACE + ":delete",
-            title="Delete a movie",
-            href=self.api.url_for(
-                self.movie_item,
-                movie=movie
-            )
-        )
+        self._add_control_template(NAMESPACE + ":delete", DELETE_MOVIE, movie=movie)
@@ -0,0 +1,39 @@
+"""
+    The search mason builder class
+"""
+from urllib.parse import urlencode
+
+from mason.control_template import ControlTemplate
+from mason.generic_mason_builder import GenericMasonBuilder
+from constants import NAMESPACE
+
+# the template of the search control, it is built only once
+SEARCH = ControlTemplate("SearchCollection", title="Search the movies and the reviews")
+
+
+class SearchMasonBuilder(GenericMasonBuilder):
+    """
+        The mason builder which is responsible for the search endpoint
+    """
+    def add_control_search(self, rel=NAMESPACE + ":search"):
+        """
+            This method adds the uri template of the search endpoint,
+            the client fills in the search terms as query parameter q
+        """
+        if not self._is_control_requested(rel):
+            return
+        control = SEARCH.get_uri_template_control()
+        control["href"] += "{?q}"
+        if "@controls" not in self:
+            self["@controls"] = {}
+        self["@controls"][rel] = control
+
+    def add_control_get_search_results(self, query, rel="self"):
+        """
+            This method adds the mason documentation for the search results of the given terms
+        """
+        self._add_control(
+            rel,
+            title="Get the search results",
+            href=SEARCH.get_href() + "?" + urlencode({"q": query})
+        )
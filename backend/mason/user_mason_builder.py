@@ -2,106 +2,86 @@
     The user mason builder class
 """
 
-import api
 from json_schemas.user_json_schema import get_user_json_schema
 from json_schemas.credentials_json_schema import get_credentials_json_schema
+from mason.control_template import ControlTemplate, get_schema_properties
 from mason.generic_mason_builder import GenericMasonBuilder
 from constants import NAMESPACE, THIRD_COMPONENT_URL, LOGIN_ENDPOINT
 
+# the templates of the user controls, they are built only once
+GET_USERS = ControlTemplate("UserCollection", title="Get a list of all users")
+POST_USER = ControlTemplate(
+    "UserCollection",
+    method="POST",
+    encoding="json",
+    title="Create a new user",
+    schema=get_user_json_schema
+)
+GET_USER = ControlTemplate("UserItem", "username", title="Get a single user")
+UPDATE_USER = ControlTemplate(
+    "UserItem",
+    "username",
+    method="PUT",
+    encoding="json",
+    title="Update a user",
+    schema=get_user_json_schema
+)
+DELETE_USER = ControlTemplate("UserItem", "username", method="DELETE", title="Delete a user")
+GET_AUTHENTICATED_USER = ControlTemplate(
+    "AuthenticatedUserItem", title="Get the currently authenticated user"
+)
+
 
 class UserMasonBuilder(GenericMasonBuilder):
     """
         The mason builder which is responsible for all review endpoints
     """
-
-    def __init__(self):
-        super().__init__()
-        self.api = api.API
-        self.user_item = api.UserItem
-        self.user_collection = api.UserCollection
-        self.authenticated_user_item = api.AuthenticatedUserItem
-
     def add_control_get_users(self, rel=NAMESPACE+":users-all"):
         """
             This method adds the mason documentation for the get all users endpoint
         """
-        self._add_control(
-            rel,
-            title="Get a list of all users",
-            href=self.api.url_for(self.user_collection)
-        )
+        self._add_control_template(rel, GET_USERS)
 
     def add_control_post_user(self):
         """
             This method adds the mason documentation for the post a new user endpoint
         """
-        self._add_control_post(
-            NAMESPACE + ":add-user",
-            title="Create a new user",
-            href=self.api.url_for(self.user_collection),
-            schema=get_user_json_schema()
-        )
+        self._add_control_template(NAMESPACE + ":add-user", POST_USER)
 
     def add_control_get_user(self, username, rel="self"):
         """
             This method adds the mason documentation for the get a single user endpoint
         """
-        self._add_control(
-            rel,
-            title="Get a single user",
-            href=self.api.url_for(
-                self.user_item,
-                username=username
-            )
-        )
+        self._add_control_template(rel, GET_USER, username=username)
 
     def add_control_update_user(self, username):
         """
             This method adds the mason documentation for the update an existing user endpoint
         """
-        self._add_control_put(
-            "edit",
-            title="Update a user",
-            href=self.api.url_for(
-                self.user_item,
-                username=username
-            ),
-            schema=get_user_json_schema()
-        )
+        self._add_control_template("edit", UPDATE_USER, username=username)
 
     def add_control_delete_user(self, username):
         """
             This method adds the mason documentation for the delete a user endpoint
         """
-        self._add_control_delete(
-            NAMESPACE + ":delete",
-            title="Delete a user",
-            href=self.api.url_for(
-                self.user_item,
-                username=username
-            )
-        )
+        self._add_control_template(NAMESPACE + ":delete", DELETE_USER, username=username)
 
     def add_control_get_authenticated_user(self):
         """
             This method adds the mason documentation for the get the authenticated user endpoint
         """
-        self._add_control(
-            NAMESPACE + ":current-user",
-            title="Get the currently authenticated user",
-            href=self.api.url_for(
-                self.authenticated_user_item
-            )
-        )
+        self._add_control_template(NAMESPACE + ":current-user", GET_AUTHENTICATED_USER)
 
     def add_control_login(self):
         """
             This method adds the mason documentation for the login post endpoint
             of the third component
         """
-        self._add_control_post(
+        self._add_control(
             NAMESPACE + ":login",
-            title="Get the currently authenticated user",
             href=THIRD_COMPONENT_URL + LOGIN_ENDPOINT,
-            schema=get_credentials_json_schema()
+            method="POST",
+            encoding="json",
+            title="Get the currently authenticated user",
+            **get_schema_properties(get_credentials_json_schema)
         )
@@ -0,0 +1,13 @@
+"""
+This module can be used to rebuild the full-text search index of an existing database
+The index is created if it is missing and filled with all the movies and reviews
+"""
+import api
+from database.search_index import rebuild_search_index
+
+DB = api.DB
+
+
+if __name__ == "__main__":
+    rebuild_search_index(DB)
+    print("Rebuilt the search index")
@@ -1,13 +1,33 @@
+import base64
 import datetime
+import gzip
 import json
 import os
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
 
+import jwt
 import pytest
-from sqlalchemy import event
+from cryptography.hazmat.primitives.asymmetric import rsa
+from flask_caching.backends import RedisCache
+from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
 
-from api import API, DB
+import api
+import database_migration
+import validation_benchmark
+from api import API, DB, CACHE
+from caching.sqlite_cache import SQLiteCache
+from endpoints import review_endpoints, user_endpoints
+from helper import authentication_helper, cache_helper, third_component_request_helper, \
+    token_helper
+from helper.request_blueprints import get_validator, put_blueprint, delete_blueprint
+from json_schemas.movie_json_schema import get_movie_json_schema
+from mason import user_mason_builder
+from database import search_index
 from database.models import Movie, Category, Review
 from datamodels.user import UserType, User
 
@@ -25,6 +45,10 @@ def client():
     db_fd, db_fname = tempfile.mkstemp()
     API.app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + db_fname
     API.app.config["TESTING"] = True
+    # the responses are cached in a temporary file instead of the cache of the dev server
+    cache_fd, cache_fname = tempfile.mkstemp()
+    original_backend = API.app.extensions["cache"][CACHE]
+    _use_cache_backend(SQLiteCache(cache_fname))
 
     with API.app.app_context():
         DB.create_all()
@@ -33,8 +57,13 @@ def client():
     yield API.app.test_client()
 
     DB.session.remove()
+    _use_cache_backend(original_backend)
     os.close(db_fd)
     os.unlink(db_fname)
+    os.close(cache_fd)
+    for fname in [cache_fname, cache_fname + "-wal", cache_fname + "-shm"]:
+        if os.path.exists(fname):
+            os.unlink(fname)
 
 
 strings = ["JamesCrow", "BigMan", "GreyAlmond"]  # Dummy strings for movies and reviews
@@ -102,7 +131,8 @@ class TestCategoryCollection(object):
         assert resp.status_code == 200
         body = json.loads(resp.data)
         print(body)
-        assert len(body) == 3
+        assert len(body) == 4
+        assert body["total"] == 3
         for item in body["items"]:
             assert "title" in item
             assert "id" in item
@@ -403,6 +433,20 @@ class TestUserReviewCollection(object):
             assert "comment" in item
             assert "date" in item
 
+    def test_get_without_movies(self, client, monkeypatch):
+        """
+        Tests that the links of the reviews are built without loading their movies.
+        """
+        # the existence of the user is checked by the authentication provider
+        monkeypatch.setattr(
+            review_endpoints, "get_request", lambda url: SimpleNamespace(status_code=200)
+        )
+        resp, statements = _get_with_statements(client, "/api/users/dummyGuy/reviews/")
+        body = json.loads(resp.data)
+        assert len(body["items"]) == 3
+        assert body["items"][1]["@controls"]["self"]["href"] == "/api/movies/2/reviews/2/"
+        assert not any("FROM movie" in statement for statement in statements)
+
 
 """
 TESTING MovieCollection AND MovieItem
@@ -724,3 +768,1389 @@ class TestMovieReviewItem(object):
         assert resp.status_code == 404
         resp = client.delete(self.INVALID_URL)
         assert resp.status_code == 404
+
+
+"""
+TESTING the response cache
+"""
+
+
+def _get_with_statements(client, url, headers=None):
+    """
+    Makes a GET request and records all the SQL statements which are executed meanwhile.
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record_statement)
+    try:
+        resp = client.get(url, headers=headers)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record_statement)
+    return resp, statements
+
+
+class TestResponseCache(object):
+    RESOURCE_URL = "/api/movies/1/"
+
+    def test_get_cached(self, client):
+        """
+        Tests that the second GET of a resource is served from the cache
+        without executing a single SQL statement.
+        """
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert resp.status_code == 200
+        assert len(statements) > 0
+
+        cached_resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert cached_resp.status_code == 200
+        assert statements == []
+        assert cached_resp.data == resp.data
+
+        # other query parameters are cached separately
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL + "?page=2")
+        assert resp.status_code == 200
+        assert len(statements) > 0
+
+        # query parameters which are not read by the resource share the cached response
+        for url in [self.RESOURCE_URL + "?x=1", self.RESOURCE_URL + "?x=2&y=3"]:
+            cached_resp, statements = _get_with_statements(client, url)
+            assert cached_resp.status_code == 200
+            assert statements == []
+        with API.app.app_context():
+            assert CACHE.get("response/MovieItem:movie=1?x=1") is None
+
+    def test_tag_versions(self, client):
+        """
+        Tests that the versions of the cache tags expire, that requests of resources which
+        do not exist leave no tags behind and that a missing tag invalidates the response.
+        """
+        for movie_id in range(100, 110):
+            assert client.get("/api/movies/{}/".format(movie_id)).status_code == 404
+        client.get(self.RESOURCE_URL)
+        with API.app.app_context():
+            backend = API.app.extensions["cache"][CACHE]
+            rows = backend._connection().execute(
+                "SELECT key, expires FROM cache WHERE key LIKE 'tag/%'"
+            ).fetchall()
+            assert "tag/movie:1" in {key for key, _ in rows}
+            assert not any(key.startswith("tag/movie:10") for key, _ in rows)
+            assert all(expires != 0 for _, expires in rows)
+
+            CACHE.delete("tag/movie:1")
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert resp.status_code == 200
+        assert len(statements) > 0
+
+    def test_conditional_get(self, client):
+        """
+        Tests that cached responses contain an entity tag and that conditional requests
+        are answered from the cache with 304.
+        """
+        resp = client.get(self.RESOURCE_URL)
+        etag = resp.headers["ETag"]
+        assert int(resp.headers["Content-Length"]) == len(resp.data)
+
+        resp, statements = _get_with_statements(
+            client, self.RESOURCE_URL, headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.data == b""
+        assert statements == []
+
+        with API.app.app_context():
+            Movie.query.get(1).title = "Changed"
+            DB.session.commit()
+
+        resp = client.get(self.RESOURCE_URL, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    def test_compressed_get(self, client):
+        """
+        Tests that large cached responses are sent compressed to clients which accept it.
+        """
+        resp = client.get("/api/movies/")
+        resp = client.get("/api/movies/", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(resp.data))["items"][0]["id"] == 1
+
+    def test_invalidation(self, client):
+        """
+        Tests that committing a change of a movie invalidates exactly the cached responses
+        which were built from it.
+        """
+        client.get(self.RESOURCE_URL)
+        client.get("/api/movies/2/")
+
+        with API.app.app_context():
+            movie = Movie.query.get(1)
+            movie.title = "Cached"
+            DB.session.commit()
+
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert len(statements) > 0
+        body = json.loads(resp.data)
+        assert body["title"] == "Cached"
+
+        resp, statements = _get_with_statements(client, "/api/movies/2/")
+        assert resp.status_code == 200
+        assert statements == []
+
+    def test_invalidation_of_related_resources(self, client):
+        """
+        Tests that deleting a movie also invalidates the cached responses of its reviews.
+        """
+        assert client.get("/api/movies/1/reviews/").status_code == 200
+        assert client.get("/api/movies/1/reviews/1/").status_code == 200
+
+        with API.app.app_context():
+            DB.session.delete(Movie.query.get(1))
+            DB.session.commit()
+
+        assert client.get("/api/movies/1/reviews/").status_code == 404
+        assert client.get("/api/movies/1/reviews/1/").status_code == 404
+
+    def test_rollback(self, client):
+        """
+        Tests that changes which are rolled back do not invalidate cached responses.
+        """
+        client.get(self.RESOURCE_URL)
+
+        with API.app.app_context():
+            movie = Movie.query.get(1)
+            movie.title = "Rolled back"
+            DB.session.flush()
+            DB.session.rollback()
+
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert statements == []
+
+
+class TestCacheRebuild(object):
+    RESOURCE_URL = "/api/movies/"
+    LOCK_KEY = "lock/response/MovieCollection"
+
+    def _invalidate_movies(self):
+        with API.app.app_context():
+            Movie.query.get(1).title = "Rebuilt"
+            DB.session.commit()
+
+    def test_stale_while_rebuilding(self, client):
+        """
+        Tests that a stale response is served while another request rebuilds it.
+        """
+        stale_resp = client.get(self.RESOURCE_URL)
+        self._invalidate_movies()
+
+        with API.app.app_context():
+            CACHE.add(self.LOCK_KEY, "another request")
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert statements == []
+        assert resp.data == stale_resp.data
+
+        with API.app.app_context():
+            CACHE.delete(self.LOCK_KEY)
+        resp, statements = _get_with_statements(client, self.RESOURCE_URL)
+        assert len(statements) > 0
+        assert json.loads(resp.data)["items"][0]["title"] == "Rebuilt"
+
+    def test_grace_period_exceeded(self, client, monkeypatch):
+        """
+        Tests that a stale response is not served after the grace period, the request
+        rebuilds the response itself if the rebuilding request does not finish in time.
+        """
+        monkeypatch.setattr(cache_helper, "STALE_GRACE_PERIOD", 0)
+        monkeypatch.setattr(cache_helper, "REBUILD_LOCK_TIMEOUT", 0.2)
+        client.get(self.RESOURCE_URL)
+        self._invalidate_movies()
+
+        with API.app.app_context():
+            CACHE.add(self.LOCK_KEY, "another request")
+        resp = client.get(self.RESOURCE_URL)
+        assert json.loads(resp.data)["items"][0]["title"] == "Rebuilt"
+
+    def test_single_flight(self, client):
+        """
+        Tests that concurrent requests of a response which is not cached
+        rebuild it only once.
+        """
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(client.get(self.RESOURCE_URL)))
+            for _ in range(8)
+        ]
+        event.listen(Engine, "before_cursor_execute", record_statement)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            event.remove(Engine, "before_cursor_execute", record_statement)
+
+        assert all(resp.status_code == 200 for resp in responses)
+        # only a single request loads the movies
+        assert len([statement for statement in statements if "movie.title" in statement]) == 1
+
+
+class TestConditionalGet(object):
+    RESOURCE_URLS = [
+        "/",
+        "/api/categories/",
+        "/api/categories/1/",
+        "/api/categories/1/movies/",
+        "/api/movies/",
+        "/api/movies/?sort=-rating",
+        "/api/movies/?category_id=1&release_year_min=2022&sort=-release_date",
+        "/api/movies/?director=BigMan&release_year_max=2022",
+        "/api/movies/?length_min=60&length_max=120",
+        "/api/movies/1/",
+        "/api/movies/1/reviews/",
+        "/api/movies/1/reviews/1/",
+    ]
+
+    def test_get(self, client):
+        """
+        Tests that all GET responses contain an entity tag and that a request with
+        a matching If-None-Match header is answered with 304.
+        """
+        for url in self.RESOURCE_URLS:
+            resp = client.get(url)
+            assert resp.status_code == 200
+            assert resp.headers["Cache-Control"] == "no-cache"
+            etag = resp.headers["ETag"]
+
+            resp = client.get(url, headers={"If-None-Match": etag})
+            assert resp.status_code == 304
+            assert resp.headers["ETag"] == etag
+
+            resp = client.get(url, headers={"If-None-Match": '"other"'})
+            assert resp.status_code == 200
+
+
+class TestModificationTracking(object):
+    RESOURCE_URL = "/api/movies/"
+
+    def test_version(self, client):
+        """
+        Tests that every update increments the version and the modification time of a row.
+        """
+        with API.app.app_context():
+            movie = Movie.query.get(1)
+            version, updated_at = movie.version, movie.updated_at
+            movie.title = "Updated"
+            DB.session.commit()
+            assert movie.version == version + 1
+            assert movie.updated_at > updated_at
+
+    def test_concurrent_modification(self, client):
+        """
+        Tests that updating or deleting a row which has been modified by another worker
+        since it was loaded is rejected with 409 instead of failing.
+        """
+        with API.app.app_context():
+            for send_request in [
+                lambda movie: put_blueprint(
+                    SimpleNamespace(json=_get_movie_json()),
+                    get_movie_json_schema,
+                    DB,
+                    lambda: movie.deserialize(_get_movie_json())
+                ),
+                lambda movie: delete_blueprint(DB, movie),
+            ]:
+                movie = Movie.query.get(1)
+                with DB.engine.begin() as connection:
+                    connection.execute(text("UPDATE movie SET version = version + 1 WHERE id = 1"))
+                resp = send_request(movie)
+                assert resp.status_code == 409
+            assert Movie.query.get(1).title == "JamesCrow"
+
+    def test_if_modified_since(self, client):
+        """
+        Tests that a collection is answered with 304 if it has not been modified since the
+        If-Modified-Since time, on a cache miss a single query checks the high-water mark.
+        """
+        resp = client.get(self.RESOURCE_URL)
+        last_modified = resp.headers["Last-Modified"]
+
+        resp, statements = _get_with_statements(
+            client, self.RESOURCE_URL, headers={"If-Modified-Since": last_modified}
+        )
+        assert resp.status_code == 304
+        assert statements == []
+
+        with API.app.app_context():
+            CACHE.clear()
+        resp, statements = _get_with_statements(
+            client, self.RESOURCE_URL, headers={"If-Modified-Since": last_modified}
+        )
+        assert resp.status_code == 304
+        assert len(statements) == 1
+
+    def test_deletion(self, client):
+        """
+        Tests that deleting a row moves the modification time of the collection.
+        """
+        with API.app.app_context():
+            last_modified = Movie.get_last_modified()
+            DB.session.delete(Movie.query.get(3))
+            DB.session.commit()
+            assert Movie.get_last_modified() > last_modified
+
+    def test_migration(self, client):
+        """
+        Tests that the migration adds the version columns to a database without them.
+        """
+        with API.app.app_context():
+            DB.session.execute(text("DROP INDEX ix_category_updated_at"))
+            DB.session.execute(text("ALTER TABLE category DROP COLUMN updated_at"))
+            DB.session.commit()
+
+            statements = database_migration.migrate(DB)
+            assert any("updated_at" in statement for statement in statements)
+            assert Category.query.get(1).updated_at is not None
+            assert database_migration.migrate(DB) == []
+
+
+class TestPagination(object):
+    RESOURCE_URLS = ["/api/movies/", "/api/categories/"]
+
+    def test_get(self, client):
+        """
+        Tests that the collections are split into pages which link to each other.
+        """
+        for url in self.RESOURCE_URLS:
+            body = json.loads(client.get(url).data)
+            assert body["total"] == 3
+            assert len(body["items"]) == 3
+            assert "next" not in body["@controls"]
+            assert "prev" not in body["@controls"]
+
+            body = json.loads(client.get(url + "?limit=2").data)
+            assert [item["id"] for item in body["items"]] == [1, 2]
+            assert body["@controls"]["first"]["href"] == url + "?page=1&limit=2"
+            assert body["@controls"]["next"]["href"] == url + "?page=2&limit=2"
+
+            body = json.loads(client.get(body["@controls"]["next"]["href"]).data)
+            assert [item["id"] for item in body["items"]] == [3]
+            assert body["@controls"]["prev"]["href"] == url + "?page=1&limit=2"
+            assert "next" not in body["@controls"]
+
+            body = json.loads(client.get(url + "?limit=1000").data)
+            assert body["@controls"]["first"]["href"] == url + "?page=1&limit=100"
+
+    def test_get_invalid(self, client):
+        """
+        Tests that invalid page parameters are rejected with 400.
+        """
+        for url in self.RESOURCE_URLS:
+            assert client.get(url + "?page=0").status_code == 400
+            assert client.get(url + "?limit=-1").status_code == 400
+            assert client.get(url + "?page=first").status_code == 400
+            assert client.get(url + "?page=100000000000000000000").status_code == 400
+            assert client.get(url + "?page=1&limit=100000000000000000000").status_code == 200
+
+    def test_cached_pages(self, client):
+        """
+        Tests that every page is cached on its own and invalidated by changes of the collection.
+        """
+        client.get("/api/movies/?page=1&limit=2")
+        resp, statements = _get_with_statements(client, "/api/movies/?page=2&limit=2")
+        assert len(statements) > 0
+        resp, statements = _get_with_statements(client, "/api/movies/?page=2&limit=2")
+        assert statements == []
+
+        with API.app.app_context():
+            Movie.query.get(1).title = "Paginated"
+            DB.session.commit()
+
+        resp, statements = _get_with_statements(client, "/api/movies/?page=1&limit=2")
+        assert len(statements) > 0
+        assert json.loads(resp.data)["items"][0]["title"] == "Paginated"
+
+
+class TestCursorPagination(object):
+    RESOURCE_URL = "/api/movies/1/reviews/"
+
+    def _add_reviews(self):
+        with API.app.app_context():
+            for idx in range(6):
+                DB.session.add(Review(
+                    rating=idx % 5 + 1,
+                    comment="Paginated REVIEW",
+                    date=datetime.datetime(2019, 1, idx % 3 + 1),
+                    author="dummyGuy",
+                    movie_id=1
+                ))
+            DB.session.commit()
+
+    def test_get(self, client):
+        """
+        Tests that the reviews of a movie are split into pages ordered by date and id,
+        which are linked by cursors.
+        """
+        self._add_reviews()
+        url = self.RESOURCE_URL + "?limit=2"
+        reviews = []
+        while url is not None:
+            body = json.loads(client.get(url).data)
+            assert len(body["items"]) <= 2
+            assert body["@controls"]["first"]["href"] == self.RESOURCE_URL + "?limit=2"
+            reviews += [(item["date"], item["id"]) for item in body["items"]]
+            url = body["@controls"].get("next", {}).get("href")
+
+        assert len(reviews) == 7
+        assert reviews == sorted(reviews)
+
+    def test_get_invalid(self, client):
+        """
+        Tests that invalid cursors are rejected with 400.
+        """
+        assert client.get(self.RESOURCE_URL + "?cursor=invalid").status_code == 400
+        assert client.get(self.RESOURCE_URL + "?cursor=WzFd").status_code == 400
+        # the id of the cursor does not fit into a database integer
+        cursor = base64.urlsafe_b64encode(b'["2020-01-01T00:00:00", 100000000000000000000]')
+        assert client.get(
+            self.RESOURCE_URL + "?cursor=" + cursor.decode().rstrip("=")
+        ).status_code == 400
+
+
+class TestQueryPlans(object):
+    RESOURCE_URLS = [
+        "/api/categories/",
+        "/api/categories/1/",
+        "/api/categories/1/movies/",
+        "/api/movies/",
+        "/api/movies/1/",
+        "/api/movies/1/reviews/",
+        "/api/movies/1/reviews/1/",
+        "/api/users/dummyGuy/reviews/",
+        "/api/search/?q=BigMan",
+    ]
+
+    def test_get(self, client, monkeypatch):
+        """
+        Tests with EXPLAIN QUERY PLAN that no query of a GET endpoint which filters a table
+        has to scan the whole table.
+        """
+        # the existence of the user is checked by the authentication provider
+        monkeypatch.setattr(
+            review_endpoints, "get_request", lambda url: SimpleNamespace(status_code=200)
+        )
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, *args):
+            statements.append((statement, parameters))
+
+        event.listen(Engine, "before_cursor_execute", record_statement)
+        try:
+            for url in self.RESOURCE_URLS:
+                assert client.get(url).status_code == 200
+        finally:
+            event.remove(Engine, "before_cursor_execute", record_statement)
+
+        with API.app.app_context(), DB.engine.connect() as connection:
+            for statement, parameters in statements:
+                if not statement.startswith("SELECT") or "WHERE" not in statement:
+                    continue
+                plan = connection.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                ).fetchall()
+                for step in plan:
+                    # the subqueries only contain the rows which are already filtered
+                    scanned_table = step[3].split()[1] if step[3].startswith("SCAN") else None
+                    assert scanned_table not in DB.metadata.tables or "INDEX" in step[3], \
+                        statement
+
+
+class TestControlTemplates(object):
+
+    def test_href(self, client):
+        """
+        Tests that the hrefs instantiated from a template equal the urls built by werkzeug.
+        """
+        with API.app.test_request_context():
+            for username in ["dummyGuy", "a b/c?é"]:
+                assert user_mason_builder.GET_USER.get_href(username=username) \
+                    == API.url_for(api.UserItem, username=username)
+
+    def test_get(self, client, monkeypatch):
+        """
+        Tests that the urls of the items of a collection are not built one by one.
+        """
+        with API.app.app_context():
+            for idx in range(50):
+                DB.session.add(Movie(
+                    title="Movie {}".format(idx), director="Director", length=100,
+                    release_date=datetime.date(2022, 1, 1), category_id=1
+                ))
+            DB.session.commit()
+        built_urls = []
+        url_for = API.url_for
+        monkeypatch.setattr(
+            API, "url_for", lambda *args, **kwargs: built_urls.append(args) or url_for(
+                *args, **kwargs
+            )
+        )
+        resp = client.get("/api/movies/?limit=50")
+        assert resp.status_code == 200
+        items = json.loads(resp.data)["items"]
+        assert len(items) == 50
+        assert items[-1]["@controls"]["self"]["href"] == "/api/movies/{}/".format(
+            items[-1]["id"]
+        )
+        assert len(built_urls) < 10
+
+
+class TestJsonSchemas(object):
+    RESOURCE_URL = "/api/movies/1/"
+
+    def test_schema_url(self, client):
+        """
+        Tests that the controls refer to the schemas, which are served as immutable resources.
+        """
+        resp = client.get(self.RESOURCE_URL)
+        control = json.loads(resp.data)["@controls"]["edit"]
+        assert "schema" not in control
+        assert control["schemaUrl"].startswith("/api/schemas/movie/?version=")
+
+        resp = client.get(control["schemaUrl"])
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/schema+json"
+        assert json.loads(resp.data) == get_movie_json_schema()
+        assert resp.cache_control.immutable
+        assert resp.cache_control.max_age == 31536000
+        assert client.get(
+            control["schemaUrl"], headers={"If-None-Match": resp.headers["ETag"]}
+        ).status_code == 304
+
+        # the unversioned url has to be revalidated
+        assert client.get("/api/schemas/movie/").cache_control.no_cache
+        assert client.get("/api/schemas/unknown/").status_code == 404
+
+    def test_inline_schemas(self, client):
+        """
+        Tests that the schemas are sent inside the controls if the client requests them.
+        """
+        referenced = client.get(self.RESOURCE_URL)
+        resp = client.get(self.RESOURCE_URL + "?schemas=inline")
+        control = json.loads(resp.data)["@controls"]["edit"]
+        assert control["schema"] == get_movie_json_schema()
+        assert "schemaUrl" not in control
+        assert len(referenced.data) < len(resp.data)
+
+        body = json.loads(client.get("/?schemas=inline").data)
+        assert "schema" in body["@controls"]["moviereviewmeta:login"]
+        body = json.loads(client.get("/api/movies/?limit=1&schemas=inline").data)
+        assert "schemas=inline" in body["@controls"]["next"]["href"]
+
+
+class TestCompactCollections(object):
+
+    def test_get(self, client):
+        """
+        Tests that the items of a compact collection do not contain controls and
+        that their urls are described by a single uri template.
+        """
+        for url, uri_template in [
+            ("/api/movies/", "/api/movies/{id}/"),
+            ("/api/categories/", "/api/categories/{id}/"),
+            ("/api/movies/1/reviews/", "/api/movies/{movie_id}/reviews/{id}/"),
+        ]:
+            full = client.get(url)
+            resp = client.get(url + "?representation=compact&limit=1")
+            assert resp.status_code == 200
+            body = json.loads(resp.data)
+            assert body["@controls"]["item"]["href"] == uri_template
+            assert body["@controls"]["item"]["isHrefTemplate"]
+            assert "representation=compact" in body["@controls"]["first"]["href"]
+            item = body["items"][0]
+            assert "@controls" not in item
+            assert uri_template.format(**item) \
+                == json.loads(full.data)["items"][0]["@controls"]["self"]["href"]
+
+    def test_cache_keys(self, client):
+        """
+        Tests that the compact and the full representation are cached separately.
+        """
+        client.get("/api/movies/?representation=compact")
+        body = json.loads(client.get("/api/movies/").data)
+        assert "@controls" in body["items"][0]
+        body = json.loads(client.get("/api/movies/?representation=compact").data)
+        assert "@controls" not in body["items"][0]
+
+
+class TestSparseFieldsets(object):
+
+    def test_collection(self, client):
+        """
+        Tests that only the requested fields and controls are sent and that the columns
+        of the other fields are not loaded.
+        """
+        resp, statements = _get_with_statements(
+            client, "/api/movies/?fields=id,title&controls=self,first"
+        )
+        assert resp.status_code == 200
+        body = json.loads(resp.data)
+        assert set(body["@controls"]) == {"self", "first"}
+        assert "fields=id%2Ctitle" in body["@controls"]["first"]["href"]
+        for item in body["items"]:
+            assert set(item) == {"id", "title", "@controls"}
+            assert set(item["@controls"]) == {"self"}
+        page_query = [statement for statement in statements if "LIMIT" in statement][0]
+        assert "movie.title" in page_query
+        assert "movie.director" not in page_query
+
+        body = json.loads(client.get("/api/movies/1/reviews/?fields=rating&controls=").data)
+        assert "@controls" not in body
+        assert body["items"] == [{"rating": 1}]
+
+    def test_item(self, client):
+        """
+        Tests that the fields and controls of an item can be selected as well.
+        """
+        body = json.loads(client.get("/api/categories/1/?fields=title&controls=edit").data)
+        assert body["title"] == "JamesCrow"
+        assert "id" not in body
+        assert set(body["@controls"]) == {"edit"}
+
+    def test_cache_keys(self, client):
+        """
+        Tests that every projection is cached separately and that unknown fields are rejected.
+        """
+        assert set(json.loads(client.get("/api/movies/1/?fields=title").data)) \
+            == {"title", "@namespaces", "@controls"}
+        assert "director" in json.loads(client.get("/api/movies/1/").data)
+        assert client.get("/api/movies/1/?fields=title,unknown").status_code == 400
+
+
+class TestEmbedding(object):
+
+    def test_movie(self, client):
+        """
+        Tests that the category and the reviews of a movie are embedded and that the
+        response is invalidated if one of them changes.
+        """
+        resp = client.get("/api/movies/1/?embed=category,reviews")
+        assert resp.status_code == 200
+        body = json.loads(resp.data)
+        assert body["category"]["title"] == "JamesCrow"
+        assert body["category"]["@controls"]["self"]["href"] == "/api/categories/1/"
+        assert [review["id"] for review in body["reviews"]] == [1]
+        assert "category" not in json.loads(client.get("/api/movies/1/").data)
+
+        with API.app.app_context():
+            Category.query.get(1).title = "Changed"
+            DB.session.add(Review(
+                rating=3, comment="New", date=datetime.datetime(2021, 1, 1),
+                author="dummyGuy", movie_id=1
+            ))
+            DB.session.commit()
+        body = json.loads(client.get("/api/movies/1/?embed=category,reviews").data)
+        assert body["category"]["title"] == "Changed"
+        assert len(body["reviews"]) == 2
+        assert client.get("/api/movies/1/?embed=unknown").status_code == 400
+
+    def test_movie_queries(self, client):
+        """
+        Tests that the embedded category is loaded by the same query as the movie, the
+        embedded reviews are limited, so they and their modification time are queried apart.
+        """
+        resp, statements = _get_with_statements(client, "/api/movies/1/?embed=category,reviews")
+        assert resp.status_code == 200
+        assert len(statements) == 3
+        assert "FROM movie LEFT OUTER JOIN category" in statements[0]
+        assert not any(statement.startswith("SELECT category") for statement in statements)
+
+    def test_reviews(self, client, monkeypatch):
+        """
+        Tests that the movies of the reviews are loaded by the same query as the reviews.
+        """
+        monkeypatch.setattr(
+            review_endpoints, "get_request", lambda url: SimpleNamespace(status_code=200)
+        )
+        resp, statements = _get_with_statements(
+            client, "/api/users/dummyGuy/reviews/?embed=movie"
+        )
+        assert resp.status_code == 200
+        items = json.loads(resp.data)["items"]
+        assert [item["movie"]["id"] for item in items] == [1, 2, 3]
+        assert items[0]["movie"]["@controls"]["self"]["href"] == "/api/movies/1/"
+        movie_queries = [
+            statement for statement in statements
+            if "movie.title" in statement or "movie_1.title" in statement
+        ]
+        assert len(movie_queries) == 1
+        assert "JOIN movie" in movie_queries[0]
+
+        body = json.loads(
+            client.get("/api/movies/2/reviews/?embed=movie&representation=compact").data
+        )
+        assert body["items"][0]["movie"]["title"] == "BigMan"
+
+
+class TestCategoryMovieCollection(object):
+    RESOURCE_URL = "/api/categories/1/movies/"
+
+    def test_get(self, client):
+        """
+        Tests that only the movies of the category are listed and that the category
+        and its movies link each other.
+        """
+        category = json.loads(client.get("/api/categories/1/").data)
+        assert category["@controls"]["moviereviewmeta:movies-in-category"]["href"] \
+            == self.RESOURCE_URL
+        resp = client.get(self.RESOURCE_URL)
+        assert resp.status_code == 200
+        body = json.loads(resp.data)
+        assert [item["id"] for item in body["items"]] == [1]
+        assert body["total"] == 1
+        assert body["@controls"]["up"]["href"] == "/api/categories/1/"
+        assert body["@controls"]["self"]["href"] == self.RESOURCE_URL
+        assert client.get("/api/categories/99/movies/").status_code == 404
+
+    def test_primary_key_overflow(self, client):
+        """
+        Tests that ids which overflow a database integer are not found instead of failing.
+        """
+        for url in [
+            "/api/movies/99999999999999999999999/",
+            "/api/categories/99999999999999999999999/movies/",
+            "/api/movies/1/reviews/99999999999999999999999/",
+            "/api/movies/-99999999999999999999999/",
+        ]:
+            assert client.get(url).status_code == 404, url
+
+    def test_invalidation(self, client):
+        """
+        Tests that the movies of both categories are invalidated if a movie is moved
+        to another category.
+        """
+        client.get(self.RESOURCE_URL)
+        client.get("/api/categories/2/movies/")
+        with API.app.app_context():
+            Movie.query.get(1).category_id = 2
+            DB.session.commit()
+        assert json.loads(client.get(self.RESOURCE_URL).data)["items"] == []
+        body = json.loads(client.get("/api/categories/2/movies/").data)
+        assert [item["id"] for item in body["items"]] == [1, 2]
+
+    def test_if_modified_since(self, client):
+        """
+        Tests that the movies of a category are modified if a movie leaves the category.
+        """
+        with API.app.app_context():
+            Movie.query.get(3).category_id = 1
+            DB.session.commit()
+            DB.session.execute(text("UPDATE movie SET updated_at = '2000-01-01 00:00:00'"))
+            DB.session.commit()
+        last_modified = client.get(self.RESOURCE_URL).headers["Last-Modified"]
+        with API.app.app_context():
+            Movie.query.get(1).category_id = 2
+            DB.session.commit()
+        resp = client.get(self.RESOURCE_URL, headers={"If-Modified-Since": last_modified})
+        assert resp.status_code == 200
+        assert [item["id"] for item in json.loads(resp.data)["items"]] == [3]
+
+
+class TestMovieFiltering(object):
+    RESOURCE_URL = "/api/movies/"
+
+    @staticmethod
+    def _get_ids(client, query):
+        resp = client.get(TestMovieFiltering.RESOURCE_URL + query)
+        assert resp.status_code == 200
+        return [item["id"] for item in json.loads(resp.data)["items"]]
+
+    def test_filter(self, client):
+        """
+        Tests the filters of the movie collection and that they are kept on the other pages.
+        """
+        assert self._get_ids(client, "?category_id=2") == [2]
+        assert self._get_ids(client, "?director=GreyAlmond") == [3]
+        assert self._get_ids(client, "?release_year_min=2022&release_year_max=2022") == [1, 2, 3]
+        assert self._get_ids(client, "?release_year_max=2021") == []
+        assert self._get_ids(client, "?release_year_min=1&release_year_max=9999") == [1, 2, 3]
+        assert self._get_ids(client, "?length_min=100&length_max=180") == [2, 3]
+        body = json.loads(client.get(self.RESOURCE_URL + "?length_min=100&limit=1").data)
+        assert body["total"] == 2
+        assert "length_min=100" in body["@controls"]["next"]["href"]
+
+    def test_sort(self, client):
+        """
+        Tests the sort keys of the movie collection and that the order by rating follows
+        the changes of the reviews.
+        """
+        assert self._get_ids(client, "?sort=title") == [2, 3, 1]
+        assert self._get_ids(client, "?sort=-release_date") == [3, 2, 1]
+        assert self._get_ids(client, "?director=BigMan&sort=-release_date") == [2]
+        assert self._get_ids(client, "?sort=-rating") == [3, 2, 1]
+        with API.app.app_context():
+            Review.query.get(1).rating = 5
+            DB.session.commit()
+            assert Movie.query.get(1).average_rating == 5
+        assert self._get_ids(client, "?sort=-rating") == [1, 3, 2]
+
+    def test_invalid(self, client):
+        """
+        Tests that invalid values and combinations which are not served by an index are rejected.
+        """
+        for query in [
+            "?category_id=abc",
+            "?release_year_min=99999",
+            "?release_year_min=0",
+            "?release_year_max=10000",
+            "?release_year_max=100000000000000000000",
+            "?length_min=100000000000000000000",
+            "?sort=comment",
+            "?director=BigMan&sort=title",
+            "?director=BigMan&length_min=60",
+        ]:
+            assert client.get(self.RESOURCE_URL + query).status_code == 400, query
+        resp = client.get(self.RESOURCE_URL + "?release_year_max=10000")
+        assert "release_year_max must be between 1 and 9999" in json.loads(resp.data)["message"]
+
+
+class TestSearch(object):
+    RESOURCE_URL = "/api/search/"
+
+    @staticmethod
+    def _search(client, query):
+        resp = client.get(TestSearch.RESOURCE_URL + "?q=" + query)
+        assert resp.status_code == 200
+        return json.loads(resp.data)
+
+    def test_get(self, client):
+        """
+        Tests that the movies and the reviews which match the search terms are listed
+        with a highlighted snippet and a link to the matching resource.
+        """
+        index = json.loads(client.get("/").data)
+        assert index["@controls"]["moviereviewmeta:search"]["href"] == "/api/search/{?q}"
+        body = self._search(client, "bigman")
+        assert body["total"] == 2
+        items = {item["type"]: item for item in body["items"]}
+        assert items["movie"]["id"] == 2
+        assert items["movie"]["@controls"]["self"]["href"] == "/api/movies/2/"
+        assert items["review"]["snippet"] == "BigMan REVIEW"
+        assert items["review"]["highlights"] == [[0, 6]]
+        assert items["review"]["@controls"]["self"]["href"] == "/api/movies/2/reviews/2/"
+        body = self._search(client, "REVIEW&limit=1")
+        assert body["total"] == 3
+        assert "q=REVIEW" in body["@controls"]["next"]["href"]
+
+    def test_snippet_is_plain_text(self, client):
+        """
+        Tests that markup in the searched text is returned unchanged as plain text
+        and that the highlights are returned as offsets instead of markup.
+        """
+        with API.app.app_context():
+            Review.query.get(2).comment = "<b>Great</b> BigMan"
+            DB.session.commit()
+        item = self._search(client, "great")["items"][0]
+        assert item["snippet"] == "<b>Great</b> BigMan"
+        assert item["highlights"] == [[3, 8]]
+
+    def test_invalid(self, client):
+        """
+        Tests that a search without terms is rejected and that the operators of the
+        search syntax are searched as text.
+        """
+        assert client.get(self.RESOURCE_URL).status_code == 400
+        assert client.get(self.RESOURCE_URL + "?q=%20").status_code == 400
+        assert self._search(client, "%22BigMan%20OR%20*")["total"] == 0
+
+    def test_sync(self, client):
+        """
+        Tests that the search index follows the changes of the movies and the reviews.
+        """
+        assert self._search(client, "JamesCrow")["total"] == 2
+        with API.app.app_context():
+            Movie.query.get(1).title = "Nosferatu"
+            DB.session.delete(Review.query.get(1))
+            DB.session.commit()
+        assert [item["id"] for item in self._search(client, "JamesCrow")["items"]] == [1]
+        assert self._search(client, "nosferatu")["items"][0]["id"] == 1
+
+    def test_rebuild(self, client):
+        """
+        Tests that the rebuild of the search index indexes the existing rows.
+        """
+        with API.app.app_context():
+            DB.session.execute(text("INSERT INTO movie_search(movie_search) VALUES ('delete-all')"))
+            DB.session.commit()
+            assert DB.session.execute(text(
+                "SELECT count(*) FROM movie_search WHERE movie_search MATCH 'GreyAlmond'"
+            )).scalar() == 0
+            search_index.rebuild_search_index(DB)
+            assert DB.session.execute(text(
+                "SELECT count(*) FROM movie_search WHERE movie_search MATCH 'GreyAlmond'"
+            )).scalar() == 1
+
+
+SIGNING_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _get_token(username="dummyAdmin", role=UserType.ADMIN, key_id="test-key", **claims):
+    """
+    Creates a token like the identity provider does.
+    """
+    payload = {
+        "iss": "movie-review-identity-provider",
+        "sub": username,
+        "role": role,
+        "exp": datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(hours=1),
+    }
+    payload.update(claims)
+    return jwt.encode(payload, SIGNING_KEY, algorithm="RS256", headers={"kid": key_id})
+
+
+class TestTokenVerification(object):
+    RESOURCE_URL = "/api/movies/3/"
+
+    @pytest.fixture(autouse=True)
+    def signing_keys(self, monkeypatch):
+        """
+        Provides the public key of the test signing key as if it was downloaded from
+        the identity provider, which must not be asked to validate the tokens.
+        """
+        monkeypatch.setattr(
+            token_helper.SIGNING_KEYS, "keys", {"test-key": SIGNING_KEY.public_key()}
+        )
+        monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", time.time())
+        monkeypatch.setattr(authentication_helper, "post_request", None)
+        monkeypatch.setattr(
+            authentication_helper, "TOKEN_CACHE", authentication_helper.TokenValidationCache()
+        )
+
+    def _delete(self, client, token):
+        return client.delete(self.RESOURCE_URL, headers={"Authorization": token})
+
+    def test_valid_token(self, client):
+        """
+        Tests that a valid token is accepted and that the role is taken from the token.
+        """
+        assert self._delete(client, _get_token(role=UserType.BASIC_USER)).status_code == 403
+        assert self._delete(client, _get_token()).status_code == 204
+
+    def test_invalid_token(self, client):
+        """
+        Tests that expired, foreign and forged tokens are rejected with 401.
+        """
+        resp = self._delete(client, _get_token(exp=datetime.datetime(2020, 1, 1)))
+        assert resp.status_code == 401
+        assert json.loads(resp.data)["message"] == "Token expired. Get new one"
+        assert self._delete(client, _get_token(iss="another-issuer")).status_code == 401
+        assert self._delete(client, _get_token()[:-4] + "AAAA").status_code == 401
+        assert self._delete(client, "no token").status_code == 401
+
+    def test_cached_validation(self, client, monkeypatch):
+        """
+        Tests that a token is validated only once until it expires and that invalid tokens
+        are cached as well.
+        """
+        validated_tokens = []
+
+        def verify_token(token):
+            validated_tokens.append(token)
+            return token_helper.verify_token(token)
+
+        monkeypatch.setattr(authentication_helper, "verify_token", verify_token)
+        expires_at = time.time() + 60
+        token = _get_token(role=UserType.BASIC_USER, exp=int(expires_at))
+        for _ in range(3):
+            assert self._delete(client, token).status_code == 403
+        assert self._delete(client, "invalid").status_code == 401
+        assert self._delete(client, "invalid").status_code == 401
+        assert validated_tokens == [token, "invalid"]
+        assert authentication_helper.TOKEN_CACHE.hits == 3
+        assert authentication_helper.TOKEN_CACHE.misses == 2
+
+        # the cached user expires together with the token
+        monkeypatch.setattr(authentication_helper.time, "time", lambda: expires_at)
+        authentication_helper.TOKEN_CACHE.get(token)
+        assert authentication_helper.TOKEN_CACHE.misses == 3
+
+    def test_cache_size(self):
+        """
+        Tests that the least recently used tokens are removed from a full cache.
+        """
+        cache = authentication_helper.TokenValidationCache(max_size=2)
+        for token in ["first", "second"]:
+            cache.add(token, User(username=token), time.time() + 60)
+        assert cache.get("first").username == "first"
+        cache.add("third", User(username="third"), time.time() + 60)
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+
+    def test_unknown_key(self, client, monkeypatch):
+        """
+        Tests that the keys are downloaded again if a token is signed by an unknown key
+        and that the token is only validated remotely if the fallback is configured.
+        """
+        monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", 0)
+        monkeypatch.setattr(token_helper, "get_request", lambda url: SimpleNamespace(
+            status_code=200,
+            json=lambda: {"keys": [dict(
+                json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(SIGNING_KEY.public_key())),
+                kid="rotated-key"
+            )]}
+        ))
+        assert self._delete(client, _get_token(key_id="rotated-key")).status_code == 204
+
+        token = _get_token(key_id="unknown-key")
+        assert client.delete("/api/movies/2/", headers={"Authorization": token}).status_code == 401
+
+        monkeypatch.setitem(API.app.config, "REMOTE_TOKEN_VALIDATION_FALLBACK", True)
+        remote_response = SimpleNamespace(
+            status_code=200,
+            json=lambda: {"username": "dummyAdmin", "role": UserType.ADMIN}
+        )
+        monkeypatch.setattr(authentication_helper, "post_request", lambda url, body: remote_response)
+        monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", 0)
+        assert client.delete("/api/movies/2/", headers={"Authorization": token}).status_code == 204
+
+    def test_unavailable_key_set(self, client, monkeypatch):
+        """
+        Tests that a failed download of the keys is handled like an unavailable identity
+        provider, the token is rejected or validated remotely instead of failing with 500.
+        """
+        token = _get_token(key_id="rotated-key")
+        for response in [
+            SimpleNamespace(status_code=500, json=lambda: {"message": "error"}),
+            SimpleNamespace(status_code=200, json=lambda: {"message": "no keys"}),
+        ]:
+            monkeypatch.setattr(token_helper, "get_request", lambda url: response)
+            monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", 0)
+            assert self._delete(client, token).status_code == 401
+            assert "test-key" in token_helper.SIGNING_KEYS.keys
+
+        monkeypatch.setitem(API.app.config, "REMOTE_TOKEN_VALIDATION_FALLBACK", True)
+        remote_response = SimpleNamespace(
+            status_code=200,
+            json=lambda: {"username": "dummyAdmin", "role": UserType.ADMIN}
+        )
+        monkeypatch.setattr(authentication_helper, "post_request", lambda url, body: remote_response)
+        monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", 0)
+        assert self._delete(client, token).status_code == 204
+
+    def test_current_user(self, client, monkeypatch):
+        """
+        Tests that the profile of the authenticated user is loaded from the identity provider,
+        since the token does not contain the email address.
+        """
+        requested_urls = []
+
+        def get_request(url):
+            requested_urls.append(url)
+            return SimpleNamespace(
+                status_code=200,
+                headers={"content-type": "application/json"},
+                json=lambda: {
+                    "username": "dummyAdmin",
+                    "email_address": "admin@example.com",
+                    "role": UserType.ADMIN
+                }
+            )
+
+        monkeypatch.setattr(user_endpoints, "get_request", get_request)
+        resp = client.get("/api/current-user/", headers={"Authorization": _get_token()})
+        assert resp.status_code == 200
+        body = json.loads(resp.data)
+        assert body["email_address"] == "admin@example.com"
+        assert body["@controls"]["moviereviewmeta:reviews-of-user"]["href"] \
+            == "/api/users/dummyAdmin/reviews/"
+        assert requested_urls == ["/api/users/dummyAdmin/"]
+
+
+class TestSchemaValidation(object):
+
+    @pytest.fixture(autouse=True)
+    def signing_keys(self, monkeypatch):
+        """
+        Provides the public key of the test signing key as if it was downloaded from
+        the identity provider.
+        """
+        monkeypatch.setattr(
+            token_helper.SIGNING_KEYS, "keys", {"test-key": SIGNING_KEY.public_key()}
+        )
+        monkeypatch.setattr(token_helper.SIGNING_KEYS, "fetched_at", time.time())
+
+    def test_precompiled_validator(self, client):
+        """
+        Tests that the validator of a schema is compiled only once and reports
+        the same errors as before.
+        """
+        assert get_validator(get_movie_json_schema) is get_validator(get_movie_json_schema)
+        resp = client.post(
+            "/api/movies/",
+            json={"title": "Title", "director": "Director", "length": 0,
+                  "release_date": "2022-04-01", "category_id": 1},
+            headers={"Authorization": _get_token()}
+        )
+        assert resp.status_code == 400
+        assert "0 is less than the minimum of 1" in json.loads(resp.data)["message"]
+
+    def test_benchmark(self):
+        """
+        Tests that the benchmark measures both validations and that the precompiled
+        validation reuses the validator instead of compiling it for every request.
+        """
+        get_validator(get_movie_json_schema)
+        misses = get_validator.cache_info().misses
+        result = validation_benchmark.benchmark(iterations=5)
+        assert set(result) == {"uncompiled", "precompiled"}
+        assert get_validator.cache_info().misses == misses
+
+
+class _ThirdComponentHandler(BaseHTTPRequestHandler):
+    """
+    Answers the requests of the tests like the identity provider, the path /slow answers late.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = b'{"username": "dummyGuy"}'
+        status_code = 403 if self.path == "/forbidden" else 200
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestThirdComponentRequests(object):
+
+    @pytest.fixture
+    def third_component(self, monkeypatch):
+        """
+        Runs a server in place of the identity provider and uses a new session for it.
+        """
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ThirdComponentHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        monkeypatch.setattr(
+            third_component_request_helper,
+            "THIRD_COMPONENT_URL",
+            "http://127.0.0.1:{}".format(server.server_port)
+        )
+        monkeypatch.delitem(API.app.extensions, "third_component_session", raising=False)
+        monkeypatch.delitem(API.app.extensions, "third_component_circuit_breaker", raising=False)
+        yield server
+        API.app.extensions.pop("third_component_session", None)
+        API.app.extensions.pop("third_component_circuit_breaker", None)
+        server.shutdown()
+        server.server_close()
+
+    def test_connection_pool(self, client, third_component):
+        """
+        Tests that consecutive requests reuse a single kept alive connection.
+        """
+        with API.app.app_context():
+            for _ in range(3):
+                assert third_component_request_helper.get_request("/").status_code == 200
+            statistics = third_component_request_helper.get_pool_statistics()
+        assert statistics["opened_connections"] == 1
+        assert statistics["idle_connections"] == 1
+        assert statistics["connections_in_use"] == 0
+        assert statistics["requests"] == 3
+
+    def test_timeout(self, client, third_component, monkeypatch):
+        """
+        Tests that a proxied request is aborted with 504 if the answer takes too long.
+        """
+        monkeypatch.setitem(API.app.config, "THIRD_COMPONENT_READ_TIMEOUT", 0.1)
+        with API.app.test_request_context():
+            resp = third_component_request_helper.forward(
+                lambda: third_component_request_helper.get_request("/slow")
+            )
+        assert resp.status_code == 504
+
+    def test_forward(self, client, third_component):
+        """
+        Tests that bodies are passed through untouched and decoded only once if mason
+        documentation is injected.
+        """
+        injected_bodies = []
+
+        def inject_mason(body):
+            injected_bodies.append(body)
+            return json.dumps(dict(body, injected=True))
+
+        with API.app.test_request_context():
+            resp = third_component_request_helper.forward(
+                lambda: third_component_request_helper.get_request("/", stream=True)
+            )
+            assert resp.direct_passthrough
+            assert b"".join(resp.response) == b'{"username": "dummyGuy"}'
+            resp.close()
+
+            resp = third_component_request_helper.forward(
+                lambda: third_component_request_helper.get_request("/forbidden"), inject_mason
+            )
+            assert resp.status_code == 403
+            assert b"".join(resp.response) == b'{"username": "dummyGuy"}'
+            assert injected_bodies == []
+
+            resp = third_component_request_helper.forward(
+                lambda: third_component_request_helper.get_request("/"), inject_mason
+            )
+            assert json.loads(resp.get_data()) == {"username": "dummyGuy", "injected": True}
+            assert injected_bodies == [{"username": "dummyGuy"}]
+
+    def test_circuit_breaker(self, client, third_component, monkeypatch):
+        """
+        Tests that the requests are rejected without contacting the third component after
+        it failed repeatedly and that it is probed again after the recovery timeout.
+        """
+        monkeypatch.setitem(API.app.config, "THIRD_COMPONENT_FAILURE_THRESHOLD", 2)
+        monkeypatch.setitem(API.app.config, "THIRD_COMPONENT_RECOVERY_TIMEOUT", 0.2)
+        monkeypatch.setitem(API.app.config, "THIRD_COMPONENT_READ_TIMEOUT", 0.1)
+        with API.app.test_request_context():
+            for _ in range(2):
+                resp = third_component_request_helper.forward(
+                    lambda: third_component_request_helper.get_request("/slow")
+                )
+                assert resp.status_code == 504
+            circuit_breaker = API.app.extensions["third_component_circuit_breaker"]
+            assert circuit_breaker.state == third_component_request_helper.CircuitBreaker.OPEN
+
+            start = time.time()
+            with pytest.raises(third_component_request_helper.CircuitOpenError):
+                third_component_request_helper.get_request("/")
+            assert time.time() - start < 0.05
+            assert third_component_request_helper.get_pool_statistics()["requests"] == 2
+
+            time.sleep(0.2)
+            assert third_component_request_helper.get_request("/").status_code == 200
+            assert circuit_breaker.state == third_component_request_helper.CircuitBreaker.CLOSED
+
+
+def _use_cache_backend(backend):
+    """
+    Replaces the cache backend of the app, which simulates requests handled by another worker.
+    """
+    API.app.extensions["cache"][CACHE] = backend
+
+
+def _assert_shared_between_workers(client, worker_1, worker_2):
+    """
+    Checks that a response cached by one worker is served by the other one and that
+    an invalidation made by one worker is seen by the other one.
+    """
+    url = TestResponseCache.RESOURCE_URL
+    original_backend = API.app.extensions["cache"][CACHE]
+    try:
+        _use_cache_backend(worker_1)
+        resp, statements = _get_with_statements(client, url)
+        assert len(statements) > 0
+
+        _use_cache_backend(worker_2)
+        resp, statements = _get_with_statements(client, url)
+        assert resp.status_code == 200
+        assert statements == []
+
+        with API.app.app_context():
+            Movie.query.get(1).title = "Invalidated"
+            DB.session.commit()
+
+        _use_cache_backend(worker_1)
+        resp, statements = _get_with_statements(client, url)
+        assert len(statements) > 0
+    finally:
+        _use_cache_backend(original_backend)
+
+
+class TestSharedCacheBackends(object):
+
+    def test_sqlite_cache(self, client):
+        """
+        Tests that two workers using the same SQLite cache file share their responses
+        and invalidations.
+        """
+        cache_fd, cache_fname = tempfile.mkstemp()
+        try:
+            _assert_shared_between_workers(
+                client, SQLiteCache(cache_fname), SQLiteCache(cache_fname)
+            )
+        finally:
+            os.close(cache_fd)
+            os.unlink(cache_fname)
+
+    def test_sqlite_cache_operations(self):
+        """
+        Tests the atomic operations of the SQLite cache backend.
+        """
+        cache_fd, cache_fname = tempfile.mkstemp()
+        try:
+            cache = SQLiteCache(cache_fname)
+            assert cache.add("key", 1)
+            assert not cache.add("key", 2)
+            assert cache.inc("key") == 2
+            assert cache.get_many("key", "missing") == [2, None]
+            cache.set("expired", 1, timeout=-1)
+            assert cache.get("expired") is None
+            assert cache.add("expired", 3)
+            assert cache.delete("key")
+            assert not cache.has("key")
+        finally:
+            os.close(cache_fd)
+            os.unlink(cache_fname)
+
+    def test_sqlite_cache_prune(self):
+        """
+        Tests that a full SQLite cache evicts the entries which expire first, the entries
+        without a timeout last, and that its size is only counted every prune interval.
+        """
+        cache_fd, cache_fname = tempfile.mkstemp()
+        try:
+            cache = SQLiteCache(cache_fname, threshold=10)
+            cache.set("permanent", "value", timeout=0)
+            for number in range(30):
+                cache.set("response/{}".format(number), number, timeout=100 + number)
+            connection = cache._connection()
+            assert connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0] <= 10
+            assert cache.get("permanent") == "value"
+            assert cache.get("response/29") == 29
+            assert cache.get("response/0") is None
+
+            cache.set_many(
+                {"permanent/{}".format(number): number for number in range(20)}, timeout=0
+            )
+            assert connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0] <= 10
+
+            cache = SQLiteCache(cache_fname, threshold=1000)
+            assert cache.prune_interval == 10
+            for number in range(1005):
+                cache.set("many/{}".format(number), number)
+            assert connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0] \
+                <= 1000 + cache.prune_interval
+        finally:
+            os.close(cache_fd)
+            os.unlink(cache_fname)
+
+    def test_redis_cache(self, client):
+        """
+        Tests that two workers using the same Redis server share their responses
+        and invalidations, a fake Redis server acts as stand-in.
+        """
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        _assert_shared_between_workers(
+            client,
+            RedisCache(host=fakeredis.FakeStrictRedis(server=server)),
+            RedisCache(host=fakeredis.FakeStrictRedis(server=server))
+        )
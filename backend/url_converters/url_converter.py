@@ -1,11 +1,85 @@
 """
     Contains all the url converters used in the api
 """
+from functools import wraps
 
 from werkzeug.exceptions import NotFound
 from werkzeug.routing import BaseConverter
 
 import database
+from constants import MIN_DATABASE_INTEGER, MAX_DATABASE_INTEGER
+
+
+class EntityReference:
+    """
+        This class represents a lazy reference to a database object
+        It is returned by the url converters so that the primary key of a resource is known
+        without querying the database, the object itself is only loaded when it is resolved
+    """
+    def __init__(self, model, identifier):
+        """
+            input:
+                model: the database model class the reference points to
+                identifier: the primary key of the referenced database object
+        """
+        self.model = model
+        self.id = identifier
+
+    def resolve(self, *options):
+        """
+            Loads the referenced object from the database
+            input:
+                options: optional loader options of the query, e.g. to load a relation
+                    by the same query
+            output:
+                The database object with the referenced primary key
+            exceptions:
+                NotFound: It is raised if there exists no object with the referenced primary key
+        """
+        db_object = self.model.query.options(*options).filter_by(id=self.id).first()
+        if db_object is None:
+            raise NotFound
+        return db_object
+
+
+def resolve_references(kwargs, options=None):
+    """
+        Replaces all the entity references of the given keyword arguments with the actual objects
+        input:
+            kwargs: the keyword arguments of an endpoint function
+            options: an optional dict which contains the loader options of the references
+                by the names of their keyword arguments
+        output:
+            A new dict containing the resolved keyword arguments
+    """
+    options = options or {}
+    return {
+        key: value.resolve(*options.get(key, ())) if isinstance(value, EntityReference)
+        else value
+        for key, value in kwargs.items()
+    }
+
+
+def resolve_entities(func):
+    """
+        This function represents the @resolve_entities annotation
+        It loads the database objects the url parameters of an endpoint refer to
+        before the endpoint function is entered
+    """
+    @wraps(func)
+    def wrapper_resolve_entities(*args, **kwargs):
+        return func(*args, **resolve_references(kwargs))
+    return wrapper_resolve_entities
+
+
+def _get_primary_key(value):
+    try:
+        primary_key = int(value)
+    except ValueError as e:
+        raise NotFound from e
+    if not MIN_DATABASE_INTEGER <= primary_key <= MAX_DATABASE_INTEGER:
+        raise NotFound
+    return primary_key
 
 
 class MovieConverter(BaseConverter):
@@ -15,18 +89,15 @@ class MovieConverter(BaseConverter):
 
     def to_python(self, value):
         """
-            This function converts the url parameter movie_id to the actual movie object
+            This function converts the url parameter movie_id to a reference to the movie object
             input:
                 value: the id of the movie, it represents the primary key of the database object
             output:
-                The movie with the given id
+                A reference to the movie with the given id
             exceptions:
-                NotFound: It is raised if there exists no movie with the given id
+                NotFound: It is raised if the given id is not a valid primary key
         """
-        db_movie = database.models.Movie.query.filter_by(id=value).first()
-        if db_movie is None:
-            raise NotFound
-        return db_movie
+        return EntityReference(database.models.Movie, _get_primary_key(value))
 
     def to_url(self, value):
         """
@@ -45,18 +116,15 @@ class CategoryConverter(BaseConverter):
     """
     def to_python(self, value):
         """
-        This function converts the url parameter category_id to the actual category object
+        This function converts the url parameter category_id to a reference to the category object
         input:
             value: the id of the category, it represents the primary key of the database object
         output:
-            The category with the given id
+            A reference to the category with the given id
         exceptions:
-            NotFound: It is raised if there exists no category with the given id
+            NotFound: It is raised if the given id is not a valid primary key
         """
-        db_category = database.models.Category.query.filter_by(id=value).first()
-        if db_category is None:
-            raise NotFound
-        return db_category
+        return EntityReference(database.models.Category, _get_primary_key(value))
 
     def to_url(self, value):
         """
@@ -75,18 +143,15 @@ class ReviewConverter(BaseConverter):
     """
     def to_python(self, value):
         """
-            This function converts the url parameter review_id to the actual review object
+            This function converts the url parameter review_id to a reference to the review object
             input:
                 value: the id of the review, it represents the primary key of the database object
             output:
-                The review with the given id
+                A reference to the review with the given id
             exceptions:
-                NotFound: It is raised if there exists no review with the given id
+                NotFound: It is raised if the given id is not a valid primary key
         """
-        db_review = database.models.Review.query.filter_by(id=value).first()
-        if db_review is None:
-            raise NotFound
-        return db_review
+        return EntityReference(database.models.Review, _get_primary_key(value))
 
     def to_url(self, value):
         """
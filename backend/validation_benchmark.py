@@ -0,0 +1,51 @@
+"""
+This module compares the cost of validating a request body against a JSON schema
+which is rebuilt and checked for every request with the cost of the precompiled validator
+"""
+import timeit
+
+from jsonschema import validate, draft7_format_checker
+
+from helper.request_blueprints import validate_json
+from json_schemas.movie_json_schema import get_movie_json_schema
+
+# the number of validations of every measurement
+ITERATIONS = 10000
+
+# a valid movie as it is sent by the client
+MOVIE = {
+    "title": "The Benchmark",
+    "director": "Jane Doe",
+    "length": 7200,
+    "release_date": "2022-04-01",
+    "category_id": 1,
+}
+
+
+def benchmark(iterations=ITERATIONS):
+    """
+        Measures the validation of a movie with and without the precompiled validator
+        input:
+            iterations: the number of validations of every measurement
+        output:
+            A dict with the average duration of a validation in microseconds
+    """
+    uncompiled = timeit.timeit(
+        lambda: validate(
+            MOVIE, get_movie_json_schema.__wrapped__(), format_checker=draft7_format_checker
+        ),
+        number=iterations
+    )
+    precompiled = timeit.timeit(
+        lambda: validate_json(MOVIE, get_movie_json_schema),
+        number=iterations
+    )
+    return {
+        "uncompiled": uncompiled / iterations * 1e6,
+        "precompiled": precompiled / iterations * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    for name, duration in benchmark().items():
+        print("{}: {:.1f} us per validation".format(name, duration))
@@ -20,6 +20,7 @@ type ModalComponentProps = {
   getMasonDocKey?: 'edit'|'moviereviewmeta:delete'
   submitUrl?: string,
   schema?: any,
+  schemaUrl?: string,
   httpMethod?: string,
   review?: Review
 }
@@ -60,13 +61,30 @@ class ModalComponent
     const masonDoc = serverResponse['@controls'][this.props.getMasonDocKey ?? 'edit'];
 
     this.setState({
-      loading: false,
       submitUrl: masonDoc?.href,
-      schema: masonDoc?.schema,
       httpMethod: masonDoc?.method,
     });
+    this.loadSchema(masonDoc?.schema, masonDoc?.schemaUrl);
   };
 
+  private loadSchema(schema?: any, schemaUrl?: string) {
+    if (schema || !schemaUrl) {
+      this.setState({
+        loading: false,
+        schema,
+      });
+    } else {
+      Fetch.getRequest(
+        schemaUrl,
+        (serverResponse: any) => this.setState({
+          loading: false,
+          schema: serverResponse,
+        }),
+        this.fetchErrorHandler,
+      );
+    }
+  }
+
   private fetchErrorHandler = () => {
     this.setState({
       errorMessage: 'Failed to execute the action',
@@ -96,13 +114,12 @@ class ModalComponent
   };
 
   private initModalContent() {
-    if (this.props.schema && this.props.submitUrl) {
+    if ((this.props.schema || this.props.schemaUrl) && this.props.submitUrl) {
       this.setState({
-        loading: false,
         submitUrl: this.props.submitUrl,
-        schema: this.props.schema,
         httpMethod: this.props.httpMethod,
       });
+      this.loadSchema(this.props.schema, this.props.schemaUrl);
     } else {
       Fetch.getRequest(
         this.props.getMasonDocUrl ?? '',
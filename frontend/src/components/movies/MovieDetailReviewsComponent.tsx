@@ -28,6 +28,7 @@ interface MovieDetailReviewsComponentProps extends ReduxState {
 type MovieDetailReviewsComponentState = {
   isLoaded: boolean,
   reviews?: Review[],
+  nextReviewsUrl?: string,
   addReviewMasonDoc?: MasonControl
 }
 
@@ -49,10 +50,18 @@ class MovieDetailReviewsComponent
     this.setState({
       isLoaded: true,
       reviews: serverResponse.items ?? [],
+      nextReviewsUrl: serverResponse['@controls'].next?.href,
       addReviewMasonDoc: serverResponse['@controls']['moviereviewmeta:add-review'],
     });
   };
 
+  private nextReviewsResponseHandler = (serverResponse: Collection<Review>) => {
+    this.setState((prevState) => ({
+      reviews: (prevState.reviews ?? []).concat(serverResponse.items ?? []),
+      nextReviewsUrl: serverResponse['@controls'].next?.href,
+    }));
+  };
+
   private requestErrorHandler = () => {
     this.setState({
       isLoaded: true,
@@ -61,7 +70,7 @@ class MovieDetailReviewsComponent
 
   private fetchReviewList() {
     if (this.props.reviewsUrl) {
-      Fetch.getRequest(
+      Fetch.getFirstPage(
         this.props.reviewsUrl,
         this.requestResponseHandler,
         this.requestErrorHandler,
@@ -69,6 +78,16 @@ class MovieDetailReviewsComponent
     }
   }
 
+  private fetchNextReviews = () => {
+    if (this.state.nextReviewsUrl) {
+      Fetch.getRequest(
+        this.state.nextReviewsUrl,
+        this.nextReviewsResponseHandler,
+        this.requestErrorHandler,
+      );
+    }
+  };
+
   render() {
     if (!this.state.isLoaded) {
       return (
@@ -100,6 +119,7 @@ class MovieDetailReviewsComponent
                 title="Add Review"
                 submitUrl={this.state.addReviewMasonDoc?.href}
                 schema={this.state.addReviewMasonDoc?.schema}
+                schemaUrl={this.state.addReviewMasonDoc?.schemaUrl}
                 successHandler={(newReview: Review) => this.setState((prevState) => ({
                   reviews: (prevState.reviews ?? []).concat(newReview),
                 }))}
@@ -192,6 +212,13 @@ class MovieDetailReviewsComponent
               );
             })}
           </Row>
+          {this.state.nextReviewsUrl && (
+            <div className="load-more">
+              <Button variant="outline-primary" onClick={this.fetchNextReviews}>
+                Load more
+              </Button>
+            </div>
+          )}
         </Container>
       </div>
     );
@@ -1,5 +1,7 @@
 import React from 'react';
-import { Container, Spinner, Table } from 'react-bootstrap';
+import {
+  Button, Container, Spinner, Table,
+} from 'react-bootstrap';
 import { NavigateFunction } from 'react-router-dom';
 import moment from 'moment';
 import withRouter from '../../helper/RouterHelper';
@@ -21,6 +23,7 @@ interface MovieListComponentProps extends ReduxState {
 type MovieListComponentState = {
   isLoaded: boolean,
   movies?: Movie[],
+  nextMoviesUrl?: string,
   categoryTitleMap?: Map<number, string>,
 }
 
@@ -51,9 +54,17 @@ class MovieListComponent
     this.setState({
       isLoaded: true,
       movies: serverResponse.items ?? [],
+      nextMoviesUrl: serverResponse['@controls'].next?.href,
     });
   };
 
+  private nextMoviesResponseHandler = (serverResponse: Collection<Movie>) => {
+    this.setState((prevState) => ({
+      movies: (prevState.movies ?? []).concat(serverResponse.items ?? []),
+      nextMoviesUrl: serverResponse['@controls'].next?.href,
+    }));
+  };
+
   private movieRequestErrorHandler = () => {
     this.setState({
       isLoaded: true,
@@ -80,7 +91,7 @@ class MovieListComponent
 
   private fetchMovieList() {
     if (this.props.appState.allMoviesUrl) {
-      Fetch.getRequest(
+      Fetch.getFirstPage(
         this.props.appState.allMoviesUrl,
         this.movieRequestResponseHandler,
         this.movieRequestErrorHandler,
@@ -88,9 +99,19 @@ class MovieListComponent
     }
   }
 
+  private fetchNextMovies = () => {
+    if (this.state.nextMoviesUrl) {
+      Fetch.getRequest(
+        this.state.nextMoviesUrl,
+        this.nextMoviesResponseHandler,
+        this.movieRequestErrorHandler,
+      );
+    }
+  };
+
   private fetchCategoryList() {
     if (this.props.appState.allCategoriesUrl) {
-      Fetch.getRequest(
+      Fetch.getCollection(
         this.props.appState.allCategoriesUrl,
         this.categoryRequestResponseHandler,
         this.categoryRequestErrorHandler,
@@ -120,50 +141,59 @@ class MovieListComponent
       );
     } else {
       content = (
-        <Table striped bordered hover>
-          <thead>
-            <tr>
-              <th>#</th>
-              <th>Title</th>
-              <th>Director</th>
-              <th>Length</th>
-              <th>Category</th>
-              <th>Release Date</th>
-            </tr>
-          </thead>
-          <tbody>
-            {this.state.movies?.map((movie, index) => {
-              const outputDate = moment(movie.release_date).format('DD.MM.YYYY');
-
-              const minutes = Math.floor(movie.length / 60);
-
-              return (
-                <tr
-                  className="movie-list-item"
-                  key={index.valueOf()}
-                  onClick={
-                    () => this.props.navigate(`/movie/${movie.id}`, {
-                      state: {
-                        movieRequestUrl: movie['@controls'].self?.href,
-                        categoryTitle: this.state.categoryTitleMap?.get(movie.category_id),
-                      },
-                    })
-                  }
-                >
-                  <td>{index + 1}</td>
-                  <td>{movie.title}</td>
-                  <td>{movie.director}</td>
-                  <td>
-                    {minutes}
-                    {' minutes'}
-                  </td>
-                  <td>{this.state.categoryTitleMap?.get(movie.category_id)}</td>
-                  <td>{outputDate}</td>
-                </tr>
-              );
-            })}
-          </tbody>
-        </Table>
+        <>
+          <Table striped bordered hover>
+            <thead>
+              <tr>
+                <th>#</th>
+                <th>Title</th>
+                <th>Director</th>
+                <th>Length</th>
+                <th>Category</th>
+                <th>Release Date</th>
+              </tr>
+            </thead>
+            <tbody>
+              {this.state.movies?.map((movie, index) => {
+                const outputDate = moment(movie.release_date).format('DD.MM.YYYY');
+
+                const minutes = Math.floor(movie.length / 60);
+
+                return (
+                  <tr
+                    className="movie-list-item"
+                    key={index.valueOf()}
+                    onClick={
+                      () => this.props.navigate(`/movie/${movie.id}`, {
+                        state: {
+                          movieRequestUrl: movie['@controls'].self?.href,
+                          categoryTitle: this.state.categoryTitleMap?.get(movie.category_id),
+                        },
+                      })
+                    }
+                  >
+                    <td>{index + 1}</td>
+                    <td>{movie.title}</td>
+                    <td>{movie.director}</td>
+                    <td>
+                      {minutes}
+                      {' minutes'}
+                    </td>
+                    <td>{this.state.categoryTitleMap?.get(movie.category_id)}</td>
+                    <td>{outputDate}</td>
+                  </tr>
+                );
+              })}
+            </tbody>
+          </Table>
+          {this.state.nextMoviesUrl && (
+            <div className="load-more">
+              <Button variant="outline-primary" onClick={this.fetchNextMovies}>
+                Load more
+              </Button>
+            </div>
+          )}
+        </>
       );
     }
     return (
@@ -4,7 +4,9 @@ import {
   faComments, faQuoteLeft, faQuoteRight, faStar,
 } from '@fortawesome/free-solid-svg-icons';
 import moment from 'moment';
-import { Col, Row, Spinner } from 'react-bootstrap';
+import {
+  Button, Col, Row, Spinner,
+} from 'react-bootstrap';
 import { faStar as faStarEmpty } from '@fortawesome/free-regular-svg-icons';
 import withRouter from '../../helper/RouterHelper';
 import { AppState } from '../../redux/Store';
@@ -21,7 +23,8 @@ type UserProfileReviewsComponentProps = {
 
 type UserProfileReviewsComponentState = {
   isLoaded: boolean,
-  userReviews?: Review[]
+  userReviews?: Review[],
+  nextUserReviewsUrl?: string
 }
 
 class UserProfileReviewsComponent
@@ -42,9 +45,17 @@ class UserProfileReviewsComponent
     this.setState({
       isLoaded: true,
       userReviews: serverResponse.items ?? [],
+      nextUserReviewsUrl: serverResponse['@controls'].next?.href,
     });
   };
 
+  private nextUserReviewsResponseHandler = (serverResponse: Collection<Review>) => {
+    this.setState((prevState) => ({
+      userReviews: (prevState.userReviews ?? []).concat(serverResponse.items ?? []),
+      nextUserReviewsUrl: serverResponse['@controls'].next?.href,
+    }));
+  };
+
   private requestErrorHandler = () => {
     this.setState({
       isLoaded: true,
@@ -53,7 +64,7 @@ class UserProfileReviewsComponent
 
   private fetchUserReviewList() {
     if (this.props.userReviewsUrl) {
-      Fetch.getRequest(
+      Fetch.getFirstPage(
         this.props.userReviewsUrl,
         this.requestResponseHandler,
         this.requestErrorHandler,
@@ -61,6 +72,16 @@ class UserProfileReviewsComponent
     }
   }
 
+  private fetchNextUserReviews = () => {
+    if (this.state.nextUserReviewsUrl) {
+      Fetch.getRequest(
+        this.state.nextUserReviewsUrl,
+        this.nextUserReviewsResponseHandler,
+        this.requestErrorHandler,
+      );
+    }
+  };
+
   render() {
     if (!this.state.isLoaded) {
       return (
@@ -129,6 +150,13 @@ class UserProfileReviewsComponent
             );
           })}
         </Row>
+        {this.state.nextUserReviewsUrl && (
+          <div className="load-more">
+            <Button variant="outline-primary" onClick={this.fetchNextUserReviews}>
+              Load more
+            </Button>
+          </div>
+        )}
       </div>
     );
   }
@@ -1,3 +1,4 @@
+import { Collection } from '../models/Collection';
 import { Credentials } from '../models/Credentials';
 import { HttpError } from '../models/HttpError';
 import { MasonDoc } from '../models/MasonDoc';
@@ -6,6 +7,8 @@ import store from '../redux/Store';
 import history from './History';
 
 const baseUrl = 'http://127.0.0.1:5000';
+// the maximum number of items of a collection page, which is accepted by the backend
+const maxPageSize = 100;
 
 /**
   This helper class is used for any kind of http requests
@@ -92,6 +95,57 @@ export default class Fetch {
     );
   }
 
+  /**
+  * This generic method is used to get the first page of a paginated collection
+  * The page is requested with the maximum page size unless the path already contains a limit,
+  * the next pages are linked by the next control of the page
+  * @param path the relative path of the collection
+  * @param responseHandler a callback which is executed if the request was successful
+  * @param errorHandler a callback which is executed if the request failed for any reason
+  */
+  public static getFirstPage<T>(
+    path: string,
+    responseHandler: (serverResponse: Collection<T>) => void,
+    errorHandler: (serverResponse: HttpError) => void,
+  ) {
+    const url = new URL(path, baseUrl);
+    if (!url.searchParams.has('limit')) {
+      url.searchParams.set('limit', maxPageSize.toString());
+    }
+    this.getRequest(
+      url.pathname + url.search,
+      responseHandler,
+      errorHandler,
+    );
+  }
+
+  /**
+  * This generic method is used to get all the items of a paginated collection
+  * The next controls of the pages are followed until the last page has been loaded,
+  * so it is only meant for small collections which are needed completely, e.g. lookup tables
+  * Large collections are rendered page by page by following their next control on demand
+  * @param path the relative path of the collection
+  * @param responseHandler a callback which is executed with the last page, which contains
+  * the items of all the pages, if all the requests were successful
+  * @param errorHandler a callback which is executed if a request failed for any reason
+  */
+  public static getCollection<T>(
+    path: string,
+    responseHandler: (serverResponse: Collection<T>) => void,
+    errorHandler: (serverResponse: HttpError) => void,
+  ) {
+    const pageResponseHandler = (previousItems: T[]) => (serverResponse: Collection<T>) => {
+      const items = previousItems.concat(serverResponse.items ?? []);
+      const next = serverResponse['@controls']?.next;
+      if (next) {
+        this.getRequest(next.href, pageResponseHandler(items), errorHandler);
+      } else {
+        responseHandler({ ...serverResponse, items });
+      }
+    };
+    this.getFirstPage(path, pageResponseHandler([]), errorHandler);
+  }
+
   /**
   * This generic method is used to perform a http post request
   * @param path the relative path of the POST endpoint
@@ -19,6 +19,9 @@ export type MasonControls = {
    'up'?: MasonControl,
    'edit'?: MasonControl,
    'collection'?: MasonControl,
+   'first'?: MasonControl,
+   'prev'?: MasonControl,
+   'next'?: MasonControl,
  }
 
 export type MasonControl = {
@@ -26,5 +29,6 @@ export type MasonControl = {
     href: string,
     encoding?: string,
     method?: string,
-    schema?: any
+    schema?: any,
+    schemaUrl?: string
  }